@@ -0,0 +1,55 @@
+"""Authentication classes of the API."""
+
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
+
+from . import features as feature_flags
+from .models import ClaimsUser
+from .tokens import USER_CLAIMS, is_revoked
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that skips the user lookup on read requests.
+
+    For safe methods the user is rebuilt from the access token claims (see
+    ``accounts.tokens``) as a ``ClaimsUser``, whose other fields load on first
+    access. Writes, and tokens minted before the claims existed, still load
+    the account so they see its current state. Revoked tokens are rejected
+    in both cases.
+    """
+
+    def authenticate(self, request):
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+        validated_token = self.get_validated_token(raw_token)
+        if is_revoked(validated_token):
+            raise AuthenticationFailed("Ce jeton a été révoqué.", code="token_revoked")
+
+        user = None
+        if request.method in SAFE_METHODS:
+            user = self.get_claims_user(validated_token)
+        return user or self.get_user(validated_token), validated_token
+
+    def get_claims_user(self, validated_token):
+        try:
+            values = {claim: validated_token[claim] for claim in USER_CLAIMS}
+            values["id"] = int(validated_token[api_settings.USER_ID_CLAIM])
+        except (KeyError, TypeError, ValueError):
+            return None
+        # Tokens are only issued to active accounts; deactivation revokes them.
+        values["is_active"] = True
+        # `from_db` expects the values in field order.
+        names = [field.attname for field in ClaimsUser._meta.concrete_fields if field.attname in values]
+        user = ClaimsUser.from_db(DEFAULT_DB_ALIAS, names, [values[name] for name in names])
+        codes = feature_flags.token_codes(validated_token)
+        if codes is not None:
+            user._feature_codes = codes
+        return user
@@ -0,0 +1,105 @@
+"""
+Resolution of a user's feature flags.
+
+``HasFeaturePermission`` runs on every webtoon and scraper request, so the
+feature codes of a user are resolved once and reused:
+
+* per request, memoized on the user instance (``request.user`` lives as long
+  as the request);
+* across requests, in the cache as ``(version, codes)``. Entries are dropped
+  by ``m2m_changed`` on ``User.features`` and ignored once the global version
+  moves, which happens when a feature is renamed or deleted (its membership
+  rows vanish by cascade, without ``m2m_changed``);
+* optionally, in the access token: with ``FEATURES_IN_ACCESS_TOKEN`` the codes
+  are embedded as the ``features`` claim when the token is minted, and the
+  permission reads them from the token. A revoked feature then stays usable
+  until the token expires (``ACCESS_TOKEN_LIFETIME``).
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Iterable
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+FEATURES_CLAIM = "features"
+FEATURES_PREFIX = "accounts:features"
+VERSION_KEY = f"{FEATURES_PREFIX}:version"
+FEATURES_TIMEOUT = 60 * 60
+
+
+def _user_key(user_id: int) -> str:
+    return f"{FEATURES_PREFIX}:{user_id}"
+
+
+def _current_version() -> int:
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, int(time.time() * 1000), timeout=None)
+        version = cache.get(VERSION_KEY)
+    return int(version)
+
+
+def get_codes_for(user_id: int) -> frozenset[str]:
+    """Return the feature codes granted to ``user_id``, from the cache when possible."""
+
+    from .models import Feature
+
+    key = _user_key(user_id)
+    values = cache.get_many([VERSION_KEY, key])
+    version = values.get(VERSION_KEY)
+    entry = values.get(key)
+    if version is not None and entry is not None and entry[0] == version:
+        return entry[1]
+    if version is None:
+        version = _current_version()
+    codes = frozenset(Feature.objects.filter(users__pk=user_id).values_list("code", flat=True))
+    cache.set(key, (version, codes), FEATURES_TIMEOUT)
+    return codes
+
+
+def get_codes(user) -> frozenset[str]:
+    """Return the feature codes of ``user``, memoized on the instance."""
+
+    codes = getattr(user, "_feature_codes", None)
+    if codes is None:
+        codes = user._feature_codes = get_codes_for(user.pk)
+    return codes
+
+
+def token_codes(token) -> frozenset[str] | None:
+    """Return the codes embedded in a validated access token, if trusted."""
+
+    if token is None or not getattr(settings, "FEATURES_IN_ACCESS_TOKEN", False):
+        return None
+    try:
+        codes = token[FEATURES_CLAIM]
+    except (KeyError, TypeError):
+        return None
+    return frozenset(codes)
+
+
+def _on_commit_too(callback) -> None:
+    # Dropped right away for this transaction and again once committed, so a
+    # concurrent request cannot re-cache the rows as they were before the commit.
+    callback()
+    transaction.on_commit(callback)
+
+
+def invalidate_users(user_ids: Iterable[int]) -> None:
+    keys = [_user_key(user_id) for user_id in user_ids]
+    if keys:
+        _on_commit_too(lambda: cache.delete_many(keys))
+
+
+def invalidate_all() -> None:
+    def bump():
+        try:
+            cache.incr(VERSION_KEY)
+        except ValueError:
+            _current_version()
+
+    _on_commit_too(bump)
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-17 02:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_claimsuser'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='tokens_revoked_at',
+            field=models.DateTimeField(blank=True, editable=False, help_text='Les jetons émis avant cette date sont refusés.', null=True, verbose_name='révocation des jetons'),
+        ),
+    ]
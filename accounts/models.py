@@ -1,6 +1,8 @@
 from django.contrib.auth.models import AbstractUser
 from django.db import models
 
+from . import features as feature_flags
+
 
 class Feature(models.Model):
     """Feature flag allowing fine-grained access control on the platform."""
@@ -42,6 +44,13 @@ class User(AbstractUser):
         verbose_name="fonctions disponibles",
         help_text="Fonctionnalités auxquelles cet utilisateur a accès.",
     )
+    tokens_revoked_at = models.DateTimeField(
+        "révocation des jetons",
+        null=True,
+        blank=True,
+        editable=False,
+        help_text="Les jetons émis avant cette date sont refusés.",
+    )
 
     def __str__(self) -> str:
         return f"{self.username} ({self.role})"
@@ -50,9 +59,28 @@ class User(AbstractUser):
         """
         Return True if the user has access to the given feature code.
 
-        Superusers bypass feature checks automatically.
+        Superusers bypass feature checks automatically. The codes are resolved
+        once per instance, see ``accounts.features``.
         """
 
         if self.is_superuser:
             return True
-        return self.features.filter(code=code).exists()
+        return code in feature_flags.get_codes(self)
+
+
+class ClaimsUser(User):
+    """
+    User rebuilt from the claims of an access token, without a query.
+
+    Only the claimed fields are set; reading any other field loads the whole
+    row once, so views needing the full account get it transparently.
+    """
+
+    class Meta:
+        proxy = True
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        deferred = self.get_deferred_fields()
+        if fields is not None and deferred.issuperset(fields):
+            fields = list(deferred)
+        super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
@@ -2,6 +2,8 @@
 
 from rest_framework.permissions import BasePermission
 
+from . import features as feature_flags
+
 
 class IsSuperUser(BasePermission):
     """Allow access only to Django superusers."""
@@ -18,7 +20,9 @@ class HasFeaturePermission(BasePermission):
     Gate access to a view/object behind a feature flag.
 
     The view should expose a `required_feature` attribute containing the feature code.
-    Superusers automatically bypass the check.
+    Superusers automatically bypass the check. The feature codes come from the
+    access token when it embeds them, otherwise from the memoized user lookup,
+    so repeated checks within a request cost no query.
     """
 
     message = "Vous n'avez pas accès à cette fonctionnalité."
@@ -30,6 +34,11 @@ class HasFeaturePermission(BasePermission):
         user = request.user
         if not user or not user.is_authenticated:
             return False
+        if user.is_superuser:
+            return True
+        codes = feature_flags.token_codes(request.auth)
+        if codes is not None:
+            return feature_code in codes
         return user.has_feature(feature_code)
 
     def has_object_permission(self, request, view, obj):
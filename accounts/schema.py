@@ -0,0 +1,7 @@
+"""OpenAPI extensions for the authentication classes of ``accounts``."""
+
+from drf_spectacular.contrib.rest_framework_simplejwt import SimpleJWTScheme
+
+
+class StatelessJWTScheme(SimpleJWTScheme):
+    target_class = "accounts.authentication.StatelessJWTAuthentication"
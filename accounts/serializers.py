@@ -1,7 +1,10 @@
 from django.contrib.auth import get_user_model
 from rest_framework import serializers
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
 
 from accounts.models import Feature
+from accounts.tokens import AccountRefreshToken, is_revoked
 
 User = get_user_model()
 
@@ -111,3 +114,18 @@ class ProfileUpdateSerializer(serializers.ModelSerializer):
             "last_name",
         )
         read_only_fields = ("id",)
+
+
+class AccountTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """Login serializer issuing tokens that carry the user claims."""
+
+    token_class = AccountRefreshToken
+
+
+class AccountTokenRefreshSerializer(TokenRefreshSerializer):
+    token_class = AccountRefreshToken
+
+    def validate(self, attrs):
+        if is_revoked(self.token_class(attrs["refresh"])):
+            raise AuthenticationFailed("Ce jeton a été révoqué.", code="token_revoked")
+        return super().validate(attrs)
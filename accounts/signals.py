@@ -0,0 +1,63 @@
+"""
+Keep what is derived from accounts in sync with them: the cached feature codes
+of users and the validity of the tokens already issued to them.
+"""
+
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from . import features as feature_flags
+from .models import ClaimsUser, Feature, User
+from .tokens import revoke_user_tokens
+
+# Changes that must not wait for the tokens already issued to expire.
+REVOKING_FIELDS = ("password", "is_active", "is_superuser", "is_staff", "role")
+
+
+@receiver(m2m_changed, sender=User.features.through)
+def invalidate_user_features(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if not reverse:
+        instance.__dict__.pop("_feature_codes", None)
+        feature_flags.invalidate_users([instance.pk])
+    elif pk_set:
+        feature_flags.invalidate_users(pk_set)
+    else:
+        # feature.users.clear(): the former members are no longer known.
+        feature_flags.invalidate_all()
+
+
+@receiver(post_save, sender=Feature)
+@receiver(post_delete, sender=Feature)
+def invalidate_feature(sender, instance, created=False, raw=False, **kwargs):
+    if not created and not raw:
+        feature_flags.invalidate_all()
+
+
+@receiver(pre_save, sender=User)
+@receiver(pre_save, sender=ClaimsUser)
+def detect_revoking_change(sender, instance, raw=False, **kwargs):
+    if raw or instance._state.adding:
+        return
+    previous = User.objects.filter(pk=instance.pk).values(*REVOKING_FIELDS, "tokens_revoked_at").first()
+    instance._revoke_tokens = previous is not None and any(
+        previous[field] != getattr(instance, field) for field in REVOKING_FIELDS
+    )
+    # The revocation is written with update(): an instance loaded before it must not save it back.
+    revoked_at = previous["tokens_revoked_at"] if previous is not None else None
+    if revoked_at is not None and (instance.tokens_revoked_at is None or instance.tokens_revoked_at < revoked_at):
+        instance.tokens_revoked_at = revoked_at
+
+
+@receiver(post_save, sender=User)
+@receiver(post_save, sender=ClaimsUser)
+def revoke_tokens_on_change(sender, instance, created, raw=False, **kwargs):
+    if instance.__dict__.pop("_revoke_tokens", False):
+        revoke_user_tokens(instance.pk)
+
+
+@receiver(post_delete, sender=User)
+@receiver(post_delete, sender=ClaimsUser)
+def revoke_tokens_on_delete(sender, instance, **kwargs):
+    revoke_user_tokens(instance.pk)
@@ -1,8 +1,18 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
-from rest_framework.test import APITestCase
+from rest_framework.test import APIRequestFactory, APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
 
-from accounts.models import Feature, User
+from accounts.authentication import StatelessJWTAuthentication
+from accounts.models import ClaimsUser, Feature, User
+from accounts.permissions import HasFeaturePermission
+from accounts.tokens import revoke_user_tokens
 
 
 class AuthenticationTests(APITestCase):
@@ -88,3 +98,158 @@ class AdminUserManagementTests(APITestCase):
 
         features_response = self.client.get(self.admin_features_url)
         self.assertEqual(features_response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class FeatureResolutionTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.feature = Feature.objects.get(code="webtoon_management")
+        self.user = User.objects.create_user(
+            username="reader",
+            email="reader@example.com",
+            password="motdepassefort",
+        )
+        self.view = type("View", (), {"required_feature": "webtoon_management"})()
+
+    def check(self, user=None, auth=None):
+        request = APIRequestFactory().get("/")
+        request.user = user or User.objects.get(pk=self.user.pk)
+        request.auth = auth
+        return HasFeaturePermission().has_permission(request, self.view)
+
+    def test_checks_hit_the_database_once_per_user(self):
+        self.user.features.add(self.feature)
+        user = User.objects.get(pk=self.user.pk)
+        with self.assertNumQueries(1):
+            self.assertTrue(self.check(user))
+            self.assertTrue(self.check(user))
+        # Another request, same user: served from the cache.
+        user = User.objects.get(pk=self.user.pk)
+        with self.assertNumQueries(0):
+            self.assertTrue(self.check(user))
+
+    def test_assignment_changes_invalidate_the_cache(self):
+        self.assertFalse(self.check())
+        self.user.features.add(self.feature)
+        self.assertTrue(self.check())
+        self.feature.users.remove(self.user)
+        self.assertFalse(self.check())
+        self.feature.users.add(self.user)
+        self.assertTrue(self.check())
+        self.feature.users.clear()
+        self.assertFalse(self.check())
+
+    def test_deleting_a_feature_invalidates_the_cache(self):
+        feature = Feature.objects.create(code="beta", name="Beta")
+        self.user.features.add(feature)
+        self.view.required_feature = "beta"
+        self.assertTrue(self.check())
+        feature.delete()
+        self.assertFalse(self.check())
+
+    @override_settings(FEATURES_IN_ACCESS_TOKEN=True)
+    def test_access_token_can_carry_the_features(self):
+        self.user.features.add(self.feature)
+        response = self.client.post(
+            reverse("login"),
+            {"username": "reader", "password": "motdepassefort"},
+            format="json",
+        )
+        token = AccessToken(response.data["access"])
+        self.assertEqual(token["features"], ["webtoon_management"])
+
+        self.user.features.remove(self.feature)
+        user = User.objects.get(pk=self.user.pk)
+        with self.assertNumQueries(0):
+            # The token is trusted until it expires...
+            self.assertTrue(self.check(user, auth=token))
+        # ...and the next refresh resolves the features again.
+        response = self.client.post(reverse("token-refresh"), {"refresh": response.data["refresh"]}, format="json")
+        self.assertEqual(AccessToken(response.data["access"])["features"], [])
+
+
+class StatelessAuthenticationTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="reader",
+            email="reader@example.com",
+            password="motdepassefort",
+        )
+        self.user.features.add(Feature.objects.get(code="webtoon_management"))
+        self.list_url = reverse("api:webtoon-list")
+
+    def login(self):
+        response = self.client.post(
+            reverse("login"),
+            {"username": "reader", "password": "motdepassefort"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def get(self, access):
+        return self.client.get(self.list_url, HTTP_AUTHORIZATION=f"Bearer {access}")
+
+    def test_reads_do_not_load_the_user(self):
+        access = self.login()["access"]
+        self.assertEqual(self.get(access).status_code, status.HTTP_200_OK)
+        cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.get(access).status_code, status.HTTP_200_OK)
+        # A cold cache only reads the revocation time back.
+        user_queries = [query["sql"] for query in queries if 'FROM "accounts_user" ' in query["sql"]]
+        self.assertEqual(len(user_queries), 1)
+        self.assertTrue(user_queries[0].startswith('SELECT "accounts_user"."tokens_revoked_at"'))
+
+    def test_claims_user_loads_the_rest_of_the_account_once(self):
+        token = AccessToken(self.login()["access"])
+        request = APIRequestFactory().get("/", HTTP_AUTHORIZATION=f"Bearer {token}")
+        user, _ = StatelessJWTAuthentication().authenticate(request)
+        self.assertIsInstance(user, ClaimsUser)
+        self.assertEqual((user.pk, user.username, user.role), (self.user.pk, "reader", "user"))
+        with self.assertNumQueries(1):
+            self.assertEqual((user.email, user.date_joined), (self.user.email, self.user.date_joined))
+
+    def test_writes_and_tokens_without_claims_load_the_user(self):
+        request = APIRequestFactory().post("/", HTTP_AUTHORIZATION=f"Bearer {self.login()['access']}")
+        user, _ = StatelessJWTAuthentication().authenticate(request)
+        self.assertIs(type(user), User)
+
+        legacy = AccessToken.for_user(self.user)
+        request = APIRequestFactory().get("/", HTTP_AUTHORIZATION=f"Bearer {legacy}")
+        user, _ = StatelessJWTAuthentication().authenticate(request)
+        self.assertIs(type(user), User)
+
+    def test_sensitive_changes_revoke_issued_tokens(self):
+        tokens = self.login()
+        self.user.first_name = "Akira"
+        self.user.save()
+        self.assertEqual(self.get(tokens["access"]).status_code, status.HTTP_200_OK)
+
+        cache.set(f"accounts:jwt:revoked:{self.user.pk}", AccessToken(tokens["access"])["iat"] + 1)
+        self.assertEqual(self.get(tokens["access"]).status_code, status.HTTP_401_UNAUTHORIZED)
+        response = self.client.post(reverse("token-refresh"), {"refresh": tokens["refresh"]}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        cache.clear()
+        self.user.set_password("nouveaumotdepasse")
+        self.user.save()
+        self.assertIsNotNone(cache.get(f"accounts:jwt:revoked:{self.user.pk}"))
+
+    def test_revocation_survives_cache_eviction(self):
+        tokens = self.login()
+        with mock.patch("accounts.tokens.time.time", return_value=AccessToken(tokens["access"])["iat"] + 1):
+            revoke_user_tokens(self.user.pk)
+        # An instance loaded before the revocation does not undo it.
+        self.user.first_name = "Akira"
+        self.user.save()
+
+        cache.clear()
+        self.assertEqual(self.get(tokens["access"]).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_tokens_of_deleted_users_stay_revoked_after_eviction(self):
+        access = self.login()["access"]
+        self.user.delete()
+        cache.clear()
+        self.assertEqual(self.get(access).status_code, status.HTTP_401_UNAUTHORIZED)
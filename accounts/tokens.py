@@ -0,0 +1,94 @@
+"""
+JWT tokens carrying enough claims to authenticate without a user lookup.
+
+Access tokens embed the user's identity (``USER_CLAIMS``) and, optionally, the
+feature codes (see ``accounts.features``). Both are resolved each time an
+access token is minted, at login and refresh, and never stored in the refresh
+token itself, so a refresh picks up the current values.
+
+Claims cannot be withdrawn from a token already handed out. Changes that must
+apply at once (password, activation, role...) revoke the user's tokens
+instead, and tokens issued before the revocation time are rejected. That time
+is stored on the user row and kept in the cache for as long as a token issued
+before it can live. The cache may evict it: a miss reads the row again, and a
+deleted user counts as revoked.
+"""
+
+from __future__ import annotations
+
+import time
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from . import features as feature_flags
+
+USER_CLAIMS = ("username", "is_superuser", "is_staff", "role")
+REVOKED_PREFIX = "accounts:jwt:revoked"
+
+
+def _revoked_key(user_id: int) -> str:
+    return f"{REVOKED_PREFIX}:{user_id}"
+
+
+def _revocation_timeout() -> int:
+    lifetime = max(api_settings.ACCESS_TOKEN_LIFETIME, api_settings.REFRESH_TOKEN_LIFETIME)
+    return int(lifetime.total_seconds())
+
+
+def revoke_user_tokens(user_id: int) -> None:
+    """Reject every token issued to ``user_id`` so far."""
+
+    revoked_at = int(time.time())
+    get_user_model().objects.filter(pk=user_id).update(
+        tokens_revoked_at=datetime.fromtimestamp(revoked_at, tz=timezone.utc)
+    )
+    cache.set(_revoked_key(user_id), revoked_at, _revocation_timeout())
+
+
+def _load_revocation(user_id) -> int | None:
+    """Return the revocation time of ``user_id`` from its row: 0 when never revoked, None when deleted."""
+
+    rows = get_user_model().objects.filter(pk=user_id).values_list("tokens_revoked_at", flat=True)
+    if not rows:
+        return None
+    revoked_at = rows[0]
+    value = int(revoked_at.timestamp()) if revoked_at is not None else 0
+    # add(): a revocation stored meanwhile is not overwritten by the older value.
+    cache.add(_revoked_key(user_id), value, _revocation_timeout())
+    return value
+
+
+def is_revoked(token) -> bool:
+    user_id = token.get(api_settings.USER_ID_CLAIM)
+    revoked_at = cache.get(_revoked_key(user_id))
+    if revoked_at is None:
+        revoked_at = _load_revocation(user_id)
+        if revoked_at is None:
+            # Deleted account: none of its tokens is valid any more.
+            return True
+    # `iat` has a one-second resolution: a token issued in the second of the
+    # revocation is kept rather than rejecting a fresh login.
+    return token.get("iat", 0) < revoked_at
+
+
+class AccountRefreshToken(RefreshToken):
+    """Refresh token whose access tokens embed the user and feature claims."""
+
+    no_copy_claims = (*RefreshToken.no_copy_claims, *USER_CLAIMS, feature_flags.FEATURES_CLAIM)
+
+    @property
+    def access_token(self):
+        access = super().access_token
+        user_id = self.payload[api_settings.USER_ID_CLAIM]
+        values = get_user_model().objects.filter(pk=user_id).values(*USER_CLAIMS).first()
+        if values is not None:
+            for claim in USER_CLAIMS:
+                access[claim] = values[claim]
+        if getattr(settings, "FEATURES_IN_ACCESS_TOKEN", False):
+            access[feature_flags.FEATURES_CLAIM] = sorted(feature_flags.get_codes_for(user_id))
+        return access
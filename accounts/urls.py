@@ -1,8 +1,8 @@
 from django.urls import path
 from rest_framework.routers import DefaultRouter
-from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
+from rest_framework_simplejwt.views import TokenRefreshView
 
-from .views import AdminUserViewSet, FeatureViewSet, ProfileView, RegisterView
+from .views import AdminUserViewSet, FeatureViewSet, LoginView, ProfileView, RegisterView
 
 router = DefaultRouter()
 router.register("admin/features", FeatureViewSet, basename="admin-features")
@@ -10,11 +10,7 @@ router.register("admin/users", AdminUserViewSet, basename="admin-users")
 
 urlpatterns = [
     path("register/", RegisterView.as_view(), name="register"),
-    path(
-        "login/",
-        TokenObtainPairView.as_view(authentication_classes=()),
-        name="login",
-    ),
+    path("login/", LoginView.as_view(), name="login"),
     path(
         "refresh/",
         TokenRefreshView.as_view(authentication_classes=()),
@@ -1,4 +1,5 @@
 from rest_framework import generics, permissions, viewsets
+from rest_framework_simplejwt.views import TokenObtainPairView
 
 from .models import Feature, User
 from .permissions import IsSuperUser
@@ -17,6 +18,14 @@ class RegisterView(generics.CreateAPIView):
     queryset = User.objects.all()
     serializer_class = RegisterSerializer
     permission_classes = (permissions.AllowAny,)
+    throttle_scope = "auth"
+
+
+class LoginView(TokenObtainPairView):
+    """Retourne un couple de jetons JWT (limité par le débit `auth`)."""
+
+    authentication_classes = ()
+    throttle_scope = "auth"
 
 
 class ProfileView(generics.RetrieveUpdateAPIView):
@@ -0,0 +1,356 @@
+"""Cache helpers shared by the webtoon API views, the scraper and the importer.
+
+Every cached entry embeds the owner's *generation* in its key. Invalidating a
+user's cache therefore boils down to one atomic ``INCR`` on the generation
+counter: entries built with an older generation are never read again and
+simply expire with their TTL.
+
+Chapter and comment writes only touch one webtoon, so they bump that webtoon's
+own generation instead. The detail, chapters and comments pages of a webtoon
+embed both generations in their key; list pages showing the chapter/comment
+counters record the generations of their rows and are dropped on read when
+one of them moved (see ``get_row_states``).
+
+Read endpoints cache the final rendered bytes (plus compressed variants)
+rather than the serializer output, so a hit skips pickling of nested dicts,
+JSON rendering and on-the-fly compression.
+
+Writes invalidate once their transaction commits (``invalidate_on_commit``):
+a rebuild running before the commit would otherwise store the old rows under
+the new generation. Signal handlers (``api.signals``) cover ``save()`` and
+``delete()``; code writing with ``bulk_create`` / ``bulk_update`` /
+``update`` invalidates itself, like it logs its sync changes.
+
+Entries are refreshed a little before they expire, with a probability growing
+as expiry nears and with the cost of the rebuild ("XFetch"), so hot pages
+rarely expire under load. The refresh is single-flight: the request taking a
+short lock (``cache.add``, atomic on Redis and locmem alike) rebuilds the entry
+while the others keep being served the current one. A miss, e.g. after an
+invalidation, is rebuilt by the request itself: no request waits for another.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import math
+import random
+import re
+import time
+from urllib.parse import urlencode
+
+from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpResponse
+from django.utils.cache import patch_vary_headers
+from django.utils.text import compress_string
+
+from . import local_cache, suggest
+
+try:  # pragma: no cover - brotli est optionnel
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+GENERATION_PREFIX = "webtoon:gen"
+MODIFIED_PREFIX = "webtoon:modified"
+SCOPE_GENERATION_PREFIX = "webtoon:scope-gen"
+SCOPE_MODIFIED_PREFIX = "webtoon:scope-modified"
+CHILD_WRITES_PREFIX = "webtoon:child-writes"
+
+
+def _generation_key(user_id: int) -> str:
+    return f"{GENERATION_PREFIX}:{user_id}"
+
+
+def _modified_key(user_id: int) -> str:
+    return f"{MODIFIED_PREFIX}:{user_id}"
+
+
+def _initial_generation() -> int:
+    # Seed with the current time in milliseconds so that a counter evicted from
+    # the cache restarts above every generation previously handed out.
+    return int(time.time() * 1000)
+
+
+def get_generation_state(user_id: int) -> tuple[int, int]:
+    """Return ``(generation, last_modified)`` for the user in one cache round-trip.
+
+    ``last_modified`` is the POSIX timestamp of the last invalidation and is
+    used as the ``Last-Modified`` validator of cached responses.
+    """
+
+    generation_key = _generation_key(user_id)
+    modified_key = _modified_key(user_id)
+    values = cache.get_many([generation_key, modified_key])
+    generation = values.get(generation_key)
+    last_modified = values.get(modified_key)
+    if generation is None:
+        cache.add(generation_key, _initial_generation(), timeout=None)
+        generation = cache.get(generation_key)
+    if last_modified is None:
+        cache.add(modified_key, int(time.time()), timeout=None)
+        last_modified = cache.get(modified_key)
+    return int(generation), int(last_modified)
+
+
+def get_generation(user_id: int) -> int:
+    """Return the current cache generation of the given user."""
+
+    return get_generation_state(user_id)[0]
+
+
+def bump_generation(user_id: int) -> int:
+    """Invalidate every cached entry of the user by moving to a new generation."""
+
+    key = _generation_key(user_id)
+    cache.set(_modified_key(user_id), int(time.time()), timeout=None)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        # Counter missing (first write or eviction): seeding it is enough, the
+        # time-based seed is always above the generations in use so far.
+        cache.add(key, _initial_generation(), timeout=None)
+        return cache.incr(key)
+
+
+# Unlike the owner's counters, webtoon states outlive their webtoon unless they
+# expire. A state reseeded after expiry restarts above every generation handed
+# out so far (see ``_initial_generation``): expiry only costs a cache miss.
+SCOPE_STATE_TIMEOUT = 7 * 24 * 60 * 60
+
+
+def _scope_generation_key(user_id: int, webtoon_id: int) -> str:
+    return f"{SCOPE_GENERATION_PREFIX}:{user_id}:{webtoon_id}"
+
+
+def _scope_modified_key(user_id: int, webtoon_id: int) -> str:
+    return f"{SCOPE_MODIFIED_PREFIX}:{user_id}:{webtoon_id}"
+
+
+def _child_writes_key(user_id: int) -> str:
+    return f"{CHILD_WRITES_PREFIX}:{user_id}"
+
+
+def get_webtoon_states(user_id: int, webtoon_ids) -> dict[int, tuple[int, int]]:
+    """Return ``{webtoon_id: (generation, last_modified)}`` in one cache round-trip.
+
+    The webtoons must belong to ``user_id``: missing states are seeded, so
+    callers check ownership first. ``last_modified`` is 0 for a webtoon whose
+    chapters and comments were not written lately; its owner's timestamp
+    applies then.
+    """
+
+    webtoon_ids = list(webtoon_ids)
+    keys = [_scope_generation_key(user_id, webtoon_id) for webtoon_id in webtoon_ids]
+    keys += [_scope_modified_key(user_id, webtoon_id) for webtoon_id in webtoon_ids]
+    values = cache.get_many(keys)
+    states = {}
+    for webtoon_id in webtoon_ids:
+        generation_key = _scope_generation_key(user_id, webtoon_id)
+        generation = values.get(generation_key)
+        if generation is None:
+            cache.add(generation_key, _initial_generation(), timeout=SCOPE_STATE_TIMEOUT)
+            generation = cache.get(generation_key)
+        states[webtoon_id] = (int(generation), int(values.get(_scope_modified_key(user_id, webtoon_id), 0)))
+    return states
+
+
+def get_child_writes(user_id: int) -> int | None:
+    """Return the counter of chapter/comment writes of the user (None when unknown)."""
+
+    return cache.get(_child_writes_key(user_id))
+
+
+def bump_webtoon_generation(user_id: int, webtoon_id: int) -> int:
+    """Invalidate the entries depending on one webtoon's chapters and comments."""
+
+    cache.set(_scope_modified_key(user_id, webtoon_id), int(time.time()), timeout=SCOPE_STATE_TIMEOUT)
+    key = _scope_generation_key(user_id, webtoon_id)
+    try:
+        generation = cache.incr(key)
+    except ValueError:
+        cache.add(key, _initial_generation(), timeout=SCOPE_STATE_TIMEOUT)
+        generation = cache.incr(key)
+    # Bumped last: a list page built meanwhile sees it moved and is not stored.
+    try:
+        cache.incr(_child_writes_key(user_id))
+    except ValueError:
+        cache.add(_child_writes_key(user_id), _initial_generation(), timeout=None)
+    return generation
+
+
+def invalidate_on_commit(user_id: int, webtoons=(), deleted_ids=()) -> None:
+    """
+    Move the user to a new generation once the current transaction commits.
+
+    When webtoons were written, the title suggestion index is carried over to
+    the new generation instead of being rebuilt on the next keystroke.
+    """
+
+    webtoons, deleted_ids = list(webtoons), list(deleted_ids)
+
+    def invalidate():
+        generation = bump_generation(user_id)
+        if webtoons or deleted_ids:
+            suggest.apply_write(user_id, generation, webtoons=webtoons, deleted_ids=deleted_ids)
+
+    transaction.on_commit(invalidate)
+
+
+def invalidate_webtoon_on_commit(user_id: int, webtoon_id: int) -> None:
+    """Bump the generation of one webtoon once the current transaction commits."""
+
+    transaction.on_commit(lambda: bump_webtoon_generation(user_id, webtoon_id))
+
+
+def get_row_states(user_id: int, webtoon_ids, child_writes: int | None) -> dict[int, tuple[int, int]] | None:
+    """Return the states of the rows of a freshly built page, or None if it may be stale.
+
+    ``child_writes`` is ``get_child_writes`` read *before* the page was built:
+    if a chapter or comment was written since, the page may hold the old
+    counters of a row whose new generation would be recorded with it.
+    """
+
+    states = get_webtoon_states(user_id, webtoon_ids)
+    if get_child_writes(user_id) != child_writes:
+        return None
+    return states
+
+
+def build_cache_key(user_id: int, generation: int, resource: str, *parts: object) -> str:
+    """Build a versioned cache key, e.g. ``webtoon:3:g1712:list:<digest>``."""
+
+    suffix = ":".join(str(part) for part in parts)
+    key = f"webtoon:{user_id}:g{generation}:{resource}"
+    return f"{key}:{suffix}" if suffix else key
+
+
+def digest(value: str) -> str:
+    return hashlib.md5(value.encode('utf-8')).hexdigest()
+
+
+def canonical_path(request) -> str:
+    """Return the request path with its query parameters sorted.
+
+    ``?page=2&search=x`` and ``?search=x&page=2`` must share a cache entry.
+    """
+
+    params = sorted(
+        (key, value) for key, values in request.query_params.lists() for value in values
+    )
+    if not params:
+        return request.path
+    return f"{request.path}?{urlencode(params)}"
+
+
+REBUILD_LOCK_TIMEOUT = 10
+EARLY_REFRESH_BETA = 1.0
+
+
+def _rebuild_lock_key(cache_key: str) -> str:
+    return f"{cache_key}:lock"
+
+
+def acquire_rebuild_lock(cache_key: str) -> bool:
+    """Try to become the one request refreshing ``cache_key``."""
+
+    return cache.add(_rebuild_lock_key(cache_key), 1, REBUILD_LOCK_TIMEOUT)
+
+
+def release_rebuild_lock(cache_key: str) -> None:
+    cache.delete(_rebuild_lock_key(cache_key))
+
+
+def should_refresh_early(entry: dict) -> bool:
+    """Whether this read should rebuild ``entry`` ahead of its expiry (XFetch)."""
+
+    delta, expires_at = entry.get('delta'), entry.get('expires_at')
+    if delta is None or expires_at is None:
+        return False
+    # -log(u) for u in (0, 1] is an exponential draw: usually small, so the
+    # refresh happens within the last few rebuild durations before expiry.
+    return time.time() - delta * EARLY_REFRESH_BETA * math.log(1.0 - random.random()) >= expires_at
+
+
+# Same threshold as GZipMiddleware: tiny payloads do not benefit from compression.
+MIN_COMPRESS_LENGTH = 200
+_accepts_gzip = re.compile(r"\bgzip\b")
+_accepts_brotli = re.compile(r"\bbr\b")
+
+
+def build_entry(content: bytes, content_type: str, rows: dict | None = None) -> dict:
+    """Build the cache entry for a rendered payload and its compressed variants.
+
+    ``rows`` maps the webtoons shown by a list page to their generation.
+    """
+
+    entry = {'content': content, 'content_type': content_type, 'gzip': None, 'br': None, 'rows': rows}
+    if len(content) >= MIN_COMPRESS_LENGTH:
+        entry['gzip'] = compress_string(content)
+        if brotli is not None:
+            entry['br'] = brotli.compress(content)
+    return entry
+
+
+def cache_rendered_response(
+    request,
+    response,
+    cache_key: str,
+    timeout: int,
+    rows: dict | None = None,
+    started_at: float | None = None,
+    locked: bool = False,
+) -> None:
+    """Store ``response`` under ``cache_key`` once DRF has rendered it.
+
+    The rendered body is also swapped for the compressed variant the client
+    accepts, so ``GZipMiddleware`` does not compress the same bytes again.
+    ``started_at`` (``time.monotonic()`` before the rebuild) records its cost
+    for the early refresh; ``locked`` releases the rebuild lock once stored.
+    """
+
+    def _store(rendered):
+        try:
+            if rendered.status_code != 200:
+                return rendered
+            entry = build_entry(rendered.content, rendered['Content-Type'], rows)
+            if started_at is not None:
+                entry['delta'] = time.monotonic() - started_at
+                entry['expires_at'] = time.time() + timeout
+            local_cache.set_entry(cache_key, entry, timeout)
+            apply_encoding(request, rendered, entry)
+            return rendered
+        finally:
+            if locked:
+                release_rebuild_lock(cache_key)
+
+    response.add_post_render_callback(_store)
+
+
+def build_cached_response(entry: dict) -> HttpResponse:
+    """Rebuild an uncompressed HTTP response from a cached entry, without rendering."""
+
+    return HttpResponse(entry['content'], content_type=entry['content_type'])
+
+
+def apply_encoding(request, response, entry: dict) -> None:
+    """Serve the pre-compressed variant of ``entry`` accepted by the client, if any."""
+
+    if entry['gzip'] is None:
+        return
+    patch_vary_headers(response, ('Accept-Encoding',))
+    accept_encoding = request.META.get('HTTP_ACCEPT_ENCODING', '')
+    if entry['br'] is not None and _accepts_brotli.search(accept_encoding):
+        encoding = 'br'
+    elif _accepts_gzip.search(accept_encoding):
+        encoding = 'gzip'
+    else:
+        return
+
+    response.content = entry[encoding]
+    response.headers['Content-Encoding'] = encoding
+    # Like GZipMiddleware: a strong ETag would claim byte-equality with the
+    # uncompressed representation.
+    etag = response.get('ETag')
+    if etag and etag.startswith('"'):
+        response.headers['ETag'] = f'W/{etag}'
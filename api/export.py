@@ -0,0 +1,85 @@
+"""
+Streaming export of a user's library.
+
+Both formats read the webtoons with ``QuerySet.iterator(chunk_size=...)`` and
+yield one line per webtoon, so memory stays bounded by a chunk whatever the
+size of the library:
+
+* NDJSON: one JSON object per webtoon, in the API representation, with its
+  ``chapters`` and ``comments`` (prefetched chunk by chunk);
+* CSV: one row per webtoon with the columns ``import_webtoons`` reads back,
+  plus the chapter/comment counters and timestamps, which it ignores.
+"""
+
+from __future__ import annotations
+
+import csv
+from collections.abc import Iterator
+
+from django.db.models import Prefetch
+
+from .models import Comment, Webtoon
+from .renderers import ORJSONRenderer
+from .serializers import ChapterSerializer, CommentSerializer, WebtoonSerializer
+
+EXPORT_CHUNK_SIZE = 200
+
+# (header, model field); headers are aliases known to import_webtoons.
+CSV_COLUMNS = (
+    ('Titre', 'title'),
+    ('Type', 'type'),
+    ('Dernier Chapitre Lu', 'chapter'),
+    ('Dernière lecture', 'last_read_date'),
+    ('Note', 'rating'),
+    ('Status', 'status'),
+    ('Langue', 'language'),
+    ('Commentaire', 'comment'),
+    ('Lien', 'link'),
+    ('Image', 'image_url'),
+    ('Chapitres enregistrés', 'chapters_count'),
+    ('Commentaires', 'comments_count'),
+    ('Ajouté le', 'created_at'),
+    ('Modifié le', 'updated_at'),
+)
+
+
+class _Echo:
+    """File-like object handing back what ``csv.writer`` writes to it."""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def iter_ndjson(user_id: int) -> Iterator[bytes]:
+    renderer = ORJSONRenderer()
+    webtoons = (
+        Webtoon.objects.filter(user_id=user_id)
+        .order_by('pk')
+        .prefetch_related('chapters', Prefetch('comments', queryset=Comment.objects.select_related('user')))
+    )
+    for webtoon in webtoons.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        data = WebtoonSerializer(webtoon).data
+        data['chapters'] = ChapterSerializer(webtoon.chapters.all(), many=True).data
+        data['comments'] = CommentSerializer(webtoon.comments.all(), many=True).data
+        yield renderer.render(data) + b'\n'
+
+
+def iter_csv(user_id: int) -> Iterator[str]:
+    writer = csv.writer(_Echo())
+    fields = [field for _, field in CSV_COLUMNS]
+    # The BOM lets spreadsheet software detect UTF-8; import_webtoons skips it.
+    yield '\ufeff' + writer.writerow([header for header, _ in CSV_COLUMNS])
+    rows = Webtoon.objects.filter(user_id=user_id).order_by('pk').values_list(*fields)
+    for row in rows.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        yield writer.writerow(['' if value is None else _format(value) for value in row])
+
+
+def _format(value) -> str:
+    return value.isoformat() if hasattr(value, 'isoformat') else str(value)
+
+
+# format -> (content type, line generator)
+EXPORT_FORMATS = {
+    'ndjson': ('application/x-ndjson', iter_ndjson),
+    'csv': ('text/csv; charset=utf-8', iter_csv),
+}
@@ -0,0 +1,228 @@
+"""
+In-process tier (L1) in front of the ``default`` cache (L2) for rendered responses.
+
+A hit on a cached page still costs a round-trip to Redis and unpickling the
+payload. With ``L1_CACHE_MAX_BYTES`` set, each process also keeps the entries
+it reads or writes in an LRU bounded by payload bytes, for at most
+``L1_CACHE_TTL_SECONDS``.
+
+Entry keys embed the generations they were built for (see ``api.cache``), so an
+invalidation never needs to reach the L1: the next read simply uses another
+key. A key is only rewritten when its page is rebuilt (a list page whose rows
+moved, an early refresh), and every write is published on a Redis channel so
+that the other processes drop their copy. Generations themselves are never
+kept in the L1.
+
+Hit/miss counters are kept per tier and per process (``stats``).
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+
+try:  # pragma: no cover - django-redis n'est utilisé qu'avec REDIS_URL
+    from django_redis import get_redis_connection
+except ImportError:  # pragma: no cover
+    get_redis_connection = None
+
+logger = logging.getLogger(__name__)
+
+INVALIDATION_CHANNEL = "webtoon:l1-invalidate"
+# Overhead counted per entry on top of its payload bytes.
+ENTRY_OVERHEAD = 200
+RECONNECT_DELAYS = (1, 2, 5, 10, 30)
+
+
+def entry_size(entry: dict) -> int:
+    payloads = (entry.get('content'), entry.get('gzip'), entry.get('br'))
+    return ENTRY_OVERHEAD + sum(len(payload) for payload in payloads if payload)
+
+
+class LocalLRUCache:
+    """Thread-safe LRU of cache entries, bounded by their size in bytes."""
+
+    def __init__(self, max_bytes: int, ttl: int):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.size = 0
+        self._entries: OrderedDict[str, tuple[float, int, dict]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+            if item[0] <= time.monotonic():
+                self._pop(key)
+                return None
+            self._entries.move_to_end(key)
+            return item[2]
+
+    def set(self, key: str, entry: dict, timeout: int | None = None) -> None:
+        size = entry_size(entry)
+        if size > self.max_bytes:
+            return
+        ttl = self.ttl if timeout is None else min(self.ttl, timeout)
+        with self._lock:
+            self._pop(key)
+            self._entries[key] = (time.monotonic() + ttl, size, entry)
+            self.size += size
+            while self.size > self.max_bytes:
+                self._pop(next(iter(self._entries)))
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._pop(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _pop(self, key: str) -> None:
+        item = self._entries.pop(key, None)
+        if item is not None:
+            self.size -= item[1]
+
+
+_local = None
+_counters = {'l1': {'hits': 0, 'misses': 0}, 'l2': {'hits': 0, 'misses': 0}}
+_counters_lock = threading.Lock()
+# Tags our own invalidation messages, which the subscriber ignores.
+_origin = uuid.uuid4().hex
+_subscriber_pid = None
+
+
+def _count(tier: str, hit: bool) -> None:
+    with _counters_lock:
+        _counters[tier]['hits' if hit else 'misses'] += 1
+
+
+def get_local_cache() -> LocalLRUCache | None:
+    """Return this process's L1, or None when it is disabled."""
+
+    global _local
+    max_bytes = getattr(settings, 'L1_CACHE_MAX_BYTES', 0)
+    if not max_bytes:
+        return None
+    ttl = getattr(settings, 'L1_CACHE_TTL_SECONDS', 30)
+    if _local is None or (_local.max_bytes, _local.ttl) != (max_bytes, ttl):
+        _local = LocalLRUCache(max_bytes, ttl)
+    _ensure_subscriber()
+    return _local
+
+
+def get_entry(key: str):
+    """Read a response entry from the L1, then from the ``default`` cache."""
+
+    local = get_local_cache()
+    if local is not None:
+        entry = local.get(key)
+        _count('l1', entry is not None)
+        if entry is not None:
+            return entry
+    entry = cache.get(key)
+    _count('l2', entry is not None)
+    if entry is not None and local is not None:
+        local.set(key, entry)
+    return entry
+
+
+def set_entry(key: str, entry: dict, timeout: int) -> None:
+    """Store a response entry in both tiers and drop the other processes' copies."""
+
+    cache.set(key, entry, timeout)
+    local = get_local_cache()
+    if local is not None:
+        local.set(key, entry, timeout)
+        _publish(key)
+
+
+def stats() -> dict:
+    """Hit/miss counters of this process, per tier."""
+
+    local = _local if getattr(settings, 'L1_CACHE_MAX_BYTES', 0) else None
+    with _counters_lock:
+        tiers = {tier: dict(counters) for tier, counters in _counters.items()}
+    tiers['l1'].update(
+        enabled=local is not None,
+        entries=len(local) if local is not None else 0,
+        bytes=local.size if local is not None else 0,
+    )
+    return {'pid': os.getpid(), 'tiers': tiers}
+
+
+def reset() -> None:
+    """Empty the L1 and zero the counters (tests)."""
+
+    if _local is not None:
+        _local.clear()
+    with _counters_lock:
+        for counters in _counters.values():
+            counters.update(hits=0, misses=0)
+
+
+def _redis():
+    if get_redis_connection is None or not settings.CACHES['default']['BACKEND'].startswith('django_redis'):
+        return None
+    return get_redis_connection('default')
+
+
+def _publish(key: str) -> None:
+    connection = _redis()
+    if connection is None:
+        return
+    try:
+        connection.publish(INVALIDATION_CHANNEL, f"{_origin} {key}")
+    except Exception:  # noqa: broad-except
+        logger.warning("Publication de l'invalidation L1 impossible pour %s", key, exc_info=True)
+
+
+def handle_message(data) -> None:
+    """Apply an invalidation published by another process."""
+
+    if isinstance(data, bytes):
+        data = data.decode()
+    origin, _, key = data.partition(' ')
+    if origin != _origin and _local is not None:
+        _local.delete(key)
+
+
+def _ensure_subscriber() -> None:
+    # One listener per process; workers forked from a preloaded master start
+    # their own on first use.
+    global _subscriber_pid
+    if _subscriber_pid == os.getpid() or _redis() is None:
+        return
+    _subscriber_pid = os.getpid()
+    threading.Thread(target=_listen, name='l1-cache-invalidation', daemon=True).start()
+
+
+def _listen() -> None:
+    failures = 0
+    while True:
+        try:
+            pubsub = _redis().pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(INVALIDATION_CHANNEL)
+            failures = 0
+            for message in pubsub.listen():
+                handle_message(message['data'])
+        except Exception:  # noqa: broad-except
+            logger.warning("Canal d'invalidation L1 interrompu", exc_info=True)
+        # Messages may have been missed while disconnected.
+        if _local is not None:
+            _local.clear()
+        time.sleep(RECONNECT_DELAYS[min(failures, len(RECONNECT_DELAYS) - 1)])
+        failures += 1
@@ -0,0 +1,101 @@
+import time
+from datetime import date
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from api.models import Chapter, Webtoon
+from api.renderers import ORJSONRenderer
+from api.serializers import ChapterSerializer, ValuesRepresentation, WebtoonSerializer
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare le rendu DRF (ModelSerializer + JSONRenderer) et le chemin rapide "
+        "(.values() + ORJSONRenderer) sur des données générées puis annulées"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--webtoons", type=int, default=1000, help="Nombre de webtoons générés")
+        parser.add_argument("--chapters", type=int, default=2000, help="Nombre de chapitres générés")
+        parser.add_argument("--repeat", type=int, default=5, help="Nombre de mesures (la meilleure est retenue)")
+
+    def handle(self, *args, **options):
+        if min(options["webtoons"], options["chapters"], options["repeat"]) < 1:
+            raise CommandError("--webtoons, --chapters et --repeat doivent être positifs")
+
+        # Everything runs in a transaction rolled back at the end: the
+        # benchmark never leaves rows behind.
+        with transaction.atomic():
+            webtoons, chapters = self._generate(options["webtoons"], options["chapters"])
+            for label, queryset, serializer_class in (
+                ("webtoons", webtoons, WebtoonSerializer),
+                ("chapitres", chapters, ChapterSerializer),
+            ):
+                self._compare(label, queryset, serializer_class, options["repeat"])
+            transaction.set_rollback(True)
+
+    def _generate(self, webtoon_count, chapter_count):
+        owner = get_user_model().objects.create_user(username="benchmark-serialization")
+        Webtoon.objects.bulk_create(
+            Webtoon(
+                title=f"Webtoon n°{index}",
+                type="Manhwa",
+                language="Français",
+                rating=4.5,
+                status="En cours",
+                chapter=index,
+                link=f"https://example.com/webtoons/{index}",
+                comment="Une histoire à suivre…",
+                image_url=f"https://example.com/covers/{index}.jpg",
+                last_read_date=date(2025, 1, 1),
+                user=owner,
+            )
+            for index in range(webtoon_count)
+        )
+        webtoon = Webtoon.objects.filter(user=owner).first()
+        Chapter.objects.bulk_create(
+            Chapter(
+                webtoon=webtoon,
+                chapter_number=number,
+                title=f"Chapitre {number}",
+                release_date=date(2024, 1, 1),
+                local_folder=f"webtoon_out/{webtoon.pk}/{number}",
+                local_image_paths=[f"webtoon_out/{webtoon.pk}/{number}/{page:03d}.jpg" for page in range(30)],
+            )
+            for number in range(1, chapter_count + 1)
+        )
+        return (
+            Webtoon.objects.filter(user=owner).order_by("-updated_at"),
+            webtoon.chapters.all().order_by("chapter_number"),
+        )
+
+    def _compare(self, label, queryset, serializer_class, repeat):
+        def drf():
+            return JSONRenderer().render(serializer_class(queryset.all(), many=True).data)
+
+        def fast():
+            representation = ValuesRepresentation.from_serializer(serializer_class())
+            return ORJSONRenderer().render(representation.to_representation(representation.values(queryset.all())))
+
+        drf_bytes, drf_time = self._measure(drf, repeat)
+        fast_bytes, fast_time = self._measure(fast, repeat)
+        if drf_bytes != fast_bytes:
+            raise CommandError(f"{label} : les deux rendus diffèrent")
+
+        self.stdout.write(
+            f"{label:<10} {queryset.count():>6} lignes  DRF {drf_time * 1000:8.1f} ms  "
+            f"rapide {fast_time * 1000:8.1f} ms  x{drf_time / fast_time:.1f}"
+        )
+
+    @staticmethod
+    def _measure(render, repeat):
+        best = None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            content = render()
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        return content, best
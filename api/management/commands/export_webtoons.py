@@ -0,0 +1,49 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from api.export import EXPORT_FORMATS
+
+
+class Command(BaseCommand):
+    help = "Exporte les webtoons d'un utilisateur (NDJSON avec chapitres et commentaires, ou CSV)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--user",
+            required=True,
+            help="Nom d'utilisateur dont la bibliothèque est exportée",
+        )
+        parser.add_argument(
+            "--format",
+            choices=tuple(EXPORT_FORMATS),
+            default="ndjson",
+            help="Format de sortie (le CSV est relisible par import_webtoons)",
+        )
+        parser.add_argument(
+            "--output",
+            default="-",
+            help="Fichier de destination (sortie standard par défaut)",
+        )
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+        try:
+            owner = User.objects.get(username=options["user"])
+        except User.DoesNotExist as exc:
+            raise CommandError(f"Utilisateur {options['user']} introuvable") from exc
+
+        _, iter_lines = EXPORT_FORMATS[options["format"]]
+        lines = iter_lines(owner.pk)
+        if options["output"] == "-":
+            for line in lines:
+                self.stdout.write(line.decode() if isinstance(line, bytes) else line, ending="")
+            return
+
+        written = 0
+        with open(options["output"], "wb") as handle:
+            for line in lines:
+                handle.write(line if isinstance(line, bytes) else line.encode())
+                written += 1
+        if options["format"] == "csv":
+            written -= 1  # en-tête
+        self.stderr.write(self.style.SUCCESS(f"Export terminé ({written} webtoon(s))."))
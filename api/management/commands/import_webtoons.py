@@ -1,6 +1,5 @@
 import csv
 import io
-import unicodedata
 from datetime import datetime
 from pathlib import Path
 from typing import Iterable
@@ -8,7 +7,9 @@ from typing import Iterable
 from django.contrib.auth import get_user_model
 from django.core.management.base import BaseCommand, CommandError
 
+from api.export import CSV_COLUMNS
 from api.models import Webtoon
+from api.text import normalize_key
 
 
 class Command(BaseCommand):
@@ -91,9 +92,13 @@ class Command(BaseCommand):
         if reader.fieldnames is None:
             raise CommandError("Le fichier CSV est vide ou mal formé.")
 
+        # A file written by export_webtoons is restored as is, without the
+        # clean-up applied to hand-made spreadsheets.
+        verbatim = {header for header, _ in CSV_COLUMNS} <= set(reader.fieldnames)
+
         imported = 0
         for index, row in enumerate(reader, start=2):  # ligne 2 = première ligne de données
-            payload = self._map_row(row)
+            payload = self._map_row(row, verbatim=verbatim)
             if not payload["title"]:
                 self.stdout.write(self.style.WARNING(f"Ligne {index}: titre manquant, entrée ignorée."))
                 continue
@@ -121,7 +126,7 @@ class Command(BaseCommand):
                 last_error = exc
         raise CommandError(f"Impossible de décoder le fichier CSV ({last_error}).")
 
-    def _map_row(self, row: dict[str, str]) -> dict[str, object]:
+    def _map_row(self, row: dict[str, str], verbatim: bool = False) -> dict[str, object]:
         normalized = {self._normalize_key(key): (value or "").strip() for key, value in row.items()}
 
         def extract(names: Iterable[str]) -> str:
@@ -137,7 +142,8 @@ class Command(BaseCommand):
         tier_raw = extract(self.COLUMN_ALIASES["tier"]).lower()
         rating_raw = extract(self.COLUMN_ALIASES["rating"])
         status_raw = extract(self.COLUMN_ALIASES["status"]).lower()
-        language_raw = extract(self.COLUMN_ALIASES["language"]).lower()
+        language_value = extract(self.COLUMN_ALIASES["language"])
+        language_raw = language_value.lower()
         comment_raw = extract(self.COLUMN_ALIASES["comment"])
         link_raw = extract(self.COLUMN_ALIASES["link"])
         image_url_raw = extract(self.COLUMN_ALIASES["image_url"])
@@ -146,8 +152,17 @@ class Command(BaseCommand):
         rating = self._coerce_rating(rating_raw, tier_raw)
         chapter = self._coerce_int(chapter_raw)
         last_read_date = self._parse_date(last_read_raw)
-        status = self.STATUS_MAP.get(status_raw, "En cours")
-        language = self.LANGUAGE_MAP.get(language_raw, language_raw.capitalize() or "Francais")
+        if verbatim:
+            # Exported values are already valid: chapter 0 and the casing of
+            # type, status and language are kept.
+            type_value = extract(self.COLUMN_ALIASES["type"]).strip()
+            status = extract(self.COLUMN_ALIASES["status"]) or self.STATUS_MAP.get(status_raw, "En cours")
+            language = language_value
+            chapter = max(chapter, 0)
+        else:
+            status = self.STATUS_MAP.get(status_raw, "En cours")
+            language = self.LANGUAGE_MAP.get(language_raw, language_raw.capitalize() or "Francais")
+            chapter = chapter if chapter > 0 else 1
 
         comment = comment_raw
         if release_day_raw:
@@ -160,7 +175,7 @@ class Command(BaseCommand):
             "language": language,
             "rating": rating,
             "status": status,
-            "chapter": chapter if chapter > 0 else 1,
+            "chapter": chapter,
             "link": link_raw,
             "last_read_date": last_read_date,
             "comment": comment,
@@ -169,9 +184,7 @@ class Command(BaseCommand):
 
     @staticmethod
     def _normalize_key(value: str) -> str:
-        value = value.replace("\u00a0", " ")
-        value = unicodedata.normalize("NFKD", value)
-        return "".join(ch for ch in value.lower() if ch.isalnum())
+        return normalize_key(value)
 
     def _coerce_rating(self, rating_raw: str, tier_raw: str) -> float:
         try:
@@ -0,0 +1,52 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from api import stats
+from api.cache import bump_generation
+from api.models import LibraryStats
+
+
+class Command(BaseCommand):
+    help = "Recalcule les statistiques de bibliothèque ayant dérivé"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--user",
+            help="Limiter la vérification aux statistiques de cet utilisateur",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Afficher les écarts sans les corriger",
+        )
+
+    def handle(self, *args, **options):
+        user_ids = LibraryStats.objects.order_by("user_id").values_list("user_id", flat=True)
+        if options["user"]:
+            User = get_user_model()
+            try:
+                owner = User.objects.get(username=options["user"])
+            except User.DoesNotExist as exc:
+                raise CommandError(f"Utilisateur {options['user']} introuvable") from exc
+            user_ids = user_ids.filter(user=owner)
+
+        fixed = 0
+        for user_id in list(user_ids):
+            # The row lock holds writes back while the library is aggregated; they apply their delta afterwards.
+            with transaction.atomic():
+                row = LibraryStats.objects.select_for_update().filter(user_id=user_id).first()
+                if row is None:
+                    continue
+                data = stats.build(user_id)
+                if data == row.data:
+                    continue
+                self.stdout.write(self.style.WARNING(f"Utilisateur {user_id}: statistiques {row.data} -> {data}"))
+                fixed += 1
+                if not options["dry_run"]:
+                    row.data = data
+                    row.save(update_fields=["data", "updated_at"])
+                    transaction.on_commit(lambda user_id=user_id: bump_generation(user_id))
+
+        verb = "à corriger" if options["dry_run"] else "corrigée(s)"
+        self.stdout.write(self.style.SUCCESS(f"Vérification terminée ({fixed} statistique(s) {verb})."))
@@ -0,0 +1,71 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from api import sync
+from api.cache import bump_generation
+from api.models import Chapter, Comment, Webtoon
+
+
+def _count_of(model):
+    rows = (
+        model.objects.filter(webtoon=OuterRef('pk'))
+        .order_by()
+        .values('webtoon')
+        .annotate(total=Count('pk'))
+        .values('total')
+    )
+    return Coalesce(Subquery(rows), 0)
+
+
+class Command(BaseCommand):
+    help = "Recalcule les compteurs de chapitres et commentaires des webtoons ayant dérivé"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--user",
+            help="Limiter la vérification aux webtoons de cet utilisateur",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Afficher les écarts sans les corriger",
+        )
+
+    def handle(self, *args, **options):
+        queryset = Webtoon.objects.all()
+        if options["user"]:
+            User = get_user_model()
+            try:
+                owner = User.objects.get(username=options["user"])
+            except User.DoesNotExist as exc:
+                raise CommandError(f"Utilisateur {options['user']} introuvable") from exc
+            queryset = queryset.filter(user=owner)
+
+        drifted = (
+            queryset.annotate(actual_chapters=_count_of(Chapter), actual_comments=_count_of(Comment))
+            .exclude(chapters_count=F("actual_chapters"), comments_count=F("actual_comments"))
+            .only("id", "title", "user_id", "chapters_count", "comments_count")
+        )
+
+        fixed = []
+        for webtoon in drifted.iterator(chunk_size=500):
+            self.stdout.write(
+                self.style.WARNING(
+                    f"{webtoon.title}: chapitres {webtoon.chapters_count} -> {webtoon.actual_chapters}, "
+                    f"commentaires {webtoon.comments_count} -> {webtoon.actual_comments}"
+                )
+            )
+            webtoon.chapters_count = webtoon.actual_chapters
+            webtoon.comments_count = webtoon.actual_comments
+            fixed.append(webtoon)
+
+        if fixed and not options["dry_run"]:
+            Webtoon.objects.bulk_update(fixed, ["chapters_count", "comments_count"], batch_size=500)
+            for user_id in {webtoon.user_id for webtoon in fixed}:
+                sync.record(user_id, [webtoon for webtoon in fixed if webtoon.user_id == user_id])
+                bump_generation(user_id)
+
+        verb = "à corriger" if options["dry_run"] else "corrigé(s)"
+        self.stdout.write(self.style.SUCCESS(f"Vérification terminée ({len(fixed)} webtoon(s) {verb})."))
@@ -0,0 +1,44 @@
+# Generated by Django 5.2.7 on 2026-10-17 00:15
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def populate_counters(apps, schema_editor):
+    Webtoon = apps.get_model('api', 'Webtoon')
+    Chapter = apps.get_model('api', 'Chapter')
+    Comment = apps.get_model('api', 'Comment')
+
+    def count_of(model):
+        rows = (
+            model.objects.filter(webtoon=OuterRef('pk'))
+            .order_by()
+            .values('webtoon')
+            .annotate(total=Count('pk'))
+            .values('total')
+        )
+        return Coalesce(Subquery(rows), 0)
+
+    Webtoon.objects.update(chapters_count=count_of(Chapter), comments_count=count_of(Comment))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0003_chapter_local_folder_chapter_local_image_paths_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='webtoon',
+            name='chapters_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='webtoon',
+            name='comments_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(populate_counters, migrations.RunPython.noop),
+    ]
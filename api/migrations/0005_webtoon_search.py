@@ -0,0 +1,72 @@
+from django.db import DatabaseError, migrations, transaction
+
+# PostgreSQL only: SQLite gets its FTS5 index from api.signals.ensure_search_index
+# (post_migrate), other backends fall back to ILIKE.
+# Search ignores accents like FTS5 (remove_diacritics 2). unaccent() is only
+# STABLE, so the generated column and the index go through an IMMUTABLE
+# wrapper pinned to its dictionary.
+POSTGRES_EXTENSIONS = ('pg_trgm', 'unaccent')
+POSTGRES_FORWARD = (
+    """
+    CREATE OR REPLACE FUNCTION api_unaccent(text) RETURNS text
+    LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT
+    AS $$ SELECT public.unaccent('public.unaccent'::regdictionary, $1) $$
+    """,
+    """
+    ALTER TABLE api_webtoon ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', api_unaccent(coalesce(title, ''))), 'A')
+        || setweight(to_tsvector('simple', api_unaccent(coalesce(type, '') || ' ' || coalesce(language, ''))), 'B')
+        || setweight(to_tsvector('simple', api_unaccent(coalesce(status, ''))), 'C')
+        || setweight(to_tsvector('simple', api_unaccent(coalesce(comment, ''))), 'D')
+    ) STORED
+    """,
+    "CREATE INDEX api_webtoon_search_vector_gin ON api_webtoon USING gin (search_vector)",
+    "CREATE INDEX api_webtoon_title_trgm ON api_webtoon USING gin (api_unaccent(title) gin_trgm_ops)",
+)
+
+POSTGRES_BACKWARD = (
+    "DROP INDEX IF EXISTS api_webtoon_title_trgm",
+    "DROP INDEX IF EXISTS api_webtoon_search_vector_gin",
+    "ALTER TABLE api_webtoon DROP COLUMN IF EXISTS search_vector",
+    "DROP FUNCTION IF EXISTS api_unaccent(text)",
+)
+
+
+def create_extension(schema_editor, name):
+    """Create ``name`` unless it is installed; explain what to run when the role may not."""
+
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_extension WHERE extname = %s", [name])
+        if cursor.fetchone() is not None:
+            return
+    try:
+        with transaction.atomic(using=schema_editor.connection.alias):
+            schema_editor.execute(f"CREATE EXTENSION IF NOT EXISTS {name}")
+    except DatabaseError as exc:
+        raise RuntimeError(
+            f"L'extension PostgreSQL {name} est requise : exécutez « CREATE EXTENSION {name}; » sur la base en tant "
+            f"que propriétaire ou superutilisateur (voir DEPLOYMENT.md), puis relancez migrate."
+        ) from exc
+
+
+def _run(statements, extensions=()):
+    def operation(apps, schema_editor):
+        if schema_editor.connection.vendor != 'postgresql':
+            return
+        for extension in extensions:
+            create_extension(schema_editor, extension)
+        for statement in statements:
+            schema_editor.execute(statement)
+
+    return operation
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0004_webtoon_counters'),
+    ]
+
+    operations = [
+        migrations.RunPython(_run(POSTGRES_FORWARD, POSTGRES_EXTENSIONS), _run(POSTGRES_BACKWARD)),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 5.2.7 on 2026-10-17 00:33
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import F
+
+
+def seed_changes(apps, schema_editor):
+    """Give every existing object a change row so that a first sync returns the whole library."""
+    SyncChange = apps.get_model('api', 'SyncChange')
+    Webtoon = apps.get_model('api', 'Webtoon')
+    Chapter = apps.get_model('api', 'Chapter')
+    Comment = apps.get_model('api', 'Comment')
+    sources = (
+        ('webtoon', Webtoon.objects.annotate(webtoon_ref=F('id')).values_list('id', 'user_id', 'webtoon_ref')),
+        ('chapter', Chapter.objects.values_list('id', 'webtoon__user_id', 'webtoon_id')),
+        ('comment', Comment.objects.values_list('id', 'webtoon__user_id', 'webtoon_id')),
+    )
+    for kind, rows in sources:
+        batch = []
+        for object_id, user_id, webtoon_pk in rows.order_by('updated_at').iterator(chunk_size=1000):
+            batch.append(SyncChange(kind=kind, object_id=object_id, user_id=user_id, webtoon_pk=webtoon_pk))
+            if len(batch) == 1000:
+                SyncChange.objects.bulk_create(batch)
+                batch = []
+        SyncChange.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0005_webtoon_search'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SyncChange',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('webtoon', 'webtoon'), ('chapter', 'chapter'), ('comment', 'comment')], max_length=10)),
+                ('object_id', models.BigIntegerField()),
+                ('webtoon_pk', models.BigIntegerField()),
+                ('deleted', models.BooleanField(default=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('user', models.ForeignKey(help_text='Propriétaire du webtoon concerné.', on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'sync change',
+                'verbose_name_plural': 'sync changes',
+                'indexes': [models.Index(fields=['user', 'id'], name='api_syncchange_user_cursor'), models.Index(fields=['kind', 'object_id'], name='api_syncchange_object'), models.Index(fields=['webtoon_pk'], name='api_syncchange_webtoon')],
+            },
+        ),
+        migrations.RunPython(seed_changes, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-17 01:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0007_library_stats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='chapter',
+            name='expected_image_count',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+    ]
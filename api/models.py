@@ -1,6 +1,8 @@
 from django.conf import settings
 from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
+from django.db.models import F
+from django.db.models.functions import Greatest
 
 
 class TimeStampedModel(models.Model):
@@ -42,6 +44,10 @@ class Webtoon(TimeStampedModel):
         on_delete=models.CASCADE,
         related_name='webtoons',
     )
+    chapters_count = models.PositiveIntegerField(default=0, editable=False)
+    comments_count = models.PositiveIntegerField(default=0, editable=False)
+
+    COUNTER_FIELDS = ('chapters_count', 'comments_count')
 
     class Meta(TimeStampedModel.Meta):
         verbose_name = 'webtoon'
@@ -51,6 +57,46 @@ class Webtoon(TimeStampedModel):
     def __str__(self) -> str:
         return f'{self.title} ({self.user})'
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Lets api.stats compute what a later save changes without re-reading the row.
+        instance._loaded_values = {
+            name: value for name, value in zip(field_names, values) if value is not models.DEFERRED
+        }
+        return instance
+
+    def save(self, *args, **kwargs):
+        # Counters are only written through `adjust_counters`: saving a stale
+        # instance must not overwrite increments made in the meantime.
+        if not self._state.adding and not kwargs.get('force_insert') and kwargs.get('update_fields') is None:
+            deferred = self.get_deferred_fields()
+            kwargs['update_fields'] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.name not in self.COUNTER_FIELDS
+                and field.attname not in deferred
+            ]
+        super().save(*args, **kwargs)
+
+    @classmethod
+    def adjust_counters(cls, webtoon_id: int, *, chapters: int = 0, comments: int = 0) -> None:
+        """
+        Shift the denormalized chapter/comment counters of a webtoon.
+
+        The update is a single atomic `UPDATE ... SET x = x + n` that leaves
+        `updated_at` untouched; counters never go below zero.
+        """
+
+        changes = {}
+        if chapters:
+            changes['chapters_count'] = Greatest(F('chapters_count') + chapters, 0)
+        if comments:
+            changes['comments_count'] = Greatest(F('comments_count') + comments, 0)
+        if changes:
+            cls.objects.filter(pk=webtoon_id).update(**changes)
+
 
 class Chapter(TimeStampedModel):
     """Represents a chapter attached to a webtoon."""
@@ -65,6 +111,8 @@ class Chapter(TimeStampedModel):
     release_date = models.DateField(null=True, blank=True)
     local_folder = models.CharField(max_length=500, blank=True)
     local_image_paths = models.JSONField(default=list, blank=True)
+    # Images listed by the source when scraped; failed downloads are missing from local_image_paths.
+    expected_image_count = models.PositiveIntegerField(null=True, blank=True)
 
     class Meta(TimeStampedModel.Meta):
         verbose_name = 'chapter'
@@ -98,3 +146,72 @@ class Comment(TimeStampedModel):
 
     def __str__(self) -> str:
         return f'Commentaire de {self.user} sur {self.webtoon}'
+
+
+class SyncChange(models.Model):
+    """
+    Latest change of a webtoon, chapter or comment, read by `/api/sync/`.
+
+    Each object has (at most) one row, deleted and re-inserted on every write
+    so that its auto-incremented id always reflects the latest change; that id
+    is the sync cursor. Rows are inserted once the change is committed, one
+    writer per user at a time (see `api.sync`). Deleted objects keep a
+    tombstone row.
+    """
+
+    KIND_CHOICES = (
+        ('webtoon', 'webtoon'),
+        ('chapter', 'chapter'),
+        ('comment', 'comment'),
+    )
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='+',
+        help_text='Propriétaire du webtoon concerné.',
+    )
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    object_id = models.BigIntegerField()
+    # Not a foreign key: tombstones outlive their webtoon.
+    webtoon_pk = models.BigIntegerField()
+    deleted = models.BooleanField(default=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = 'sync change'
+        verbose_name_plural = 'sync changes'
+        indexes = [
+            models.Index(fields=['user', 'id'], name='api_syncchange_user_cursor'),
+            models.Index(fields=['kind', 'object_id'], name='api_syncchange_object'),
+            models.Index(fields=['webtoon_pk'], name='api_syncchange_webtoon'),
+        ]
+
+    def __str__(self) -> str:
+        action = 'suppression' if self.deleted else 'modification'
+        return f'{action} {self.kind} #{self.object_id}'
+
+
+class LibraryStats(models.Model):
+    """
+    Per-user aggregates served by `/api/webtoons/stats/`.
+
+    Built from the library on first read or write, then shifted incrementally
+    by every webtoon write (see `api.stats`).
+    """
+
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='+',
+    )
+    data = models.JSONField(default=dict)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = 'library stats'
+        verbose_name_plural = 'library stats'
+
+    def __str__(self) -> str:
+        return f'Statistiques de {self.user_id}'
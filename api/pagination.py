@@ -0,0 +1,32 @@
+from rest_framework.pagination import CursorPagination
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Opt-in keyset pagination (``?pagination=cursor``).
+
+    Unlike the default ``PageNumberPagination`` it never runs ``COUNT(*)`` and
+    seeks from the last seen ordering value instead of scanning an OFFSET, so
+    every page costs the same whatever its depth. Responses expose ``next`` and
+    ``previous`` links carrying an opaque ``cursor`` parameter, but no ``count``.
+    """
+
+    mode_query_param = 'pagination'
+    mode_value = 'cursor'
+
+    def __init__(self, ordering=None):
+        if ordering is not None:
+            self.ordering = ordering
+        self._explicit_ordering = ordering is not None
+
+    @classmethod
+    def is_requested(cls, request) -> bool:
+        params = request.query_params
+        return params.get(cls.mode_query_param) == cls.mode_value or cls.cursor_query_param in params
+
+    def get_ordering(self, request, queryset, view):
+        # Nested resources (chapters, comments) are not run through the view's
+        # OrderingFilter: their ordering is fixed by the caller.
+        if self._explicit_ordering:
+            return (self.ordering,) if isinstance(self.ordering, str) else tuple(self.ordering)
+        return super().get_ordering(request, queryset, view)
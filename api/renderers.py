@@ -0,0 +1,49 @@
+"""
+JSON renderer backed by orjson.
+
+The output is byte-for-byte what ``rest_framework.renderers.JSONRenderer``
+produces with the project settings (``UNICODE_JSON`` and ``COMPACT_JSON``
+enabled): compact separators, raw UTF-8 and escaped U+2028/U+2029. Values
+orjson does not handle natively (``Decimal``, lazy strings, querysets...) and
+datetimes go through DRF's ``JSONEncoder``. Indented output (browsable API,
+``; indent=`` media type parameter) and a missing ``orjson`` module fall back
+to the stock renderer.
+
+Only non-finite floats (rejected by DRF, ``null`` for orjson) and floats
+written with an exponent (``1e+16`` vs ``1e16``) differ; the API does not
+produce either.
+"""
+
+from __future__ import annotations
+
+from rest_framework.utils import encoders
+from rest_framework.renderers import JSONRenderer
+
+try:  # pragma: no cover - orjson est optionnel
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+class ORJSONRenderer(JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if (
+            orjson is None
+            or self.ensure_ascii
+            or not self.compact
+            or self.get_indent(accepted_media_type, renderer_context or {}) is not None
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(
+                data,
+                default=encoders.JSONEncoder().default,
+                option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS,
+            )
+        except orjson.JSONEncodeError:
+            # Let the stock renderer raise (or handle) whatever orjson refused.
+            return super().render(data, accepted_media_type, renderer_context)
+        return ret.replace('\u2028'.encode(), b'\\u2028').replace('\u2029'.encode(), b'\\u2029')
@@ -0,0 +1,156 @@
+"""
+Indexed full-text search for the webtoon library.
+
+PostgreSQL uses a generated ``tsvector`` column with a GIN index plus a
+``pg_trgm`` index on the title for typo tolerance (see migration 0005). Both
+index the text through ``api_unaccent()``, an immutable ``unaccent`` wrapper,
+so that search ignores accents as FTS5 does.
+SQLite, used in development and tests, relies on an FTS5 external-content
+table kept in sync by triggers. Any other backend falls back to the plain
+``SearchFilter`` behaviour (``ILIKE`` on ``search_fields``).
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+
+from django.db import connections
+from django.db.models import BooleanField, FloatField
+from django.db.models.expressions import RawSQL
+from django.db.utils import OperationalError
+from rest_framework.filters import SearchFilter
+
+logger = logging.getLogger(__name__)
+
+WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+# Columns indexed by both backends (title first: it carries the highest weight).
+# On PostgreSQL, titles also match by trigram similarity (`%` operator,
+# pg_trgm.similarity_threshold) so small typos still find the series.
+INDEXED_COLUMNS = ('title', 'type', 'language', 'status', 'comment')
+SQLITE_FTS_TABLE = 'api_webtoon_fts'
+SQLITE_BM25_WEIGHTS = (10.0, 2.0, 2.0, 1.0, 1.0)
+SQLITE_TRIGGERS = tuple(f'{SQLITE_FTS_TABLE}_{suffix}' for suffix in ('ai', 'ad', 'au'))
+
+_sqlite_fts_ready: dict[str, bool] = {}
+
+
+class WebtoonSearchFilter(SearchFilter):
+    """
+    `?search=` backed by the database full-text index, ranked by relevance.
+
+    Results are ordered by rank unless the client asks for an explicit
+    `?ordering=`, so this backend must come after `OrderingFilter`.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        terms = self.get_search_terms(request)
+        words = [word for term in terms for word in WORD_RE.findall(term)]
+        if not words:
+            return queryset
+
+        connection = connections[queryset.db]
+        if connection.vendor == 'postgresql':
+            queryset = self._filter_postgresql(queryset, words, ' '.join(terms))
+        elif connection.vendor == 'sqlite' and sqlite_search_index_ready(connection):
+            queryset = self._filter_sqlite(queryset, words)
+        else:
+            return super().filter_queryset(request, queryset, view)
+
+        ordering_param = getattr(view, 'ordering_param', None) or 'ordering'
+        if not request.query_params.get(ordering_param):
+            queryset = queryset.order_by('-search_rank', '-updated_at')
+        return queryset
+
+    @staticmethod
+    def _filter_postgresql(queryset, words, raw_term):
+        table = queryset.model._meta.db_table
+        tsquery = ' & '.join(f'{word.lower()}:*' for word in words)
+        query = "to_tsquery('simple', api_unaccent(%s))"
+        title = f"api_unaccent({table}.title)"
+        return queryset.alias(
+            search_match=RawSQL(
+                f"({table}.search_vector @@ {query} OR {title} %% api_unaccent(%s))",
+                [tsquery, raw_term],
+                output_field=BooleanField(),
+            )
+        ).filter(search_match=True).annotate(
+            search_rank=RawSQL(
+                f"ts_rank_cd({table}.search_vector, {query}) + similarity({title}, api_unaccent(%s))",
+                [tsquery, raw_term],
+                output_field=FloatField(),
+            )
+        )
+
+    @staticmethod
+    def _filter_sqlite(queryset, words):
+        table = queryset.model._meta.db_table
+        # Every word is quoted (no FTS operator injection) and prefix-matched.
+        match = ' '.join(f'"{word}"*' for word in words)
+        weights = ', '.join(str(weight) for weight in SQLITE_BM25_WEIGHTS)
+        return queryset.filter(
+            pk__in=RawSQL(f"SELECT rowid FROM {SQLITE_FTS_TABLE} WHERE {SQLITE_FTS_TABLE} MATCH %s", [match])
+        ).annotate(
+            # bm25() is lower for better matches.
+            search_rank=RawSQL(
+                f"(SELECT -bm25({SQLITE_FTS_TABLE}, {weights}) FROM {SQLITE_FTS_TABLE} "
+                f"WHERE {SQLITE_FTS_TABLE} MATCH %s AND {SQLITE_FTS_TABLE}.rowid = {table}.id)",
+                [match],
+                output_field=FloatField(),
+            )
+        )
+
+
+def sqlite_search_index_ready(connection) -> bool:
+    name = str(connection.settings_dict['NAME'])
+    if name not in _sqlite_fts_ready:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [SQLITE_FTS_TABLE])
+            _sqlite_fts_ready[name] = cursor.fetchone() is not None
+    return _sqlite_fts_ready[name]
+
+
+def ensure_sqlite_search_index(connection) -> None:
+    """
+    Create (or repair) the FTS5 table and its triggers on SQLite.
+
+    Run after every `migrate`: SQLite migrations that rebuild `api_webtoon`
+    drop its triggers, so they are recreated and the index rebuilt when missing.
+    """
+
+    columns = ', '.join(INDEXED_COLUMNS)
+    new_values = ', '.join(f'new.{column}' for column in INDEXED_COLUMNS)
+    old_values = ', '.join(f'old.{column}' for column in INDEXED_COLUMNS)
+    insert_trigger, delete_trigger, update_trigger = SQLITE_TRIGGERS
+    statements = [
+        f"CREATE TRIGGER IF NOT EXISTS {insert_trigger} AFTER INSERT ON api_webtoon BEGIN "
+        f"INSERT INTO {SQLITE_FTS_TABLE}(rowid, {columns}) VALUES (new.id, {new_values}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {delete_trigger} AFTER DELETE ON api_webtoon BEGIN "
+        f"INSERT INTO {SQLITE_FTS_TABLE}({SQLITE_FTS_TABLE}, rowid, {columns}) "
+        f"VALUES ('delete', old.id, {old_values}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {update_trigger} AFTER UPDATE OF {columns} ON api_webtoon BEGIN "
+        f"INSERT INTO {SQLITE_FTS_TABLE}({SQLITE_FTS_TABLE}, rowid, {columns}) "
+        f"VALUES ('delete', old.id, {old_values}); "
+        f"INSERT INTO {SQLITE_FTS_TABLE}(rowid, {columns}) VALUES (new.id, {new_values}); END",
+    ]
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT count(*) FROM sqlite_master WHERE type = 'trigger' AND name IN (%s, %s, %s)",
+            list(SQLITE_TRIGGERS),
+        )
+        if cursor.fetchone()[0] == len(SQLITE_TRIGGERS):
+            return
+        try:
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {SQLITE_FTS_TABLE} USING fts5({columns}, "
+                f"content='api_webtoon', content_rowid='id', tokenize='unicode61 remove_diacritics 2')"
+            )
+        except OperationalError as exc:
+            logger.warning("FTS5 indisponible (%s), la recherche utilisera ILIKE.", exc)
+            return
+        for statement in statements:
+            cursor.execute(statement)
+        cursor.execute(f"INSERT INTO {SQLITE_FTS_TABLE}({SQLITE_FTS_TABLE}) VALUES ('rebuild')")
+    _sqlite_fts_ready.pop(str(connection.settings_dict['NAME']), None)
@@ -1,8 +1,79 @@
+from django.core.exceptions import FieldDoesNotExist
 from rest_framework import serializers
 
 from .models import Chapter, Comment, Webtoon
 
 
+class ValuesRepresentation:
+    """
+    Build a serializer's representation straight from ``QuerySet.values()`` rows.
+
+    List endpoints use it to skip model instantiation and the per-field
+    attribute lookups of ``Serializer.to_representation``. Values the database
+    already returns in their JSON form are copied as is; other fields keep their
+    own ``to_representation``, so the payload is identical to the serializer's.
+    """
+
+    PASSTHROUGH_FIELDS = (
+        serializers.BooleanField,
+        serializers.CharField,
+        serializers.FloatField,
+        serializers.IntegerField,
+        serializers.JSONField,
+        serializers.PrimaryKeyRelatedField,
+        serializers.URLField,
+    )
+
+    def __init__(self, columns):
+        # (output name, model field name, converter or None)
+        self.columns = columns
+
+    @classmethod
+    def from_serializer(cls, serializer):
+        """Return a representation for ``serializer``, or None when a field needs the model instance."""
+
+        model = getattr(getattr(serializer, 'Meta', None), 'model', None)
+        if model is None:
+            return None
+
+        columns = []
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            if isinstance(field, (serializers.BaseSerializer, serializers.ManyRelatedField)):
+                return None
+            if isinstance(field, serializers.RelatedField) and type(field) is not serializers.PrimaryKeyRelatedField:
+                return None
+            try:
+                model._meta.get_field(field.source)
+            except FieldDoesNotExist:
+                # Dotted sources, properties, methods and SerializerMethodField.
+                return None
+            if isinstance(field, serializers.DateTimeField) and not hasattr(field, 'timezone'):
+                # Resolved once for the whole list instead of once per value.
+                field.timezone = field.default_timezone()
+            convert = None if type(field) in cls.PASSTHROUGH_FIELDS else field.to_representation
+            columns.append((name, field.source, convert))
+        return cls(columns)
+
+    def values(self, queryset):
+        """Return ``queryset.values()`` with the rendered columns and the ordering keys (cursor pagination)."""
+
+        ordering = [name.lstrip('-') for name in queryset.query.order_by if isinstance(name, str) and name != '?']
+        return queryset.values(*dict.fromkeys([source for _, source, _ in self.columns] + ordering))
+
+    def to_representation(self, rows) -> list[dict]:
+        columns = self.columns
+        items = []
+        for row in rows:
+            item = {}
+            for name, source, convert in columns:
+                value = row[source]
+                item[name] = value if convert is None or value is None else convert(value)
+            items.append(item)
+        return items
+
+
 class ChapterSerializer(serializers.ModelSerializer):
     """Serializer for Webtoon chapters."""
 
@@ -34,11 +105,84 @@ class CommentSerializer(serializers.ModelSerializer):
 
 
 class WebtoonSerializer(serializers.ModelSerializer):
-    """Serializer for Webtoon resources."""
+    """
+    Serializer for Webtoon resources.
+
+    Pass ``fields`` (an iterable of field names) to only render that subset;
+    ``select_fields`` resolves it from the ``?fields=``, ``?omit=`` and
+    ``?profile=`` query parameters.
+    """
+
+    PROFILES = {
+        'full': None,
+        # What the library grid displays: no free text and a single timestamp.
+        'compact': (
+            'id',
+            'title',
+            'type',
+            'language',
+            'rating',
+            'status',
+            'chapter',
+            'link',
+            'last_update',
+            'image_url',
+            'chapters_count',
+            'comments_count',
+        ),
+    }
 
     user = serializers.HiddenField(default=serializers.CurrentUserDefault())
-    chapters_count = serializers.SerializerMethodField()
-    comments_count = serializers.SerializerMethodField()
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in [name for name, field in self.fields.items() if not field.write_only and name not in fields]:
+                self.fields.pop(name)
+
+    @classmethod
+    def readable_fields(cls) -> tuple[str, ...]:
+        return tuple(name for name in cls.Meta.fields if name != 'user')
+
+    @classmethod
+    def select_fields(cls, *, fields=None, omit=None, profile=None, default_profile='full'):
+        """
+        Return the tuple of fields to render, or None for every field.
+
+        ``fields`` and ``omit`` are comma-separated lists; an explicit ``fields``
+        wins over the profile. ``id`` is always kept.
+        """
+
+        profile = profile or default_profile
+        if profile not in cls.PROFILES:
+            raise serializers.ValidationError(
+                {'profile': f"Profil inconnu : {profile}. Valeurs possibles : {', '.join(cls.PROFILES)}."}
+            )
+
+        readable = cls.readable_fields()
+        errors = {}
+        requested = {}
+        for param, value in (('fields', fields), ('omit', omit)):
+            if value is None:
+                continue
+            names = [name.strip() for name in value.split(',') if name.strip()]
+            unknown = [name for name in names if name not in readable]
+            if unknown:
+                errors[param] = f"Champ(s) inconnu(s) : {', '.join(unknown)}."
+            requested[param] = set(names)
+        if errors:
+            raise serializers.ValidationError(errors)
+
+        if 'fields' in requested:
+            selected = requested['fields']
+        elif cls.PROFILES[profile] is not None:
+            selected = set(cls.PROFILES[profile])
+        elif 'omit' in requested:
+            selected = set(readable)
+        else:
+            return None
+        selected = (selected - requested.get('omit', set())) | {'id'}
+        return tuple(name for name in readable if name in selected)
 
     class Meta:
         model = Webtoon
@@ -75,8 +219,61 @@ class WebtoonSerializer(serializers.ModelSerializer):
             'comment': {'allow_blank': True, 'required': False},
         }
 
-    def get_chapters_count(self, obj: Webtoon) -> int:
-        return getattr(obj, 'chapters_count', None) or obj.chapters.count()
 
-    def get_comments_count(self, obj: Webtoon) -> int:
-        return getattr(obj, 'comments_count', None) or obj.comments.count()
+class WebtoonSuggestionSerializer(serializers.Serializer):
+    """Lightweight representation returned by the title typeahead (schema only)."""
+
+    id = serializers.IntegerField()
+    title = serializers.CharField()
+    image_url = serializers.CharField()
+
+
+class WebtoonStatsSerializer(serializers.Serializer):
+    """Aggregates returned by the library statistics endpoint (schema only)."""
+
+    total = serializers.IntegerField()
+    chapters_read = serializers.IntegerField(help_text="Somme du dernier chapitre lu de chaque webtoon.")
+    average_rating = serializers.FloatField(allow_null=True)
+    by_status = serializers.DictField(child=serializers.IntegerField())
+    by_language = serializers.DictField(child=serializers.IntegerField())
+    by_type = serializers.DictField(child=serializers.IntegerField())
+    rating_histogram = serializers.DictField(
+        child=serializers.IntegerField(),
+        help_text="Nombre de webtoons par note entière (clés 0 à 5).",
+    )
+
+
+class BulkItemResultSerializer(serializers.Serializer):
+    """Outcome of one element of a bulk write (schema only)."""
+
+    index = serializers.IntegerField(help_text="Position de l'élément dans la liste envoyée.")
+    status = serializers.IntegerField(help_text="Code HTTP équivalent pour cet élément.")
+    data = serializers.DictField(required=False)
+    errors = serializers.DictField(required=False)
+
+
+class BulkWriteResultSerializer(serializers.Serializer):
+    """Response of the bulk write endpoints (schema only)."""
+
+    succeeded = serializers.IntegerField()
+    failed = serializers.IntegerField()
+    results = BulkItemResultSerializer(many=True)
+
+
+class SyncDeletedSerializer(serializers.Serializer):
+    """Identifiers of the objects deleted since the cursor (schema only)."""
+
+    webtoons = serializers.ListField(child=serializers.IntegerField())
+    chapters = serializers.ListField(child=serializers.IntegerField())
+    comments = serializers.ListField(child=serializers.IntegerField())
+
+
+class SyncSerializer(serializers.Serializer):
+    """Response of the delta-sync endpoint (schema only)."""
+
+    cursor = serializers.IntegerField(help_text="Valeur à renvoyer dans `since` lors de la prochaine synchronisation.")
+    has_more = serializers.BooleanField(help_text="D'autres changements attendent : rappeler avec le nouveau curseur.")
+    webtoons = WebtoonSerializer(many=True)
+    chapters = ChapterSerializer(many=True)
+    comments = CommentSerializer(many=True)
+    deleted = SyncDeletedSerializer()
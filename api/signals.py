@@ -0,0 +1,153 @@
+"""
+Signal handlers of the api app.
+
+They keep the denormalized counters of `Webtoon` in sync with its chapters
+and comments, feed the delta-sync change log (`api.sync`) and the library
+statistics (`api.stats`), invalidate the cached responses (`api.cache`) and
+make sure the SQLite search index exists after `migrate`.
+"""
+
+from django.contrib.auth import get_user_model
+from django.db import connections
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_migrate, post_save, pre_save
+from django.dispatch import receiver
+
+from . import cache as webtoon_cache
+from . import stats, sync
+from .models import Chapter, Comment, Webtoon
+from .search import ensure_sqlite_search_index
+
+
+def _webtoon_deleted(origin) -> bool:
+    """
+    Return True when the row is removed by the cascade of its webtoon deletion.
+
+    The parent row is going away, so its counters do not need updating. Other
+    cascades (e.g. a commenter account being deleted) must still be counted.
+    """
+
+    if isinstance(origin, QuerySet):
+        return origin.model is Webtoon
+    return isinstance(origin, Webtoon)
+
+
+@receiver(post_save, sender=Chapter)
+def increment_chapters_count(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        Webtoon.adjust_counters(instance.webtoon_id, chapters=1)
+
+
+@receiver(post_delete, sender=Chapter)
+def decrement_chapters_count(sender, instance, origin=None, **kwargs):
+    if not _webtoon_deleted(origin):
+        Webtoon.adjust_counters(instance.webtoon_id, chapters=-1)
+
+
+@receiver(post_save, sender=Comment)
+def increment_comments_count(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        Webtoon.adjust_counters(instance.webtoon_id, comments=1)
+
+
+@receiver(post_delete, sender=Comment)
+def decrement_comments_count(sender, instance, origin=None, **kwargs):
+    if not _webtoon_deleted(origin):
+        Webtoon.adjust_counters(instance.webtoon_id, comments=-1)
+
+
+def _owner_deleted(origin, user_id: int) -> bool:
+    """Return True when the owner account is being deleted: its change log goes with it."""
+
+    User = get_user_model()
+    if isinstance(origin, QuerySet):
+        return origin.model is User and origin.filter(pk=user_id).exists()
+    return isinstance(origin, User) and origin.pk == user_id
+
+
+@receiver(post_save, sender=Webtoon)
+def record_webtoon_change(sender, instance, raw=False, **kwargs):
+    if not raw:
+        sync.record(instance.user_id, [instance])
+
+
+@receiver(post_delete, sender=Webtoon)
+def record_webtoon_deletion(sender, instance, origin=None, **kwargs):
+    if not _owner_deleted(origin, instance.user_id):
+        sync.record_webtoon_deletion(instance)
+
+
+@receiver(pre_save, sender=Webtoon)
+def remember_webtoon_stats(sender, instance, raw=False, **kwargs):
+    if not raw:
+        stats.remember(instance)
+
+
+@receiver(post_save, sender=Webtoon)
+def record_webtoon_stats(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    if not raw:
+        stats.record_save(instance, created, update_fields)
+
+
+@receiver(post_delete, sender=Webtoon)
+def remove_webtoon_stats(sender, instance, origin=None, **kwargs):
+    if not _owner_deleted(origin, instance.user_id):
+        stats.record_delete(instance)
+
+
+@receiver(post_save, sender=Chapter)
+@receiver(post_save, sender=Comment)
+def record_child_change(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    webtoon = instance.webtoon
+    sync.record(webtoon.user_id, [instance])
+    if created:
+        # Its counters changed.
+        sync.record(webtoon.user_id, [webtoon])
+
+
+@receiver(post_delete, sender=Chapter)
+@receiver(post_delete, sender=Comment)
+def record_child_deletion(sender, instance, origin=None, **kwargs):
+    if _webtoon_deleted(origin):
+        return
+    webtoon = instance.webtoon
+    if not _owner_deleted(origin, webtoon.user_id):
+        sync.record(webtoon.user_id, [instance], deleted=True)
+        sync.record(webtoon.user_id, [webtoon])
+
+
+@receiver(post_save, sender=Webtoon)
+def invalidate_webtoon_cache(sender, instance, raw=False, **kwargs):
+    if not raw:
+        webtoon_cache.invalidate_on_commit(instance.user_id, webtoons=[instance])
+
+
+@receiver(post_delete, sender=Webtoon)
+def invalidate_deleted_webtoon_cache(sender, instance, **kwargs):
+    webtoon_cache.invalidate_on_commit(instance.user_id, deleted_ids=[instance.pk])
+
+
+@receiver(post_save, sender=Chapter)
+@receiver(post_save, sender=Comment)
+def invalidate_child_cache(sender, instance, raw=False, **kwargs):
+    if not raw:
+        webtoon_cache.invalidate_webtoon_on_commit(instance.webtoon.user_id, instance.webtoon_id)
+
+
+@receiver(post_delete, sender=Chapter)
+@receiver(post_delete, sender=Comment)
+def invalidate_deleted_child_cache(sender, instance, origin=None, **kwargs):
+    # The webtoon deletion already moves its owner to a new generation.
+    if not _webtoon_deleted(origin):
+        webtoon_cache.invalidate_webtoon_on_commit(instance.webtoon.user_id, instance.webtoon_id)
+
+
+@receiver(post_migrate)
+def ensure_search_index(sender, using='default', **kwargs):
+    if sender.name != 'api':
+        return
+    connection = connections[using]
+    if connection.vendor == 'sqlite' and Webtoon._meta.db_table in connection.introspection.table_names():
+        ensure_sqlite_search_index(connection)
@@ -0,0 +1,166 @@
+"""
+Per-user library statistics, maintained incrementally.
+
+A ``LibraryStats`` row holds the aggregates of a user's library: totals, the
+breakdowns by status, language and type and a rating histogram. Each webtoon
+contributes ``+1`` to its buckets; a write applies the difference between the
+new and the previous contribution under a row lock, so reading the stats never
+scans the library. The previous values come from ``Webtoon._loaded_values``
+(filled by ``from_db``) or, failing that, from the database before the save.
+
+Rows are built lazily, by the first read or write, from the library as it
+stands in the database. A write builds the row after its own change, inside
+its transaction, so the row already includes it. When two transactions
+build the same row, the second one fails to insert it and applies its delta
+to the committed row instead, so no write is lost. The
+``rebuild_library_stats`` command recomputes rows that have drifted.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+
+from django.db import IntegrityError, transaction
+
+from .models import LibraryStats, Webtoon
+
+STATS_FIELDS = ('status', 'language', 'type', 'rating', 'chapter')
+BREAKDOWNS = ('by_status', 'by_language', 'by_type', 'by_rating')
+RATING_BUCKETS = tuple(str(bucket) for bucket in range(6))
+
+
+def _contribution(values: dict, sign: int = 1) -> dict:
+    rating = values['rating'] or 0.0
+    return {
+        'total': sign,
+        'chapters_read': sign * (values['chapter'] or 0),
+        # Ratings are summed in hundredths to stay exact.
+        'rating_centi': sign * round(rating * 100),
+        'by_status': {values['status']: sign},
+        'by_language': {values['language']: sign},
+        'by_type': {values['type']: sign},
+        'by_rating': {str(min(int(rating), 5)): sign},
+    }
+
+
+def _merge(data: dict, delta: dict) -> dict:
+    merged = dict(data)
+    for key, value in delta.items():
+        if isinstance(value, dict):
+            bucket = dict(merged.get(key, {}))
+            for name, count in value.items():
+                bucket[name] = bucket.get(name, 0) + count
+                if not bucket[name]:
+                    del bucket[name]
+            merged[key] = bucket
+        else:
+            merged[key] = merged.get(key, 0) + value
+    return merged
+
+
+def _current_values(instance: Webtoon) -> dict:
+    return {field: getattr(instance, field) for field in STATS_FIELDS}
+
+
+def _apply(user_id: int, deltas: Iterable[dict]) -> None:
+    delta = {}
+    for item in deltas:
+        delta = _merge(delta, item)
+    if not any(delta.values()):
+        return
+    with transaction.atomic():
+        row = LibraryStats.objects.select_for_update().filter(user_id=user_id).first()
+        if row is None:
+            if _create(user_id) is not None:
+                # Built after the write: the delta is already counted.
+                return
+            row = LibraryStats.objects.select_for_update().get(user_id=user_id)
+        row.data = _merge(row.data, delta)
+        row.save(update_fields=['data', 'updated_at'])
+
+
+def remember(instance: Webtoon) -> None:
+    """Make sure the values before a save are known (``pre_save``)."""
+
+    if instance.pk is None:
+        return
+    loaded = getattr(instance, '_loaded_values', {})
+    if all(field in loaded for field in STATS_FIELDS):
+        return
+    previous = Webtoon.objects.filter(pk=instance.pk).values(*STATS_FIELDS).first()
+    instance._loaded_values = {**loaded, **(previous or {})}
+
+
+def record_save(instance: Webtoon, created: bool, update_fields=None) -> None:
+    loaded = getattr(instance, '_loaded_values', {})
+    new_values = _current_values(instance)
+    deltas = []
+    if not created:
+        previous = {field: loaded[field] for field in STATS_FIELDS}
+        if update_fields is not None:
+            # Fields left out of update_fields keep their stored value.
+            new_values = {
+                field: new_values[field] if field in update_fields else previous[field] for field in STATS_FIELDS
+            }
+        deltas.append(_contribution(previous, -1))
+    deltas.append(_contribution(new_values))
+    _apply(instance.user_id, deltas)
+    instance._loaded_values = {**loaded, **new_values}
+
+
+def record_delete(instance: Webtoon) -> None:
+    previous = {**_current_values(instance), **getattr(instance, '_loaded_values', {})}
+    _apply(instance.user_id, [_contribution({field: previous[field] for field in STATS_FIELDS}, -1)])
+
+
+def record_bulk(user_id: int, instances: Iterable[Webtoon], *, created: bool) -> None:
+    """Account for ``bulk_create`` / ``bulk_update``, which send no signal."""
+
+    deltas = []
+    for instance in instances:
+        loaded = getattr(instance, '_loaded_values', {})
+        deltas.append(_contribution(_current_values(instance)))
+        if not created:
+            deltas.append(_contribution({field: loaded[field] for field in STATS_FIELDS}, -1))
+        instance._loaded_values = {**loaded, **_current_values(instance)}
+    _apply(user_id, deltas)
+
+
+def build(user_id: int) -> dict:
+    data = {'total': 0, 'chapters_read': 0, 'rating_centi': 0, **{key: {} for key in BREAKDOWNS}}
+    for values in Webtoon.objects.filter(user_id=user_id).values(*STATS_FIELDS).iterator(chunk_size=2000):
+        data = _merge(data, _contribution(values))
+    return data
+
+
+def _create(user_id: int) -> dict | None:
+    """Build and save the row of ``user_id``; None when another transaction saved it first."""
+
+    data = build(user_id)
+    try:
+        with transaction.atomic():
+            LibraryStats.objects.create(user_id=user_id, data=data)
+    except IntegrityError:
+        return None
+    return data
+
+
+def get_stats(user_id: int) -> dict:
+    row = LibraryStats.objects.filter(user_id=user_id).first()
+    if row is not None:
+        data = row.data
+    else:
+        data = _create(user_id)
+        if data is None:
+            data = LibraryStats.objects.get(user_id=user_id).data
+
+    total = data.get('total', 0)
+    return {
+        'total': total,
+        'chapters_read': data.get('chapters_read', 0),
+        'average_rating': round(data.get('rating_centi', 0) / total / 100, 2) if total else None,
+        'by_status': data.get('by_status', {}),
+        'by_language': data.get('by_language', {}),
+        'by_type': data.get('by_type', {}),
+        'rating_histogram': {bucket: data.get('by_rating', {}).get(bucket, 0) for bucket in RATING_BUCKETS},
+    }
@@ -0,0 +1,121 @@
+"""
+Per-user prefix index used by the title typeahead.
+
+The index holds, for every webtoon of a user, one key per word start of its
+normalized title ("Solo Leveling" -> ``sololeveling`` and ``leveling``), kept
+sorted so that a prefix lookup is a bisection. It lives in the cache next to
+the response entries and follows the same generations:
+
+* a read for generation ``g`` rebuilds the index from a single ``values_list``
+  query when no entry exists for ``g``;
+* webtoon writes moving the user from ``g - 1`` to ``g`` patch the
+  ``g - 1`` index in place and store it for ``g``. When that entry is missing
+  (evicted, or a concurrent write got there first) nothing is stored and the
+  next read rebuilds.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .models import Webtoon
+from .text import normalize_key, normalized_words
+
+SUGGEST_TIMEOUT = getattr(settings, 'CACHE_MIDDLEWARE_SECONDS', 300)
+MAX_SCANNED_KEYS = 200
+
+
+def _index_key(user_id: int, generation: int) -> str:
+    return f"webtoon:{user_id}:g{generation}:suggest"
+
+
+def _title_keys(title: str) -> list[tuple[str, int]]:
+    """Return ``(key, rank)`` pairs: rank 0 for the title start, 1 for inner words."""
+
+    words = normalized_words(title)
+    return [(''.join(words[start:]), 0 if start == 0 else 1) for start in range(len(words))]
+
+
+def _empty_index() -> dict:
+    return {'keys': [], 'entries': [], 'items': {}}
+
+
+def _add(index: dict, webtoon_id: int, title: str, image_url: str) -> None:
+    index['items'][webtoon_id] = (title, image_url)
+    for key, rank in _title_keys(title):
+        position = bisect_left(index['keys'], key)
+        index['keys'].insert(position, key)
+        index['entries'].insert(position, (rank, webtoon_id))
+
+
+def _remove(index: dict, webtoon_id: int) -> None:
+    if index['items'].pop(webtoon_id, None) is None:
+        return
+    kept = [(key, entry) for key, entry in zip(index['keys'], index['entries']) if entry[1] != webtoon_id]
+    index['keys'] = [key for key, _ in kept]
+    index['entries'] = [entry for _, entry in kept]
+
+
+def build_index(user_id: int) -> dict:
+    rows = sorted(
+        (key, rank, webtoon_id, title, image_url)
+        for webtoon_id, title, image_url in Webtoon.objects.filter(user_id=user_id).values_list(
+            'id', 'title', 'image_url'
+        )
+        for key, rank in _title_keys(title)
+    )
+    index = _empty_index()
+    index['keys'] = [row[0] for row in rows]
+    index['entries'] = [(row[1], row[2]) for row in rows]
+    index['items'] = {row[2]: (row[3], row[4]) for row in rows}
+    return index
+
+
+def get_index(user_id: int, generation: int) -> dict:
+    key = _index_key(user_id, generation)
+    index = cache.get(key)
+    if index is None:
+        index = build_index(user_id)
+        cache.set(key, index, SUGGEST_TIMEOUT)
+    return index
+
+
+def apply_write(user_id: int, generation: int, webtoons=(), deleted_ids=()) -> None:
+    """Carry the index of ``generation - 1`` over to ``generation`` with the given webtoons changed."""
+
+    index = cache.get(_index_key(user_id, generation - 1))
+    if index is None:
+        return
+    for webtoon_id in deleted_ids:
+        _remove(index, webtoon_id)
+    for webtoon in webtoons:
+        _remove(index, webtoon.pk)
+        _add(index, webtoon.pk, webtoon.title, webtoon.image_url)
+    cache.set(_index_key(user_id, generation), index, SUGGEST_TIMEOUT)
+
+
+def suggest(index: dict, query: str, limit: int = 10) -> list[dict]:
+    """Return up to ``limit`` ``{id, title, image_url}`` dicts whose title matches ``query``."""
+
+    prefix = normalize_key(query)
+    if not prefix:
+        return []
+
+    keys = index['keys']
+    best: dict[int, int] = {}
+    position = bisect_left(keys, prefix)
+    end = min(len(keys), position + MAX_SCANNED_KEYS)
+    while position < end and keys[position].startswith(prefix):
+        rank, webtoon_id = index['entries'][position]
+        best[webtoon_id] = min(rank, best.get(webtoon_id, rank))
+        position += 1
+
+    items = index['items']
+    ordered = sorted(best, key=lambda webtoon_id: (best[webtoon_id], items[webtoon_id][0].lower()))
+    return [
+        {'id': webtoon_id, 'title': items[webtoon_id][0], 'image_url': items[webtoon_id][1]}
+        for webtoon_id in ordered[:limit]
+    ]
@@ -0,0 +1,89 @@
+"""
+Change log behind the delta-sync endpoint (``/api/sync/``).
+
+Each write to a webtoon, chapter or comment replaces the object's
+``SyncChange`` row by a new one, so rows are ordered by their latest change
+and a client only ever downloads the current state of what changed since its
+cursor (the id of the last row it saw). Deletions leave a tombstone row.
+Deleting a webtoon drops the rows of its chapters and comments: the webtoon
+tombstone implies them.
+
+Signal handlers (``api.signals``) cover ``save()`` and ``delete()``; code
+writing with ``bulk_create`` / ``bulk_update`` / ``update`` calls ``record``
+itself.
+
+Rows are written once the transaction of the change commits, in their own
+short transaction. Ids are assigned at insert time but only become visible at
+commit: a row inserted at the start of a long transaction (a scrape) would
+otherwise show up below cursors already handed out, and be missed for good.
+For the same reason the writes of one user are serialized on the owner's row
+(``SELECT ... FOR UPDATE``): a write takes its ids once the previous one has
+committed, so a user's rows become visible in id order. SQLite serializes
+writes anyway.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+
+from django.contrib.auth import get_user_model
+from django.db import models, transaction
+
+from .models import SyncChange, Webtoon
+
+
+def _kind(instance: models.Model) -> str:
+    return instance._meta.model_name
+
+
+def record(user_id: int, instances: Iterable[models.Model], *, deleted: bool = False) -> None:
+    """Log a change of ``instances`` (all of the same model) owned by ``user_id``."""
+
+    instances = list(instances)
+    if not instances:
+        return
+    kind = _kind(instances[0])
+    # Built right away: deleted instances lose their pk once the deletion is over.
+    rows = [
+        SyncChange(
+            user_id=user_id,
+            kind=kind,
+            object_id=instance.pk,
+            webtoon_pk=instance.pk if isinstance(instance, Webtoon) else instance.webtoon_id,
+            deleted=deleted,
+        )
+        for instance in instances
+    ]
+    transaction.on_commit(lambda: _write(user_id, kind, rows))
+
+
+def record_webtoon_deletion(webtoon: Webtoon) -> None:
+    webtoon_pk = webtoon.pk
+    transaction.on_commit(
+        lambda: SyncChange.objects.filter(webtoon_pk=webtoon_pk).exclude(kind='webtoon').delete()
+    )
+    record(webtoon.user_id, [webtoon], deleted=True)
+
+
+def _write(user_id: int, kind: str, rows: list[SyncChange]) -> None:
+    with transaction.atomic():
+        # The owner account may have been deleted in the same transaction: its log went with it.
+        if not get_user_model().objects.select_for_update().filter(pk=user_id).values_list('pk', flat=True):
+            return
+        SyncChange.objects.filter(kind=kind, object_id__in=[row.object_id for row in rows]).delete()
+        SyncChange.objects.bulk_create(rows)
+
+
+def changes_since(user_id: int, since: int, limit: int) -> tuple[list[SyncChange], bool, int]:
+    """Return up to ``limit`` changes after cursor ``since``, whether more are pending and the next cursor."""
+
+    rows = list(
+        SyncChange.objects.filter(user_id=user_id, id__gt=since)
+        .order_by('id')
+        .only('id', 'kind', 'object_id', 'deleted')[: limit + 1]
+    )
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    # Concurrent writes of one object can leave two rows: the newest wins.
+    latest = {(row.kind, row.object_id): row for row in rows}
+    return list(latest.values()), has_more, rows[-1].pk if rows else since
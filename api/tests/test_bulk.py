@@ -0,0 +1,89 @@
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from accounts.models import Feature, User
+from api.models import Chapter, Webtoon
+
+
+class BulkWriteTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.feature = Feature.objects.get(code='webtoon_management')
+        self.user = User.objects.create_user(
+            username='bulk_user',
+            email='bulk@example.com',
+            password='bulkPass123',
+        )
+        self.user.features.add(self.feature)
+        self.client.force_authenticate(self.user)
+        self.bulk_url = reverse('api:webtoon-bulk')
+        self.payload = {'type': 'Manhwa', 'language': 'Français', 'rating': 4.0, 'status': 'En cours'}
+
+    def _create(self, title, user=None):
+        return Webtoon.objects.create(title=title, chapter=1, user=user or self.user, **self.payload)
+
+    def test_bulk_create_reports_each_item(self):
+        response = self.client.post(
+            self.bulk_url,
+            [
+                {'title': 'Omega', 'chapter': 3, **self.payload},
+                {'title': 'Broken', 'chapter': -1, **self.payload},
+                {'title': 'Alpha', 'chapter': 1, **self.payload},
+            ],
+            format='json',
+        )
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertEqual((response.data['succeeded'], response.data['failed']), (2, 1))
+        self.assertEqual([result['status'] for result in response.data['results']], [201, 400, 201])
+        self.assertIn('chapter', response.data['results'][1]['errors'])
+        self.assertEqual(
+            set(Webtoon.objects.filter(user=self.user).values_list('title', flat=True)),
+            {'Omega', 'Alpha'},
+        )
+        self.assertIsNotNone(response.data['results'][0]['data']['id'])
+
+    def test_bulk_patch_updates_progress_and_refreshes_cache(self):
+        first, second = self._create('Un'), self._create('Deux')
+        foreign = self._create('Ailleurs', user=User.objects.create_user(username='x', email='x@example.com'))
+        list_url = reverse('api:webtoon-list')
+        self.client.get(list_url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch(
+                self.bulk_url,
+                [{'id': first.id, 'chapter': 42}, {'id': second.id, 'chapter': 7}, {'id': foreign.id, 'chapter': 9}],
+                format='json',
+            )
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertEqual([result['status'] for result in response.data['results']], [200, 200, 404])
+        first.refresh_from_db()
+        foreign.refresh_from_db()
+        self.assertEqual((first.chapter, foreign.chapter), (42, 1))
+
+        chapters = {item['title']: item['chapter'] for item in self.client.get(list_url).json()['results']}
+        self.assertEqual(chapters, {'Un': 42, 'Deux': 7})
+
+    def test_bulk_chapters_rejects_duplicates_and_updates_counter(self):
+        webtoon = self._create('Série')
+        Chapter.objects.create(webtoon=webtoon, chapter_number=1, title='Existant')
+        url = reverse('api:webtoon-chapters-bulk', args=[webtoon.id])
+        response = self.client.post(
+            url,
+            [
+                {'chapter_number': 1, 'title': 'Doublon'},
+                {'chapter_number': 2, 'title': 'Deux'},
+                {'chapter_number': 3, 'title': 'Trois'},
+                {'chapter_number': 3, 'title': 'Trois bis'},
+            ],
+            format='json',
+        )
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertEqual([result['status'] for result in response.data['results']], [400, 201, 201, 400])
+        webtoon.refresh_from_db()
+        self.assertEqual(webtoon.chapters_count, 3)
+
+    def test_bulk_requires_a_list(self):
+        response = self.client.post(self.bulk_url, {'title': 'Seul'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
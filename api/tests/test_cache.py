@@ -0,0 +1,381 @@
+import gzip
+import json
+import time
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import SimpleTestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils.http import http_date
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from accounts.models import Feature, User
+from api import cache as webtoon_cache
+from api.models import Chapter, Webtoon
+
+
+class GenerationTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_bump_moves_to_a_new_generation(self):
+        first = webtoon_cache.get_generation(42)
+        self.assertEqual(webtoon_cache.get_generation(42), first)
+        self.assertEqual(webtoon_cache.bump_generation(42), first + 1)
+        self.assertEqual(webtoon_cache.get_generation(42), first + 1)
+
+    def test_evicted_generation_is_reseeded_above_previous_values(self):
+        first = webtoon_cache.get_generation(42)
+        cache.delete(webtoon_cache._generation_key(42))
+        self.assertGreaterEqual(webtoon_cache.bump_generation(42), first + 1)
+
+    def test_generations_are_isolated_per_user(self):
+        other = webtoon_cache.get_generation(7)
+        webtoon_cache.bump_generation(42)
+        self.assertEqual(webtoon_cache.get_generation(7), other)
+
+
+class EarlyRefreshTests(SimpleTestCase):
+    def test_entries_are_refreshed_as_expiry_nears(self):
+        entry = {'delta': 0.1, 'expires_at': time.time() + 3600}
+        self.assertFalse(webtoon_cache.should_refresh_early(entry))
+        entry['expires_at'] = time.time()
+        self.assertTrue(webtoon_cache.should_refresh_early(entry))
+        self.assertFalse(webtoon_cache.should_refresh_early({'content': b''}))
+
+
+class WebtoonCacheInvalidationTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username='cache_user',
+            email='cache@example.com',
+            password='cachePass123',
+        )
+        self.user.features.add(Feature.objects.get(code='webtoon_management'))
+        self.client.force_authenticate(self.user)
+        self.webtoon = Webtoon.objects.create(
+            title='Omniscient Reader',
+            type='Manhwa',
+            language='Français',
+            rating=4.9,
+            status='En cours',
+            chapter=150,
+            user=self.user,
+        )
+
+    def test_chapter_creation_refreshes_cached_list(self):
+        list_url = reverse('api:webtoon-list')
+        first = self.client.get(list_url)
+        self.assertEqual(first.data['results'][0]['chapters_count'], 0)
+
+        chapters_url = reverse('api:webtoon-chapters', args=[self.webtoon.id])
+        with self.captureOnCommitCallbacks(execute=True):
+            create_response = self.client.post(
+                chapters_url,
+                {'chapter_number': 151, 'title': 'Scénario'},
+                format='json',
+            )
+        self.assertEqual(create_response.status_code, status.HTTP_201_CREATED)
+
+        second = self.client.get(list_url)
+        self.assertEqual(second.data['results'][0]['chapters_count'], 1)
+
+    def test_writes_outside_the_api_refresh_cached_pages(self):
+        list_url = reverse('api:webtoon-list')
+        chapters_url = reverse('api:webtoon-chapters', args=[self.webtoon.id])
+        self.client.get(list_url)
+        self.client.get(chapters_url)
+
+        # Admin edits, the scraper and cascades write without going through the views.
+        with self.captureOnCommitCallbacks(execute=True):
+            self.webtoon.title = 'Renamed'
+            self.webtoon.save()
+            Chapter.objects.create(webtoon=self.webtoon, chapter_number=151, title='Scénario')
+        self.assertEqual(self.client.get(list_url).json()['results'][0]['title'], 'Renamed')
+        self.assertEqual(len(self.client.get(chapters_url).json()['results']), 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Chapter.objects.filter(webtoon=self.webtoon).delete()
+        self.assertEqual(self.client.get(chapters_url).json()['results'], [])
+
+    def test_cache_is_invalidated_once_the_write_commits(self):
+        list_url = reverse('api:webtoon-list')
+        self.client.get(list_url)
+        with self.captureOnCommitCallbacks() as callbacks:
+            Webtoon.objects.filter(pk=self.webtoon.pk).update(title='Renamed')
+            self.webtoon.refresh_from_db()
+            self.webtoon.save()
+            # Not committed yet: a rebuild now could store rows readers may not see.
+            self.assertEqual(self.client.get(list_url).json()['results'][0]['title'], 'Omniscient Reader')
+        self.assertTrue(callbacks)
+
+    def test_cache_keys_do_not_use_a_key_index(self):
+        self.client.get(reverse('api:webtoon-list'))
+        self.client.get(reverse('api:webtoon-detail', args=[self.webtoon.id]))
+        self.assertIsNone(cache.get(f'webtoon:index:{self.user.pk}'))
+
+
+class WebtoonScopeTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username='scope_user',
+            email='scope@example.com',
+            password='scopePass123',
+        )
+        self.user.features.add(Feature.objects.get(code='webtoon_management'))
+        self.client.force_authenticate(self.user)
+        self.commented = self._create('Eleceed')
+        self.other = self._create('Noblesse')
+
+    def _create(self, title):
+        return Webtoon.objects.create(
+            title=title,
+            type='Manhwa',
+            language='Français',
+            rating=4.5,
+            status='En cours',
+            chapter=10,
+            user=self.user,
+        )
+
+    def _comment(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                reverse('api:webtoon-comments', args=[self.commented.id]),
+                {'text': 'Jiwoo !'},
+                format='json',
+            )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_child_writes_keep_unrelated_pages_cached(self):
+        urls = {
+            'other_detail': reverse('api:webtoon-detail', args=[self.other.id]),
+            'other_comments': reverse('api:webtoon-comments', args=[self.other.id]),
+            'list_without_counters': f"{reverse('api:webtoon-list')}?fields=title",
+            'list_of_other_rows': f"{reverse('api:webtoon-list')}?search=noblesse",
+        }
+        first = {name: self.client.get(url).json() for name, url in urls.items()}
+        generation = webtoon_cache.get_generation(self.user.pk)
+
+        self._comment()
+        # Bypass the API so that only a cache hit can return the old titles.
+        Webtoon.objects.filter(user=self.user).update(title='Renamed')
+        self.assertEqual(webtoon_cache.get_generation(self.user.pk), generation)
+        for name, url in urls.items():
+            with self.subTest(name=name):
+                self.assertEqual(self.client.get(url).json(), first[name])
+
+    def test_child_writes_refresh_the_pages_of_their_webtoon(self):
+        urls = {
+            'detail': reverse('api:webtoon-detail', args=[self.commented.id]),
+            'comments': reverse('api:webtoon-comments', args=[self.commented.id]),
+            'list': reverse('api:webtoon-list'),
+        }
+        first = {name: self.client.get(url) for name, url in urls.items()}
+        self._comment()
+        for name, url in urls.items():
+            with self.subTest(name=name):
+                second = self.client.get(url, HTTP_IF_NONE_MATCH=first[name].headers['ETag'])
+                self.assertEqual(second.status_code, status.HTTP_200_OK)
+                self.assertNotEqual(second.json(), first[name].json())
+
+    def test_list_page_built_during_a_child_write_is_not_stored(self):
+        states = webtoon_cache.get_webtoon_states(self.user.pk, [self.commented.id])
+        child_writes = webtoon_cache.get_child_writes(self.user.pk)
+        webtoon_cache.bump_webtoon_generation(self.user.pk, self.other.id)
+        self.assertIsNone(webtoon_cache.get_row_states(self.user.pk, [self.commented.id], child_writes))
+        child_writes = webtoon_cache.get_child_writes(self.user.pk)
+        self.assertEqual(webtoon_cache.get_row_states(self.user.pk, [self.commented.id], child_writes), states)
+
+
+class SingleFlightTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username='flight_user',
+            email='flight@example.com',
+            password='flightPass123',
+        )
+        self.user.features.add(Feature.objects.get(code='webtoon_management'))
+        self.client.force_authenticate(self.user)
+        self.webtoon = Webtoon.objects.create(
+            title='Tower of God',
+            type='Manhwa',
+            language='Français',
+            rating=4.6,
+            status='En cours',
+            chapter=600,
+            user=self.user,
+        )
+        self.url = reverse('api:webtoon-list')
+
+    def test_misses_are_rebuilt_without_waiting(self):
+        self.client.get(self.url)
+        Webtoon.objects.filter(pk=self.webtoon.pk).update(title='Renamed')
+        webtoon_cache.bump_generation(self.user.pk)
+        with (
+            # Another request is refreshing a page: a miss does not wait for it.
+            mock.patch.object(webtoon_cache, 'acquire_rebuild_lock', return_value=False),
+            mock.patch('time.sleep', side_effect=AssertionError('no request should sleep')),
+        ):
+            response = self.client.get(self.url)
+        self.assertEqual(response.json()['results'][0]['title'], 'Renamed')
+
+    def test_rebuild_lock_is_released(self):
+        detail_url = reverse('api:webtoon-detail', args=[self.webtoon.id])
+        self.client.get(self.url)
+        self.client.get(detail_url)
+        release_lock = webtoon_cache.release_rebuild_lock
+        with (
+            mock.patch.object(webtoon_cache, 'should_refresh_early', return_value=True),
+            mock.patch.object(webtoon_cache, 'release_rebuild_lock', wraps=release_lock) as release,
+        ):
+            self.client.get(self.url)
+            self.client.get(detail_url)
+        self.assertEqual(release.call_count, 2)
+        self.assertIsNone(cache.get(f'{release.call_args_list[0].args[0]}:lock'))
+
+    def test_entry_close_to_expiry_is_refreshed_by_one_request(self):
+        self.client.get(self.url)
+        Webtoon.objects.filter(pk=self.webtoon.pk).update(title='Renamed')
+        with mock.patch.object(webtoon_cache, 'should_refresh_early', return_value=True):
+            with mock.patch.object(webtoon_cache, 'acquire_rebuild_lock', return_value=False):
+                # Someone else is refreshing it: the current entry is served.
+                self.assertEqual(self.client.get(self.url).json()['results'][0]['title'], 'Tower of God')
+            self.assertEqual(self.client.get(self.url).json()['results'][0]['title'], 'Renamed')
+
+
+class ConditionalGetTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username='etag_user',
+            email='etag@example.com',
+            password='etagPass123',
+        )
+        self.user.features.add(Feature.objects.get(code='webtoon_management'))
+        self.client.force_authenticate(self.user)
+        self.webtoon = Webtoon.objects.create(
+            title='Lookism',
+            type='Manhwa',
+            language='Français',
+            rating=4.0,
+            status='En cours',
+            chapter=500,
+            user=self.user,
+        )
+
+    def test_matching_etag_returns_not_modified(self):
+        for url in (
+            reverse('api:webtoon-list'),
+            reverse('api:webtoon-detail', args=[self.webtoon.id]),
+            reverse('api:webtoon-chapters', args=[self.webtoon.id]),
+            reverse('api:webtoon-comments', args=[self.webtoon.id]),
+        ):
+            with self.subTest(url=url):
+                first = self.client.get(url)
+                self.assertEqual(first.status_code, status.HTTP_200_OK)
+                self.assertIn('ETag', first.headers)
+                self.assertIn('Last-Modified', first.headers)
+
+                second = self.client.get(url, HTTP_IF_NONE_MATCH=first.headers['ETag'])
+                self.assertEqual(second.status_code, status.HTTP_304_NOT_MODIFIED)
+                self.assertEqual(second.content, b'')
+                self.assertEqual(second.headers['ETag'], first.headers['ETag'])
+
+    def test_write_changes_the_etag(self):
+        url = reverse('api:webtoon-list')
+        first = self.client.get(url)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                reverse('api:webtoon-comments', args=[self.webtoon.id]),
+                {'text': 'Toujours aussi bon.'},
+                format='json',
+            )
+        second = self.client.get(url, HTTP_IF_NONE_MATCH=first.headers['ETag'])
+        self.assertEqual(second.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(second.headers['ETag'], first.headers['ETag'])
+        self.assertEqual(second.data['results'][0]['comments_count'], 1)
+
+    def test_if_modified_since_returns_not_modified(self):
+        url = reverse('api:webtoon-detail', args=[self.webtoon.id])
+        first = self.client.get(url)
+        second = self.client.get(url, HTTP_IF_MODIFIED_SINCE=first.headers['Last-Modified'])
+        self.assertEqual(second.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_unreadable_webtoon_is_never_not_modified(self):
+        stranger = User.objects.create_user(username='etag_stranger', email='s@example.com', password='strangerPass1')
+        private = Webtoon.objects.create(
+            title='Private', type='Manga', language='Français', rating=1.0, status='En cours', chapter=1, user=stranger
+        )
+        future = http_date(time.time() + 3600)
+        for webtoon_id in (999999, private.id):
+            for name in ('api:webtoon-detail', 'api:webtoon-chapters', 'api:webtoon-comments'):
+                with self.subTest(webtoon_id=webtoon_id, name=name):
+                    response = self.client.get(reverse(name, args=[webtoon_id]), HTTP_IF_MODIFIED_SINCE=future)
+                    self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+            # No cache state is created for ids the user cannot read.
+            self.assertIsNone(cache.get(f'{webtoon_cache.SCOPE_GENERATION_PREFIX}:{self.user.pk}:{webtoon_id}'))
+            self.assertIsNone(cache.get(f'{webtoon_cache.SCOPE_GENERATION_PREFIX}:{stranger.pk}:{webtoon_id}'))
+
+    def test_owned_webtoon_is_not_modified_without_cache_entry(self):
+        url = reverse('api:webtoon-chapters', args=[self.webtoon.id])
+        first = self.client.get(url)
+        # Evicted entry: ownership is checked before answering 304.
+        with mock.patch('api.local_cache.get_entry', return_value=None):
+            second = self.client.get(url, HTTP_IF_NONE_MATCH=first.headers['ETag'])
+        self.assertEqual(second.status_code, status.HTTP_304_NOT_MODIFIED)
+
+
+class RenderedResponseCacheTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username='bytes_user',
+            email='bytes@example.com',
+            password='bytesPass123',
+        )
+        self.user.features.add(Feature.objects.get(code='webtoon_management'))
+        self.client.force_authenticate(self.user)
+        self.webtoon = Webtoon.objects.create(
+            title='Wind Breaker',
+            type='Webtoon',
+            language='Anglais',
+            rating=4.3,
+            status='En cours',
+            chapter=480,
+            comment='Vélos et amitiés.',
+            user=self.user,
+        )
+
+    def test_query_parameter_order_shares_the_cache_entry(self):
+        url = reverse('api:webtoon-list')
+        first = self.client.get(f'{url}?search=wind&page=1')
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+
+        # Bypass the API so that only a cache hit can return the old title.
+        Webtoon.objects.filter(pk=self.webtoon.pk).update(title='Renamed')
+        second = self.client.get(f'{url}?page=1&search=wind')
+        self.assertEqual(second.json()['results'][0]['title'], 'Wind Breaker')
+
+    def test_cache_hit_serves_precompressed_bytes(self):
+        url = reverse('api:webtoon-detail', args=[self.webtoon.id])
+        plain = self.client.get(url)
+        self.assertNotIn('Content-Encoding', plain.headers)
+
+        compressed = self.client.get(url, HTTP_ACCEPT_ENCODING='gzip, deflate')
+        self.assertEqual(compressed.headers['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', compressed.headers['Vary'])
+        self.assertTrue(compressed.headers['ETag'].startswith('W/'))
+        self.assertEqual(json.loads(gzip.decompress(compressed.content)), plain.json())
+
+    def test_browsable_api_is_not_served_from_json_cache(self):
+        url = reverse('api:webtoon-detail', args=[self.webtoon.id])
+        self.client.get(url)
+        response = self.client.get(url, HTTP_ACCEPT='text/html')
+        self.assertTrue(response['Content-Type'].startswith('text/html'))
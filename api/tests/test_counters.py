@@ -0,0 +1,56 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from accounts.models import User
+from api.models import Chapter, Comment, Webtoon
+
+
+class WebtoonCounterTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='counter_user',
+            email='counter@example.com',
+            password='counterPass123',
+        )
+        self.webtoon = Webtoon.objects.create(
+            title='Nano Machine',
+            type='Manhwa',
+            language='Anglais',
+            rating=4.4,
+            status='En cours',
+            chapter=200,
+            user=self.user,
+        )
+
+    def test_counters_follow_creations_and_deletions(self):
+        chapter = Chapter.objects.create(webtoon=self.webtoon, chapter_number=1, title='Chapitre 1')
+        Chapter.objects.create(webtoon=self.webtoon, chapter_number=2, title='Chapitre 2')
+        Comment.objects.create(webtoon=self.webtoon, user=self.user, text='Excellent.')
+        self.webtoon.refresh_from_db()
+        self.assertEqual((self.webtoon.chapters_count, self.webtoon.comments_count), (2, 1))
+
+        chapter.delete()
+        Comment.objects.filter(webtoon=self.webtoon).delete()
+        self.webtoon.refresh_from_db()
+        self.assertEqual((self.webtoon.chapters_count, self.webtoon.comments_count), (1, 0))
+
+    def test_saving_a_stale_instance_keeps_the_counters(self):
+        stale = Webtoon.objects.get(pk=self.webtoon.pk)
+        Chapter.objects.create(webtoon=self.webtoon, chapter_number=1, title='Chapitre 1')
+        stale.rating = 4.8
+        stale.save()
+        self.webtoon.refresh_from_db()
+        self.assertEqual(self.webtoon.chapters_count, 1)
+        self.assertEqual(self.webtoon.rating, 4.8)
+
+    def test_reconcile_command_fixes_drift(self):
+        Chapter.objects.create(webtoon=self.webtoon, chapter_number=1, title='Chapitre 1')
+        Webtoon.objects.filter(pk=self.webtoon.pk).update(chapters_count=7, comments_count=3)
+
+        out = StringIO()
+        call_command('reconcile_webtoon_counters', stdout=out)
+        self.webtoon.refresh_from_db()
+        self.assertEqual((self.webtoon.chapters_count, self.webtoon.comments_count), (1, 0))
+        self.assertIn('1 webtoon(s) corrigé(s)', out.getvalue())
@@ -0,0 +1,139 @@
+import datetime
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from accounts.models import Feature, User
+from api.models import Chapter, Comment, Webtoon
+
+ROUND_TRIP_FIELDS = (
+    'title',
+    'type',
+    'language',
+    'rating',
+    'status',
+    'chapter',
+    'link',
+    'last_read_date',
+    'comment',
+    'image_url',
+)
+
+
+class ExportTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username='export_user',
+            email='export@example.com',
+            password='exportPass123',
+        )
+        self.user.features.add(Feature.objects.get(code='webtoon_management'))
+        self.client.force_authenticate(self.user)
+        self.webtoon = Webtoon.objects.create(
+            title='Omniscient Reader',
+            type='Manhwa',
+            language='Coréen VO',
+            rating=4.9,
+            status='Terminé',
+            chapter=551,
+            link='https://example.com/orv',
+            last_read_date=datetime.date(2025, 3, 1),
+            comment='Fin parfaite, "vraiment".\nÀ relire.',
+            image_url='https://example.com/orv.jpg',
+            user=self.user,
+        )
+        Webtoon.objects.create(
+            title='Lookism',
+            type='Webtoon',
+            language='Anglais',
+            rating=3.5,
+            status='Hiatus',
+            chapter=520,
+            user=self.user,
+        )
+        Chapter.objects.create(webtoon=self.webtoon, chapter_number=1, title='Prologue')
+        Comment.objects.create(webtoon=self.webtoon, user=self.user, text='Kim Dokja !')
+        self.url = reverse('api:webtoon-export')
+
+    def test_ndjson_streams_webtoons_with_their_chapters_and_comments(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        self.assertIn('attachment;', response['Content-Disposition'])
+
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        records = [json.loads(line) for line in lines]
+        self.assertEqual([record['title'] for record in records], ['Omniscient Reader', 'Lookism'])
+        self.assertEqual([chapter['title'] for chapter in records[0]['chapters']], ['Prologue'])
+        self.assertEqual([comment['text'] for comment in records[0]['comments']], ['Kim Dokja !'])
+        self.assertEqual(records[1]['chapters'], [])
+
+    def test_csv_round_trips_through_import_webtoons(self):
+        response = self.client.get(self.url, {'output': 'csv'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response['Content-Type'].startswith('text/csv'))
+
+        User.objects.create_user(username='restored', email='restored@example.com', password='restoredPass123')
+        with tempfile.NamedTemporaryFile('wb', suffix='.csv', delete=False) as handle:
+            handle.write(b''.join(response.streaming_content))
+        try:
+            call_command('import_webtoons', user='restored', file=handle.name, stdout=StringIO())
+        finally:
+            os.unlink(handle.name)
+
+        def library(username):
+            return list(
+                Webtoon.objects.filter(user__username=username).order_by('title').values(*ROUND_TRIP_FIELDS)
+            )
+
+        self.assertEqual(library('restored'), library('export_user'))
+
+    def test_csv_round_trip_keeps_values_import_would_normalize(self):
+        Webtoon.objects.create(
+            title='Tower of God',
+            type='webtoon',
+            language='coréen',
+            rating=0.0,
+            status='Hiatus',
+            chapter=0,
+            user=self.user,
+        )
+        self.test_csv_round_trips_through_import_webtoons()
+        restored = Webtoon.objects.get(user__username='restored', title='Tower of God')
+        self.assertEqual((restored.chapter, restored.language, restored.type), (0, 'coréen', 'webtoon'))
+
+    def test_other_csv_languages_are_still_capitalized(self):
+        User.objects.create_user(username='restored', email='restored@example.com', password='restoredPass123')
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False, encoding='utf-8') as handle:
+            handle.write('Titre,Langue,Chapitre\nSolo Leveling,ENGLISH UK,12\n')
+        try:
+            call_command('import_webtoons', user='restored', file=handle.name, stdout=StringIO())
+        finally:
+            os.unlink(handle.name)
+
+        restored = Webtoon.objects.get(user__username='restored', title='Solo Leveling')
+        self.assertEqual((restored.language, restored.chapter), ('English uk', 12))
+
+    def test_unknown_format_is_rejected(self):
+        response = self.client.get(self.url, {'output': 'xml'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_command_writes_the_export(self):
+        out = StringIO()
+        call_command('export_webtoons', user='export_user', stdout=out)
+        self.assertEqual(len(out.getvalue().splitlines()), 2)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'library.csv')
+            call_command('export_webtoons', user='export_user', format='csv', output=path, stderr=StringIO())
+            with open(path, encoding='utf-8-sig') as handle:
+                self.assertTrue(handle.readline().startswith('Titre,Type,'))
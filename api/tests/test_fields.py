@@ -0,0 +1,83 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from accounts.models import Feature, User
+from api.models import Webtoon
+from api.serializers import WebtoonSerializer
+
+
+class SparseFieldsetTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username='fields_user',
+            email='fields@example.com',
+            password='fieldsPass123',
+        )
+        self.user.features.add(Feature.objects.get(code='webtoon_management'))
+        self.client.force_authenticate(self.user)
+        self.webtoon = Webtoon.objects.create(
+            title='The Breaker',
+            type='Manhwa',
+            language='Français',
+            rating=4.6,
+            status='Terminé',
+            chapter=72,
+            link='https://example.com/the-breaker',
+            comment='Arts martiaux et lycée.',
+            user=self.user,
+        )
+        self.list_url = reverse('api:webtoon-list')
+        self.detail_url = reverse('api:webtoon-detail', args=[self.webtoon.id])
+
+    def test_list_defaults_to_the_compact_profile(self):
+        response = self.client.get(self.list_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(tuple(response.data['results'][0]), WebtoonSerializer.PROFILES['compact'])
+
+    def test_full_profile_and_detail_return_every_field(self):
+        listed = self.client.get(self.list_url, {'profile': 'full'}).data['results'][0]
+        detail = self.client.get(self.detail_url).data
+        self.assertEqual(tuple(listed), WebtoonSerializer.readable_fields())
+        self.assertEqual(tuple(detail), WebtoonSerializer.readable_fields())
+        self.assertEqual(detail['comment'], 'Arts martiaux et lycée.')
+
+    def test_fields_and_omit_select_the_representation(self):
+        selected = self.client.get(self.list_url, {'fields': 'title,chapter'}).data['results'][0]
+        self.assertEqual(selected, {'id': self.webtoon.id, 'title': 'The Breaker', 'chapter': 72})
+
+        detail = self.client.get(self.detail_url, {'omit': 'comment,link'}).data
+        self.assertNotIn('comment', detail)
+        self.assertNotIn('link', detail)
+        self.assertIn('created_at', detail)
+
+    def test_fields_trim_the_select(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(self.list_url, {'fields': 'title'})
+        select = next(
+            query['sql'] for query in queries if 'FROM "api_webtoon"' in query['sql'] and 'COUNT' not in query['sql']
+        )
+        self.assertIn('"api_webtoon"."title"', select)
+        self.assertNotIn('"api_webtoon"."comment"', select)
+
+    def test_detail_fieldsets_use_separate_cache_entries(self):
+        self.client.get(self.detail_url, {'fields': 'title'})
+        response = self.client.get(self.detail_url)
+        self.assertIn('comment', response.json())
+
+    def test_unknown_fields_are_rejected(self):
+        response = self.client.get(self.list_url, {'fields': 'title,password'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('fields', response.data)
+
+        response = self.client.get(self.list_url, {'profile': 'tiny'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_writes_still_use_the_full_representation(self):
+        response = self.client.patch(self.detail_url, {'chapter': 73}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('comment', response.data)
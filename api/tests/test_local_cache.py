@@ -0,0 +1,90 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from accounts.models import Feature, User
+from api import local_cache
+from api.models import Webtoon
+
+
+def make_entry(size):
+    return {'content': b'x' * size, 'content_type': 'application/json', 'gzip': None, 'br': None, 'rows': None}
+
+
+class LocalLRUCacheTests(SimpleTestCase):
+    def test_least_recently_used_entries_are_evicted_by_size(self):
+        lru = local_cache.LocalLRUCache(max_bytes=3 * (local_cache.ENTRY_OVERHEAD + 100), ttl=60)
+        for key in ('a', 'b', 'c'):
+            lru.set(key, make_entry(100))
+        lru.get('a')
+        lru.set('d', make_entry(100))
+        self.assertIsNone(lru.get('b'))
+        self.assertEqual([key for key in 'acd' if lru.get(key) is not None], ['a', 'c', 'd'])
+        self.assertEqual(lru.size, 3 * (local_cache.ENTRY_OVERHEAD + 100))
+
+        lru.set('huge', make_entry(10_000))
+        self.assertIsNone(lru.get('huge'))
+
+    def test_entries_expire(self):
+        lru = local_cache.LocalLRUCache(max_bytes=10_000, ttl=30)
+        with mock.patch.object(local_cache.time, 'monotonic', return_value=1000.0):
+            lru.set('short', make_entry(10), timeout=5)
+            lru.set('long', make_entry(10))
+        with mock.patch.object(local_cache.time, 'monotonic', return_value=1010.0):
+            self.assertIsNone(lru.get('short'))
+            self.assertIsNotNone(lru.get('long'))
+        self.assertEqual(len(lru), 1)
+
+
+@override_settings(L1_CACHE_MAX_BYTES=1_000_000, L1_CACHE_TTL_SECONDS=30)
+class TwoTierCacheTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        local_cache.reset()
+        self.addCleanup(local_cache.reset)
+        self.user = User.objects.create_user(
+            username='tier_user',
+            email='tier@example.com',
+            password='tierPass123',
+        )
+        self.user.features.add(Feature.objects.get(code='webtoon_management'))
+        self.client.force_authenticate(self.user)
+        self.webtoon = Webtoon.objects.create(
+            title='The Boxer',
+            type='Manhwa',
+            language='Français',
+            rating=4.7,
+            status='Terminé',
+            chapter=120,
+            user=self.user,
+        )
+
+    def test_hits_are_served_from_the_local_tier(self):
+        url = reverse('api:webtoon-detail', args=[self.webtoon.id])
+        first = self.client.get(url).json()
+        # Only the generations are re-read from the shared tier.
+        self.assertEqual(self.client.get(url).json(), first)
+        tiers = local_cache.stats()['tiers']
+        self.assertEqual((tiers['l1']['hits'], tiers['l1']['misses']), (1, 1))
+        self.assertEqual((tiers['l2']['hits'], tiers['l2']['misses']), (0, 1))
+
+    def test_writes_from_other_processes_drop_the_local_copy(self):
+        local = local_cache.get_local_cache()
+        local.set('page', make_entry(10))
+        local_cache.handle_message(f'{local_cache._origin} page'.encode())
+        self.assertIsNotNone(local.get('page'))
+        local_cache.handle_message(b'other-process page')
+        self.assertIsNone(local.get('page'))
+
+    def test_stats_are_reserved_to_superusers(self):
+        url = reverse('api:cache-stats')
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_403_FORBIDDEN)
+        admin = User.objects.create_superuser(username='root', email='root@example.com', password='rootPass123')
+        self.client.force_authenticate(admin)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.json()['tiers']['l1']['enabled'])
@@ -0,0 +1,60 @@
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from accounts.models import Feature, User
+from api.models import Chapter, Webtoon
+from api.pagination import KeysetPagination
+
+
+class KeysetPaginationTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username='cursor_user',
+            email='cursor@example.com',
+            password='cursorPass123',
+        )
+        self.user.features.add(Feature.objects.get(code='webtoon_management'))
+        self.client.force_authenticate(self.user)
+        self.webtoon = Webtoon.objects.create(
+            title='Eleceed',
+            type='Manhwa',
+            language='Anglais',
+            rating=4.6,
+            status='En cours',
+            chapter=300,
+            user=self.user,
+        )
+        Chapter.objects.bulk_create(
+            Chapter(webtoon=self.webtoon, chapter_number=number, title=f'Chapitre {number}')
+            for number in (3, 1, 5, 2, 4)
+        )
+
+    def _collect(self, url):
+        numbers = []
+        with patch.object(KeysetPagination, 'page_size', 2):
+            while url:
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                self.assertNotIn('count', response.data)
+                numbers.extend(item['chapter_number'] for item in response.data['results'])
+                url = response.data['next']
+        return numbers
+
+    def test_chapters_are_walked_in_order_with_cursor(self):
+        url = reverse('api:webtoon-chapters', args=[self.webtoon.id])
+        self.assertEqual(self._collect(f'{url}?pagination=cursor'), [1, 2, 3, 4, 5])
+
+    def test_page_number_pagination_remains_the_default(self):
+        response = self.client.get(reverse('api:webtoon-chapters', args=[self.webtoon.id]))
+        self.assertEqual(response.data['count'], 5)
+
+    def test_webtoon_list_supports_cursor(self):
+        response = self.client.get(reverse('api:webtoon-list'), {'pagination': 'cursor'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn('count', response.data)
+        self.assertEqual(response.data['results'][0]['title'], 'Eleceed')
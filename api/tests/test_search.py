@@ -0,0 +1,62 @@
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from accounts.models import Feature, User
+from api.models import Webtoon
+from api.search import WebtoonSearchFilter
+
+
+class WebtoonSearchTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username='search_user',
+            email='search@example.com',
+            password='searchPass123',
+        )
+        self.user.features.add(Feature.objects.get(code='webtoon_management'))
+        self.client.force_authenticate(self.user)
+        self.url = reverse('api:webtoon-list')
+        defaults = {'type': 'Manhwa', 'language': 'Français', 'rating': 4.0, 'chapter': 1, 'user': self.user}
+        self.solo = Webtoon.objects.create(title='Solo Leveling', comment='Chasseur de rang E.', **defaults)
+        self.hunter = Webtoon.objects.create(title='Hunter Academy', comment='Un solo sur la scène.', **defaults)
+        self.other = Webtoon.objects.create(title='Réincarnation éternelle', **defaults)
+
+    def _titles(self, **params):
+        response = self.client.get(self.url, params)
+        return [item['title'] for item in response.data['results']]
+
+    def test_title_matches_rank_first(self):
+        self.assertEqual(self._titles(search='solo'), ['Solo Leveling', 'Hunter Academy'])
+
+    def test_prefix_and_accent_insensitive_matching(self):
+        self.assertEqual(self._titles(search='reincarn'), ['Réincarnation éternelle'])
+
+    def test_index_follows_updates_and_deletions(self):
+        self.solo.title = 'Solo Max-Level Newbie'
+        self.solo.save()
+        self.hunter.delete()
+        self.assertEqual(self._titles(search='newbie'), ['Solo Max-Level Newbie'])
+        self.assertEqual(self._titles(search='academy'), [])
+
+    def test_search_is_scoped_to_the_user(self):
+        stranger = User.objects.create_user(username='stranger', email='s@example.com', password='x' * 10)
+        Webtoon.objects.create(
+            title='Solo Stranger', type='Manga', language='Anglais', rating=3.0, chapter=1, user=stranger
+        )
+        self.assertNotIn('Solo Stranger', self._titles(search='solo'))
+
+    def test_explicit_ordering_overrides_rank(self):
+        self.assertEqual(self._titles(search='solo', ordering='title'), ['Hunter Academy', 'Solo Leveling'])
+
+    def test_fts_syntax_is_not_interpreted(self):
+        self.assertEqual(self._titles(search='"solo" OR NEAR('), [])
+
+    def test_postgresql_query_ignores_accents_like_its_index(self):
+        # Migration 0005 indexes api_unaccent(...): the query must go through it too.
+        queryset = WebtoonSearchFilter._filter_postgresql(Webtoon.objects.all(), ['réincarn'], 'réincarn')
+        sql, params = queryset.query.sql_with_params()
+        self.assertIn("to_tsquery('simple', api_unaccent(%s))", sql)
+        self.assertIn('api_unaccent(api_webtoon.title) %% api_unaccent(%s)', sql)
+        self.assertIn('réincarn:*', params)
@@ -0,0 +1,123 @@
+import datetime
+import io
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+
+from accounts.models import Feature, User
+from api.models import Chapter, Webtoon
+from api.parsers import ORJSONParser
+from api.renderers import ORJSONRenderer
+from api.serializers import ChapterSerializer, CommentSerializer, ValuesRepresentation, WebtoonSerializer
+
+
+class ORJSONRendererTests(SimpleTestCase):
+    def test_output_matches_the_stock_renderer(self):
+        data = {
+            'title': 'Été\u2028à Séoul\u2029',
+            'rating': 4.75,
+            'count': 12,
+            'empty': None,
+            'flags': [True, False],
+            'when': datetime.datetime(2025, 10, 10, 11, 32, 51, 123456, tzinfo=datetime.timezone.utc),
+            'day': datetime.date(2025, 10, 10),
+            'price': Decimal('1.50'),
+            'label': gettext_lazy('Nouveau'),
+            7: 'int key',
+        }
+        for accepted in (None, 'application/json'):
+            with self.subTest(accepted=accepted):
+                self.assertEqual(
+                    ORJSONRenderer().render(data, accepted),
+                    JSONRenderer().render(data, accepted),
+                )
+
+    def test_indented_output_uses_the_stock_renderer(self):
+        data = {'title': 'Lookism'}
+        self.assertEqual(
+            ORJSONRenderer().render(data, 'application/json; indent=4'),
+            JSONRenderer().render(data, 'application/json; indent=4'),
+        )
+
+    def test_parser_reads_utf8_and_rejects_invalid_json(self):
+        parser = ORJSONParser()
+        self.assertEqual(parser.parse(io.BytesIO('{"title": "Été"}'.encode())), {'title': 'Été'})
+        with self.assertRaises(ParseError):
+            parser.parse(io.BytesIO(b'{"title": NaN}'))
+
+
+class ValuesRepresentationTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username='values_user',
+            email='values@example.com',
+            password='valuesPass123',
+        )
+        self.user.features.add(Feature.objects.get(code='webtoon_management'))
+        self.client.force_authenticate(self.user)
+        self.webtoon = Webtoon.objects.create(
+            title='Tower of God',
+            type='Manhwa',
+            language='Français',
+            rating=4.8,
+            status='En cours',
+            chapter=600,
+            comment='Montée de la tour.',
+            last_read_date=datetime.date(2025, 1, 2),
+            user=self.user,
+        )
+        Webtoon.objects.create(
+            title='Noblesse',
+            type='Manhwa',
+            language='Anglais',
+            rating=4.1,
+            status='Terminé',
+            chapter=544,
+            user=self.user,
+        )
+        Chapter.objects.create(
+            webtoon=self.webtoon,
+            chapter_number=1,
+            title='Headon',
+            release_date=datetime.date(2010, 6, 30),
+            local_image_paths=['tog/1/001.jpg', 'tog/1/002 é.jpg'],
+        )
+        Chapter.objects.create(webtoon=self.webtoon, chapter_number=2, title='Yuri')
+        Webtoon.objects.filter(pk=self.webtoon.pk).update(updated_at=timezone.now())
+
+    def _get_both(self, url, params=None):
+        cache.clear()
+        fast = self.client.get(url, params)
+        cache.clear()
+        with override_settings(API_FAST_SERIALIZATION=False):
+            slow = self.client.get(url, params)
+        return fast.content, slow.content
+
+    def test_read_endpoints_are_byte_identical(self):
+        list_url = reverse('api:webtoon-list')
+        chapters_url = reverse('api:webtoon-chapters', args=[self.webtoon.id])
+        for url, params in (
+            (list_url, None),
+            (list_url, {'profile': 'full'}),
+            (list_url, {'pagination': 'cursor', 'ordering': 'title'}),
+            (list_url, {'search': 'tower'}),
+            (chapters_url, None),
+            (chapters_url, {'pagination': 'cursor'}),
+        ):
+            with self.subTest(url=url, params=params):
+                fast, slow = self._get_both(url, params)
+                self.assertEqual(fast, slow)
+
+    def test_serializers_needing_instances_are_not_supported(self):
+        self.assertIsNotNone(ValuesRepresentation.from_serializer(WebtoonSerializer()))
+        self.assertIsNotNone(ValuesRepresentation.from_serializer(ChapterSerializer()))
+        # `user` is read through `user.username`.
+        self.assertIsNone(ValuesRepresentation.from_serializer(CommentSerializer()))
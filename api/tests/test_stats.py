@@ -0,0 +1,136 @@
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from accounts.models import Feature, User
+from api import stats as webtoon_stats
+from api.models import LibraryStats, Webtoon
+
+
+class LibraryStatsTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username='stats_user',
+            email='stats@example.com',
+            password='statsPass123',
+        )
+        self.user.features.add(Feature.objects.get(code='webtoon_management'))
+        self.client.force_authenticate(self.user)
+        self.url = reverse('api:webtoon-stats')
+        self.solo = self._create('Solo Leveling', rating=4.8, status='Terminé', chapter=200)
+        self._create('Tower of God', language='Anglais', rating=3.2, chapter=600)
+
+    def _create(self, title, **values):
+        defaults = {
+            'type': 'Manhwa',
+            'language': 'Français',
+            'rating': 4.0,
+            'status': 'En cours',
+            'chapter': 1,
+        }
+        return Webtoon.objects.create(title=title, user=self.user, **{**defaults, **values})
+
+    def _stats(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.json()
+
+    def assertStatsAreFresh(self):
+        cache.clear()
+        self.assertEqual(self._stats(), webtoon_stats.get_stats(self.user.pk))
+        self.assertEqual(LibraryStats.objects.get(user=self.user).data, webtoon_stats.build(self.user.pk))
+
+    def test_aggregates_are_built_from_the_library(self):
+        data = self._stats()
+        self.assertEqual(data['total'], 2)
+        self.assertEqual(data['chapters_read'], 800)
+        self.assertEqual(data['average_rating'], 4.0)
+        self.assertEqual(data['by_status'], {'Terminé': 1, 'En cours': 1})
+        self.assertEqual(data['by_language'], {'Français': 1, 'Anglais': 1})
+        self.assertEqual(data['by_type'], {'Manhwa': 2})
+        self.assertEqual(data['rating_histogram'], {'0': 0, '1': 0, '2': 0, '3': 1, '4': 1, '5': 0})
+        self.assertStatsAreFresh()
+
+    def test_first_read_builds_the_aggregates(self):
+        LibraryStats.objects.all().delete()
+        self.assertEqual(self._stats()['total'], 2)
+        self.assertTrue(LibraryStats.objects.filter(user=self.user).exists())
+
+    def test_write_without_aggregates_builds_them(self):
+        # Writes made before the row exists are not lost.
+        LibraryStats.objects.all().delete()
+        self._create('Noblesse', rating=5.0, chapter=544)
+        self.assertStatsAreFresh()
+        self.assertEqual(self._stats()['total'], 3)
+
+    def test_rebuild_command_fixes_drifted_aggregates(self):
+        self._stats()
+        LibraryStats.objects.filter(user=self.user).update(data={'total': 7})
+
+        out = StringIO()
+        call_command('rebuild_library_stats', '--dry-run', stdout=out)
+        self.assertEqual(LibraryStats.objects.get(user=self.user).data, {'total': 7})
+        self.assertIn('1 statistique(s) à corriger', out.getvalue())
+
+        out = StringIO()
+        call_command('rebuild_library_stats', '--user', 'stats_user', stdout=out)
+        self.assertStatsAreFresh()
+        self.assertIn('1 statistique(s) corrigée(s)', out.getvalue())
+
+    def test_writes_update_the_aggregates(self):
+        self._stats()
+        self._create('Noblesse', type='Webtoon', rating=5.0, status='Terminé', chapter=544)
+        self.client.patch(reverse('api:webtoon-detail', args=[self.solo.id]), {'status': 'Hiatus'}, format='json')
+        self.assertStatsAreFresh()
+
+        data = self._stats()
+        self.assertEqual(data['by_status'], {'Terminé': 1, 'En cours': 1, 'Hiatus': 1})
+        self.assertEqual(data['rating_histogram']['5'], 1)
+
+        self.client.delete(reverse('api:webtoon-detail', args=[self.solo.id]))
+        self.assertStatsAreFresh()
+        self.assertEqual(self._stats()['total'], 2)
+
+    def test_partial_saves_and_deferred_instances(self):
+        self._stats()
+        # A scraper-style partial save only changes the listed fields.
+        self.solo.chapter = 210
+        self.solo.rating = 1.0
+        self.solo.save(update_fields=['chapter', 'updated_at'])
+        self.assertStatsAreFresh()
+
+        # Deferred fields were not loaded: their previous values are read before the save.
+        webtoon = Webtoon.objects.only('title', 'user').get(pk=self.solo.pk)
+        webtoon.type = 'Manga'
+        webtoon.rating = 2.5
+        webtoon.save()
+        self.assertStatsAreFresh()
+        self.assertEqual(self._stats()['by_type'], {'Manga': 1, 'Manhwa': 1})
+
+    def test_bulk_endpoint_updates_the_aggregates(self):
+        self._stats()
+        bulk_url = reverse('api:webtoon-bulk')
+        payload = {'type': 'Manga', 'language': 'Japonais', 'rating': 2.0, 'status': 'En cours', 'chapter': 12}
+        response = self.client.post(bulk_url, [{'title': 'Berserk', **payload}], format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        response = self.client.patch(bulk_url, [{'id': self.solo.id, 'rating': 0.5}], format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertStatsAreFresh()
+        self.assertEqual(self._stats()['rating_histogram']['0'], 1)
+
+    def test_stats_are_per_user(self):
+        stranger = User.objects.create_user(username='stranger', email='s@example.com', password='strangerPass123')
+        Webtoon.objects.create(
+            title='Private', type='Manga', language='Français', rating=1.0, status='En cours', chapter=1, user=stranger
+        )
+        self.assertEqual(self._stats()['total'], 2)
+
+    def test_deleting_the_owner_account_drops_its_stats(self):
+        self._stats()
+        self.user.delete()
+        self.assertFalse(LibraryStats.objects.exists())
@@ -0,0 +1,57 @@
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from accounts.models import Feature, User
+from api.models import Webtoon
+
+
+class WebtoonSuggestTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username='suggest_user',
+            email='suggest@example.com',
+            password='suggestPass123',
+        )
+        self.user.features.add(Feature.objects.get(code='webtoon_management'))
+        self.client.force_authenticate(self.user)
+        self.url = reverse('api:webtoon-suggest')
+        self.list_url = reverse('api:webtoon-list')
+        self.defaults = {'type': 'Manhwa', 'language': 'Français', 'rating': 4.0, 'chapter': 1}
+        for title in ('Solo Leveling', 'The Greatest Estate Developer', 'Éveil du Solitaire'):
+            Webtoon.objects.create(title=title, user=self.user, **self.defaults)
+
+    def _titles(self, query):
+        response = self.client.get(self.url, {'q': query})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [item['title'] for item in response.data]
+
+    def test_suggest_matches_title_and_word_prefixes(self):
+        self.assertEqual(self._titles('sol'), ['Solo Leveling', 'Éveil du Solitaire'])
+        self.assertEqual(self._titles('estate dev'), ['The Greatest Estate Developer'])
+        self.assertEqual(self._titles('eveil'), ['Éveil du Solitaire'])
+
+    def test_suggest_returns_only_lightweight_fields(self):
+        response = self.client.get(self.url, {'q': 'solo'})
+        self.assertEqual(set(response.data[0]), {'id', 'title', 'image_url'})
+
+    def test_index_follows_api_writes(self):
+        self.assertEqual(self._titles('tower'), [])
+        # The cache moves on once the write commits.
+        with self.captureOnCommitCallbacks(execute=True):
+            created = self.client.post(self.list_url, {'title': 'Tower of God', **self.defaults}, format='json')
+        self.assertEqual(self._titles('tower'), ['Tower of God'])
+
+        detail_url = reverse('api:webtoon-detail', args=[created.data['id']])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(detail_url, {'title': 'Tower of Gods'}, format='json')
+        self.assertEqual(self._titles('tower'), ['Tower of Gods'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.delete(detail_url)
+        self.assertEqual(self._titles('tower'), [])
+
+    def test_empty_query_returns_nothing(self):
+        self.assertEqual(self._titles('  '), [])
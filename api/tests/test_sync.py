@@ -0,0 +1,145 @@
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from accounts.models import Feature, User
+from api.models import Chapter, Comment, SyncChange, Webtoon
+
+
+class SyncTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username='sync_user',
+            email='sync@example.com',
+            password='syncPass123',
+        )
+        self.user.features.add(Feature.objects.get(code='webtoon_management'))
+        self.client.force_authenticate(self.user)
+        self.url = reverse('api:sync')
+        with self.committed():
+            self.webtoon = self._create_webtoon('Eleceed', self.user)
+            self.chapter = Chapter.objects.create(webtoon=self.webtoon, chapter_number=1, title='Jiwoo')
+            self.comment = Comment.objects.create(webtoon=self.webtoon, user=self.user, text='Kayden !')
+
+    def committed(self):
+        # Changes are logged once their transaction commits.
+        return self.captureOnCommitCallbacks(execute=True)
+
+    @staticmethod
+    def _create_webtoon(title, user):
+        return Webtoon.objects.create(
+            title=title,
+            type='Manhwa',
+            language='Français',
+            rating=4.7,
+            status='En cours',
+            chapter=300,
+            user=user,
+        )
+
+    def _sync(self, since=None, **params):
+        if since is not None:
+            params['since'] = since
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def test_first_sync_returns_the_library_then_nothing(self):
+        first = self._sync()
+        self.assertEqual([webtoon['id'] for webtoon in first['webtoons']], [self.webtoon.id])
+        self.assertEqual(first['webtoons'][0]['chapters_count'], 1)
+        self.assertEqual([chapter['id'] for chapter in first['chapters']], [self.chapter.id])
+        self.assertEqual([comment['id'] for comment in first['comments']], [self.comment.id])
+        self.assertFalse(first['has_more'])
+
+        second = self._sync(first['cursor'])
+        self.assertEqual((second['webtoons'], second['chapters'], second['comments']), ([], [], []))
+        self.assertEqual(second['cursor'], first['cursor'])
+
+    def test_only_changed_objects_are_returned(self):
+        cursor = self._sync()['cursor']
+        with self.committed():
+            other = self._create_webtoon('Lookism', self.user)
+            self.client.patch(reverse('api:webtoon-detail', args=[self.webtoon.id]), {'chapter': 301}, format='json')
+
+        delta = self._sync(cursor)
+        self.assertEqual(sorted(webtoon['id'] for webtoon in delta['webtoons']), sorted([self.webtoon.id, other.id]))
+        self.assertEqual(delta['chapters'], [])
+
+        delta = self._sync(delta['cursor'])
+        with self.committed():
+            Chapter.objects.create(webtoon=other, chapter_number=1, title='Daniel')
+        delta = self._sync(delta['cursor'])
+        self.assertEqual([chapter['title'] for chapter in delta['chapters']], ['Daniel'])
+        # The parent comes along with its new counter.
+        self.assertEqual([(webtoon['id'], webtoon['chapters_count']) for webtoon in delta['webtoons']], [(other.id, 1)])
+
+    def test_deletions_leave_tombstones(self):
+        cursor = self._sync()['cursor']
+        comment_id = self.comment.pk
+        with self.committed():
+            self.comment.delete()
+        delta = self._sync(cursor)
+        self.assertEqual(delta['deleted']['comments'], [comment_id])
+        self.assertEqual(delta['webtoons'][0]['comments_count'], 0)
+
+        with self.committed():
+            self.client.delete(reverse('api:webtoon-detail', args=[self.webtoon.id]))
+        delta = self._sync(delta['cursor'])
+        self.assertEqual(delta['deleted'], {'webtoons': [self.webtoon.id], 'chapters': [], 'comments': []})
+        # The webtoon tombstone stands for its chapters.
+        self.assertFalse(SyncChange.objects.filter(kind='chapter', webtoon_pk=self.webtoon.id).exists())
+
+    def test_bulk_writes_are_logged(self):
+        cursor = self._sync()['cursor']
+        with self.committed():
+            response = self.client.post(
+                reverse('api:webtoon-chapters-bulk', args=[self.webtoon.id]),
+                [{'chapter_number': 2, 'title': 'Kartein'}, {'chapter_number': 3, 'title': 'Wooin'}],
+                format='json',
+            )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        delta = self._sync(cursor)
+        self.assertEqual(sorted(chapter['chapter_number'] for chapter in delta['chapters']), [2, 3])
+        self.assertEqual(delta['webtoons'][0]['chapters_count'], 3)
+
+    def test_limit_pages_through_changes(self):
+        with self.committed():
+            self._create_webtoon('Noblesse', self.user)
+        first = self._sync(limit=2)
+        self.assertTrue(first['has_more'])
+        rest = self._sync(first['cursor'], limit=10)
+        self.assertFalse(rest['has_more'])
+        seen = len(first['webtoons'] + first['chapters'] + first['comments'])
+        seen += len(rest['webtoons'] + rest['chapters'] + rest['comments'])
+        self.assertEqual(seen, 4)
+
+    def test_changes_of_other_users_are_not_visible(self):
+        stranger = User.objects.create_user(username='stranger', email='s@example.com', password='strangerPass123')
+        with self.committed():
+            self._create_webtoon('Private', stranger)
+        titles = [webtoon['title'] for webtoon in self._sync()['webtoons']]
+        self.assertEqual(titles, ['Eleceed'])
+
+    def test_deleting_the_owner_account_drops_its_log(self):
+        with self.committed():
+            self._create_webtoon('Noblesse', self.user)
+            self.user.delete()
+        self.assertFalse(SyncChange.objects.exists())
+
+    def test_changes_are_logged_once_committed(self):
+        # A change still in flight gets no id yet, so no cursor handed out meanwhile can skip it.
+        with self.committed():
+            self.webtoon.chapter = 301
+            self.webtoon.save()
+            cursor = self._sync()['cursor']
+            self.assertEqual(self._sync(cursor)['webtoons'], [])
+        self.assertEqual([webtoon['chapter'] for webtoon in self._sync(cursor)['webtoons']], [301])
+
+    def test_invalid_cursor_is_rejected(self):
+        for params in ({'since': 'abc'}, {'since': -1}, {'limit': 0}):
+            with self.subTest(params=params):
+                response = self.client.get(self.url, params)
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,74 @@
+import threading
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from accounts.models import Feature, User
+from api import throttling
+
+
+class GCRATests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_burst_then_one_request_per_interval(self):
+        with mock.patch.object(throttling.time, 'time', return_value=1000.0):
+            results = [throttling.acquire('throttle_test', 3, 60) for _ in range(4)]
+        self.assertEqual([allowed for allowed, _ in results], [True, True, True, False])
+        self.assertAlmostEqual(results[-1][1], 20.0)
+
+        with mock.patch.object(throttling.time, 'time', return_value=1019.0):
+            self.assertFalse(throttling.acquire('throttle_test', 3, 60)[0])
+        with mock.patch.object(throttling.time, 'time', return_value=1020.0):
+            self.assertEqual(throttling.acquire('throttle_test', 3, 60), (True, 0.0))
+            self.assertFalse(throttling.acquire('throttle_test', 3, 60)[0])
+
+    def test_concurrent_requests_never_exceed_the_limit(self):
+        results = []
+
+        def hit():
+            results.append(throttling.acquire('throttle_race', 5, 60)[0])
+
+        threads = [threading.Thread(target=hit) for _ in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results.count(True), 5)
+
+
+class ScopedThrottleTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        rates = mock.patch.dict(throttling.GCRAThrottle.THROTTLE_RATES, {'auth': '2/min', 'scrape': '1/min'})
+        rates.start()
+        self.addCleanup(rates.stop)
+        self.user = User.objects.create_user(username='throttled', email='throttled@example.com', password='pass1234')
+
+    def test_login_attempts_are_limited(self):
+        url = reverse('login')
+        payload = {'username': 'throttled', 'password': 'wrong'}
+        self.assertEqual(self.client.post(url, payload).status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(self.client.post(url, payload).status_code, status.HTTP_401_UNAUTHORIZED)
+        response = self.client.post(url, {'username': 'throttled', 'password': 'pass1234'})
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertIn('Retry-After', response)
+
+    def test_scrape_launches_are_limited(self):
+        self.user.features.add(Feature.objects.get(code='scraper_access'))
+        self.client.force_authenticate(self.user)
+        url = reverse('scraper:scrape-launch')
+        with mock.patch('scraper.views.enqueue_scrape'):
+            first = self.client.post(url, {'url': 'https://example.com/manga/'})
+            second = self.client.post(url, {'url': 'https://example.com/manga/'})
+        self.assertEqual(first.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(second.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+    def test_views_without_scope_are_not_limited(self):
+        self.client.force_authenticate(self.user)
+        for _ in range(3):
+            self.assertEqual(self.client.get(reverse('profile')).status_code, status.HTTP_200_OK)
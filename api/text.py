@@ -0,0 +1,19 @@
+import re
+import unicodedata
+
+WORD_SEPARATOR_RE = re.compile(r"[\s\-_:;,./!?'’()\[\]]+")
+
+
+def normalize_key(value: str) -> str:
+    """Fold accents and case and drop every non-alphanumeric character."""
+
+    value = value.replace("\u00a0", " ")
+    value = unicodedata.normalize("NFKD", value)
+    return "".join(ch for ch in value.lower() if ch.isalnum())
+
+
+def normalized_words(value: str) -> list[str]:
+    """Split a title into folded words, e.g. "Solo Leveling: Ragnarök" -> solo, leveling, ragnarok."""
+
+    words = (normalize_key(word) for word in WORD_SEPARATOR_RE.split(value))
+    return [word for word in words if word]
@@ -0,0 +1,147 @@
+"""
+Rate limiting with the generic cell rate algorithm (GCRA).
+
+DRF's ``SimpleRateThrottle`` keeps the list of request timestamps of each
+client in the cache and rewrites it on every request: concurrent requests
+from other workers overwrite each other's history, and ``1000/day`` means up
+to a thousand floats to unpickle. GCRA only stores one number per client, the
+*theoretical arrival time* (TAT) of its next request:
+
+* a rate of ``N`` per ``period`` lets a request through every
+  ``interval = period / N`` on average, with bursts of up to ``N`` requests;
+* a request at ``now`` is allowed when ``max(TAT, now) + interval - period <= now``,
+  and then moves the TAT to ``max(TAT, now) + interval``.
+
+On Redis the check and the update run in one Lua script, against the Redis
+clock, so they are atomic across workers and nodes. Other cache backends
+(locmem in development) run the same arithmetic under a process-wide lock.
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.throttling import SimpleRateThrottle
+
+try:  # pragma: no cover - django-redis n'est utilisé qu'avec REDIS_URL
+    from django_redis import get_redis_connection
+except ImportError:  # pragma: no cover
+    get_redis_connection = None
+
+# KEYS[1]: TAT key; ARGV: interval and period in milliseconds.
+# Returns {allowed, milliseconds to wait}.
+GCRA_SCRIPT = """
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) * 1000 + math.floor(tonumber(clock[2]) / 1000)
+local interval = tonumber(ARGV[1])
+local period = tonumber(ARGV[2])
+local tat = tonumber(redis.call('GET', KEYS[1]))
+if not tat or tat < now then
+    tat = now
+end
+local allow_at = tat + interval - period
+if now < allow_at then
+    return {0, allow_at - now}
+end
+redis.call('SET', KEYS[1], tat + interval, 'PX', tat + interval - now)
+return {1, 0}
+"""
+
+_script = None
+_local_lock = threading.Lock()
+
+
+def _redis_script():
+    global _script
+    if get_redis_connection is None or not settings.CACHES['default']['BACKEND'].startswith('django_redis'):
+        return None
+    if _script is None:
+        _script = get_redis_connection('default').register_script(GCRA_SCRIPT)
+    return _script
+
+
+def acquire(key: str, limit: int, period: int) -> tuple[bool, float]:
+    """Count one request against ``limit`` per ``period`` seconds; return ``(allowed, seconds to wait)``."""
+
+    interval_ms = math.ceil(period * 1000 / limit)
+    period_ms = period * 1000
+    script = _redis_script()
+    if script is not None:
+        allowed, wait_ms = script(keys=[cache.make_key(key)], args=[interval_ms, period_ms])
+        return bool(allowed), wait_ms / 1000
+
+    with _local_lock:
+        now = int(time.time() * 1000)
+        tat = max(cache.get(key) or now, now)
+        allow_at = tat + interval_ms - period_ms
+        if now < allow_at:
+            return False, (allow_at - now) / 1000
+        cache.set(key, tat + interval_ms, math.ceil((tat + interval_ms - now) / 1000))
+        return True, 0.0
+
+
+class GCRAThrottle(SimpleRateThrottle):
+    """``SimpleRateThrottle`` with its history list replaced by a single GCRA timestamp."""
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+        allowed, self._wait = acquire(self.key, self.num_requests, self.duration)
+        return allowed
+
+    def wait(self):
+        return self._wait
+
+
+class AnonThrottle(GCRAThrottle):
+    """Limit anonymous clients by IP (``anon`` rate)."""
+
+    scope = 'anon'
+
+    def get_cache_key(self, request, view):
+        if request.user and request.user.is_authenticated:
+            return None
+        return self.cache_format % {'scope': self.scope, 'ident': self.get_ident(request)}
+
+
+class UserThrottle(GCRAThrottle):
+    """Limit authenticated users by id, anonymous clients by IP (``user`` rate)."""
+
+    scope = 'user'
+
+    def get_cache_key(self, request, view):
+        if request.user and request.user.is_authenticated:
+            ident = request.user.pk
+        else:
+            ident = self.get_ident(request)
+        return self.cache_format % {'scope': self.scope, 'ident': ident}
+
+
+class ScopedThrottle(UserThrottle):
+    """
+    Extra limit for the views declaring a ``throttle_scope`` (login, scraping...).
+
+    Like DRF's ``ScopedRateThrottle``, the rate comes from
+    ``DEFAULT_THROTTLE_RATES[throttle_scope]``; views without one are not limited.
+    """
+
+    scope_attr = 'throttle_scope'
+
+    def __init__(self):
+        # The rate depends on the view, it is resolved in allow_request.
+        pass
+
+    def allow_request(self, request, view):
+        self.scope = getattr(view, self.scope_attr, None)
+        if not self.scope:
+            return True
+        self.rate = self.get_rate()
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+        return super().allow_request(request, view)
@@ -1,10 +1,15 @@
+from django.urls import path
 from rest_framework.routers import DefaultRouter
 
-from .views import WebtoonViewSet
+from .views import CacheStatsView, SyncView, WebtoonViewSet
 
 app_name = 'api'
 
 router = DefaultRouter()
 router.register('webtoons', WebtoonViewSet, basename='webtoon')
 
-urlpatterns = router.urls
+urlpatterns = [
+    path('sync/', SyncView.as_view(), name='sync'),
+    path('cache/stats/', CacheStatsView.as_view(), name='cache-stats'),
+    *router.urls,
+]
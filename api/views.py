@@ -1,25 +1,68 @@
-import hashlib
+import time
 
 from django.conf import settings
-from django.core.cache import cache
-from django.db.models import Count
+from django.db import transaction
+from django.http import StreamingHttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils import timezone
+from django.utils.http import http_date, quote_etag
+from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import OpenApiParameter, extend_schema, extend_schema_view
 from rest_framework import status, viewsets
-from rest_framework.filters import SearchFilter, OrderingFilter
+from rest_framework.filters import OrderingFilter
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
+from rest_framework.views import APIView
 
-from accounts.permissions import HasFeaturePermission
+from accounts.permissions import HasFeaturePermission, IsSuperUser
 
+from . import cache as webtoon_cache
+from . import local_cache
+from .export import EXPORT_FORMATS
+from . import stats as webtoon_stats
+from . import suggest as webtoon_suggest
+from . import sync as webtoon_sync
 from .models import Chapter, Comment, Webtoon
+from .pagination import KeysetPagination
+from .search import WebtoonSearchFilter
 from .permissions import IsOwner
-from .serializers import ChapterSerializer, CommentSerializer, WebtoonSerializer
+from .serializers import (
+    BulkWriteResultSerializer,
+    ChapterSerializer,
+    CommentSerializer,
+    SyncSerializer,
+    ValuesRepresentation,
+    WebtoonSerializer,
+    WebtoonStatsSerializer,
+    WebtoonSuggestionSerializer,
+)
+
+
+FIELDSET_PARAMETERS = [
+    OpenApiParameter(
+        name='fields',
+        type=str,
+        description="Champs à renvoyer, séparés par des virgules (`id` est toujours inclus)",
+    ),
+    OpenApiParameter(
+        name='omit',
+        type=str,
+        description="Champs à retirer de la représentation, séparés par des virgules",
+    ),
+    OpenApiParameter(
+        name='profile',
+        type=str,
+        enum=tuple(WebtoonSerializer.PROFILES),
+        description="Représentation nommée (`compact` par défaut sur la liste, `full` sur le détail)",
+    ),
+]
 
 
 @extend_schema_view(
-    list=extend_schema(summary="Lister les webtoons de l'utilisateur connecté"),
-    retrieve=extend_schema(summary="Récupérer le détail d'un webtoon"),
+    list=extend_schema(summary="Lister les webtoons de l'utilisateur connecté", parameters=FIELDSET_PARAMETERS),
+    retrieve=extend_schema(summary="Récupérer le détail d'un webtoon", parameters=FIELDSET_PARAMETERS),
     create=extend_schema(summary="Créer un nouveau webtoon"),
     update=extend_schema(summary="Mettre à jour un webtoon"),
     partial_update=extend_schema(summary="Modifier partiellement un webtoon"),
@@ -34,68 +77,69 @@ class WebtoonViewSet(viewsets.ModelViewSet):
     serializer_class = WebtoonSerializer
     permission_classes = (IsAuthenticated, HasFeaturePermission, IsOwner)
     required_feature = "webtoon_management"
-    filter_backends = (SearchFilter, OrderingFilter)
+    # Search ranks results, so it has to run after the default ordering.
+    filter_backends = (OrderingFilter, WebtoonSearchFilter)
     search_fields = ("title", "type", "language", "status", "comment")
     ordering_fields = ("title", "rating", "chapter", "updated_at", "created_at")
     ordering = ("-updated_at",)
+    suggest_limit = 10
+    bulk_max_items = 500
+    keyset_orderings = {
+        'chapters': 'chapter_number',
+        'comments': '-created_at',
+    }
 
     def get_queryset(self):
-        return (
+        # chapters_count / comments_count are denormalized columns kept up to
+        # date by api.signals, so no join or prefetch is needed here.
+        queryset = (
             Webtoon.objects.filter(user=self.request.user)
             .select_related('user')
-            .prefetch_related('chapters', 'comments')
-            .annotate(
-                chapters_count=Count('chapters', distinct=True),
-                comments_count=Count('comments', distinct=True),
-            )
             .order_by('-last_update', '-created_at')
         )
+        fieldset = self._get_fieldset()
+        if fieldset is not None:
+            # Every readable field is a model column; `user` backs IsOwner.
+            queryset = queryset.only('user', *fieldset)
+        return queryset
 
+    def get_serializer(self, *args, **kwargs):
+        fieldset = self._get_fieldset()
+        if fieldset is not None:
+            kwargs.setdefault('fields', fieldset)
+        return super().get_serializer(*args, **kwargs)
+
+    @property
+    def paginator(self):
+        """Use keyset pagination when the client opts in with ``?pagination=cursor``."""
+        request = getattr(self, 'request', None)
+        if not hasattr(self, '_paginator') and request is not None and KeysetPagination.is_requested(request):
+            self._paginator = KeysetPagination(ordering=self.keyset_orderings.get(self.action))
+        return super().paginator
+
+    # Cached responses are invalidated by api.signals once the write commits.
     def perform_create(self, serializer):
-        instance = serializer.save(user=self.request.user)
-        self._invalidate_cache(instance.user_id)
+        serializer.save(user=self.request.user)
 
     def perform_update(self, serializer):
-        instance = serializer.save(user=self.request.user)
-        self._invalidate_cache(instance.user_id)
-
-    def perform_destroy(self, instance):
-        user_id = instance.user_id
-        super().perform_destroy(instance)
-        self._invalidate_cache(user_id)
+        serializer.save(user=self.request.user)
 
     def list(self, request, *args, **kwargs):
         """Return the paginated list of webtoons with per-user caching."""
-        queryset = self.filter_queryset(self.get_queryset())
-        cache_key = self._build_list_cache_key(request.user.pk, request.get_full_path())
-
-        cached_payload = cache.get(cache_key)
-        if cached_payload is not None:
-            return Response(cached_payload)
 
-        page = self.paginate_queryset(queryset)
-        if page is not None:
-            serializer = self.get_serializer(page, many=True)
-            response = self.get_paginated_response(serializer.data)
-        else:
-            serializer = self.get_serializer(queryset, many=True)
-            response = Response(serializer.data)
+        def build_response():
+            return self._list_response(self.filter_queryset(self.get_queryset()), self.get_serializer)
 
-        cache.set(cache_key, response.data, self.cache_timeout)
-        self._register_cache_key(request.user.pk, cache_key)
-        return response
+        return self._cached_read(request, build_response, 'list')
 
     def retrieve(self, request, *args, **kwargs):
         """Retrieve a single webtoon and hydrate the cache."""
-        cache_key = self._build_detail_cache_key(request.user.pk, kwargs.get('pk'))
-        cached_payload = cache.get(cache_key)
-        if cached_payload is not None:
-            return Response(cached_payload)
-
-        response = super().retrieve(request, *args, **kwargs)
-        cache.set(cache_key, response.data, self.cache_timeout)
-        self._register_cache_key(request.user.pk, cache_key)
-        return response
+        return self._cached_read(
+            request,
+            lambda: super(WebtoonViewSet, self).retrieve(request, *args, **kwargs),
+            'detail',
+            kwargs.get('pk'),
+        )
 
     @extend_schema(
         summary="Lister les chapitres d'un webtoon",
@@ -118,35 +162,20 @@ class WebtoonViewSet(viewsets.ModelViewSet):
     @action(detail=True, methods=['get', 'post'], url_path='chapters')
     def chapters(self, request, pk=None):
         """List or create chapters belonging to a webtoon."""
-        webtoon = self.get_object()
         if request.method.lower() == 'get':
-            queryset = webtoon.chapters.all().order_by('chapter_number')
-            cache_key = self._build_related_cache_key(
-                webtoon.user_id,
-                webtoon.pk,
-                'chapters',
-                request.get_full_path(),
-            )
-            cached_payload = cache.get(cache_key)
-            if cached_payload is not None:
-                return Response(cached_payload)
-
-            page = self.paginate_queryset(queryset)
-            if page is not None:
-                serializer = ChapterSerializer(page, many=True)
-                response = self.get_paginated_response(serializer.data)
-            else:
-                serializer = ChapterSerializer(queryset, many=True)
-                response = Response(serializer.data)
 
-            cache.set(cache_key, response.data, self.cache_timeout)
-            self._register_cache_key(webtoon.user_id, cache_key)
-            return response
+            def build_response():
+                webtoon = self.get_object()
+                queryset = webtoon.chapters.all().order_by('chapter_number')
+                return self._list_response(queryset, ChapterSerializer)
 
+            return self._cached_read(request, build_response, 'chapters', pk)
+
+        webtoon = self.get_object()
         serializer = ChapterSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        serializer.save(webtoon=webtoon)
-        self._invalidate_cache(webtoon.user_id)
+        with transaction.atomic():
+            serializer.save(webtoon=webtoon)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
     @extend_schema(
@@ -170,67 +199,540 @@ class WebtoonViewSet(viewsets.ModelViewSet):
     @action(detail=True, methods=['get', 'post'], url_path='comments')
     def comments(self, request, pk=None):
         """List or create comments belonging to a webtoon."""
-        webtoon = self.get_object()
         if request.method.lower() == 'get':
-            queryset = webtoon.comments.all().select_related('user').order_by('-created_at')
-            cache_key = self._build_related_cache_key(
-                webtoon.user_id,
-                webtoon.pk,
-                'comments',
-                request.get_full_path(),
-            )
-            cached_payload = cache.get(cache_key)
-            if cached_payload is not None:
-                return Response(cached_payload)
-
-            page = self.paginate_queryset(queryset)
-            if page is not None:
-                serializer = CommentSerializer(page, many=True)
-                response = self.get_paginated_response(serializer.data)
-            else:
+
+            def build_response():
+                webtoon = self.get_object()
+                queryset = webtoon.comments.all().select_related('user').order_by('-created_at')
+                page = self.paginate_queryset(queryset)
+                if page is not None:
+                    serializer = CommentSerializer(page, many=True)
+                    return self.get_paginated_response(serializer.data)
                 serializer = CommentSerializer(queryset, many=True)
-                response = Response(serializer.data)
+                return Response(serializer.data)
 
-            cache.set(cache_key, response.data, self.cache_timeout)
-            self._register_cache_key(webtoon.user_id, cache_key)
-            return response
+            return self._cached_read(request, build_response, 'comments', pk)
 
+        webtoon = self.get_object()
         serializer = CommentSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        serializer.save(webtoon=webtoon, user=request.user)
-        self._invalidate_cache(webtoon.user_id)
+        with transaction.atomic():
+            serializer.save(webtoon=webtoon, user=request.user)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
+    @extend_schema(
+        methods=['POST'],
+        summary="Créer plusieurs webtoons en une requête",
+        request=WebtoonSerializer(many=True),
+        responses={201: BulkWriteResultSerializer, 207: BulkWriteResultSerializer},
+    )
+    @extend_schema(
+        methods=['PATCH'],
+        summary="Modifier partiellement plusieurs webtoons (chaque élément porte son `id`)",
+        request=WebtoonSerializer(many=True),
+        responses={200: BulkWriteResultSerializer, 207: BulkWriteResultSerializer},
+    )
+    @action(detail=False, methods=['post', 'patch'], url_path='bulk')
+    def bulk(self, request):
+        """Create or partially update a list of webtoons in one transaction."""
+        items = self._get_bulk_items(request)
+        if request.method.lower() == 'post':
+            return self._bulk_create_webtoons(request, items)
+        return self._bulk_update_webtoons(request, items)
+
+    @extend_schema(
+        summary="Ajouter plusieurs chapitres à un webtoon",
+        request=ChapterSerializer(many=True),
+        responses={201: BulkWriteResultSerializer, 207: BulkWriteResultSerializer},
+    )
+    @action(detail=True, methods=['post'], url_path='chapters/bulk')
+    def chapters_bulk(self, request, pk=None):
+        """Create a list of chapters for a webtoon in one transaction."""
+        webtoon = self.get_object()
+        items = self._get_bulk_items(request)
+        existing = set(
+            webtoon.chapters.filter(
+                chapter_number__in=[item.get('chapter_number') for item in items if isinstance(item, dict)]
+            ).values_list('chapter_number', flat=True)
+        )
+
+        results, chapters = [], []
+        for index, item in enumerate(items):
+            serializer = ChapterSerializer(data=item)
+            if not serializer.is_valid():
+                results.append(self._bulk_error(index, serializer.errors))
+                continue
+            number = serializer.validated_data['chapter_number']
+            if number in existing:
+                results.append(
+                    self._bulk_error(index, {'chapter_number': ["Ce chapitre existe déjà pour ce webtoon."]})
+                )
+                continue
+            existing.add(number)
+            chapters.append((index, Chapter(webtoon=webtoon, **serializer.validated_data)))
+
+        if chapters:
+            with transaction.atomic():
+                # bulk_create does not send post_save: the counter, the sync
+                # log and the cache are updated here.
+                Chapter.objects.bulk_create([chapter for _, chapter in chapters])
+                Webtoon.adjust_counters(webtoon.pk, chapters=len(chapters))
+                webtoon_sync.record(webtoon.user_id, [chapter for _, chapter in chapters])
+                webtoon_sync.record(webtoon.user_id, [webtoon])
+                webtoon_cache.invalidate_webtoon_on_commit(webtoon.user_id, webtoon.pk)
+        results.extend(
+            {'index': index, 'status': status.HTTP_201_CREATED, 'data': ChapterSerializer(chapter).data}
+            for index, chapter in chapters
+        )
+        return self._bulk_response(results, status.HTTP_201_CREATED)
+
+    @extend_schema(
+        summary="Suggérer des titres de webtoons (autocomplétion)",
+        parameters=[
+            OpenApiParameter(
+                name='q',
+                type=str,
+                location=OpenApiParameter.QUERY,
+                description='Début du titre ou d\'un mot du titre (accents et casse ignorés)',
+            )
+        ],
+        responses=WebtoonSuggestionSerializer(many=True),
+    )
+    @action(detail=False, methods=['get'], url_path='suggest', pagination_class=None)
+    def suggest(self, request):
+        """Return the titles matching a prefix, served from the per-user prefix index."""
+        query = request.query_params.get('q', '')
+        if not query.strip():
+            return Response([])
+        generation = webtoon_cache.get_generation(request.user.pk)
+        index = webtoon_suggest.get_index(request.user.pk, generation)
+        return Response(webtoon_suggest.suggest(index, query, limit=self.suggest_limit))
+
+    @extend_schema(
+        summary="Statistiques de la bibliothèque (répartitions, histogramme des notes, chapitres lus)",
+        responses=WebtoonStatsSerializer,
+    )
+    @action(detail=False, methods=['get'], url_path='stats', pagination_class=None)
+    def stats(self, request):
+        """Return the pre-aggregated statistics of the user's library."""
+        return self._cached_read(request, lambda: Response(webtoon_stats.get_stats(request.user.pk)), 'stats')
+
+    @extend_schema(
+        summary="Exporter toute la bibliothèque (NDJSON avec chapitres et commentaires, ou CSV)",
+        parameters=[
+            OpenApiParameter(
+                name='output',
+                type=str,
+                enum=tuple(EXPORT_FORMATS),
+                description="Format du fichier (`ndjson` par défaut ; le CSV est relisible par `import_webtoons`)",
+            )
+        ],
+        responses={(200, 'application/x-ndjson'): OpenApiTypes.STR, (200, 'text/csv'): OpenApiTypes.STR},
+    )
+    @action(detail=False, methods=['get'], url_path='export', pagination_class=None)
+    def export(self, request):
+        """Stream the whole library; memory use does not depend on its size."""
+        output = request.query_params.get('output', 'ndjson')
+        if output not in EXPORT_FORMATS:
+            raise ValidationError({'output': f"Formats disponibles : {', '.join(EXPORT_FORMATS)}."})
+        content_type, iter_lines = EXPORT_FORMATS[output]
+        response = StreamingHttpResponse(iter_lines(request.user.pk), content_type=content_type)
+        filename = f"webtoons-{request.user.username}-{timezone.localdate():%Y%m%d}.{output}"
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
+    def _get_bulk_items(self, request) -> list:
+        items = request.data
+        if not isinstance(items, list):
+            raise ValidationError({'detail': "Le corps de la requête doit être une liste d'objets."})
+        if not items:
+            raise ValidationError({'detail': "La liste est vide."})
+        if len(items) > self.bulk_max_items:
+            raise ValidationError({'detail': f"Au plus {self.bulk_max_items} éléments par requête."})
+        return items
+
+    def _bulk_create_webtoons(self, request, items):
+        context = self.get_serializer_context()
+        results, webtoons = [], []
+        for index, item in enumerate(items):
+            serializer = WebtoonSerializer(data=item, context=context)
+            if serializer.is_valid():
+                webtoons.append((index, Webtoon(**serializer.validated_data)))
+            else:
+                results.append(self._bulk_error(index, serializer.errors))
+
+        if webtoons:
+            with transaction.atomic():
+                Webtoon.objects.bulk_create([webtoon for _, webtoon in webtoons])
+                webtoon_sync.record(request.user.pk, [webtoon for _, webtoon in webtoons])
+                webtoon_stats.record_bulk(request.user.pk, [webtoon for _, webtoon in webtoons], created=True)
+                webtoon_cache.invalidate_on_commit(request.user.pk, webtoons=[webtoon for _, webtoon in webtoons])
+        results.extend(
+            {
+                'index': index,
+                'status': status.HTTP_201_CREATED,
+                'data': WebtoonSerializer(instance, context=context).data,
+            }
+            for index, instance in webtoons
+        )
+        return self._bulk_response(results, status.HTTP_201_CREATED)
+
+    def _bulk_update_webtoons(self, request, items):
+        context = self.get_serializer_context()
+        ids = [item.get('id') for item in items if isinstance(item, dict)]
+        instances = self.get_queryset().filter(pk__in=[pk for pk in ids if isinstance(pk, int)]).in_bulk()
+
+        results, webtoons, fields, seen = [], [], set(), set()
+        for index, item in enumerate(items):
+            webtoon_id = item.get('id') if isinstance(item, dict) else None
+            instance = instances.get(webtoon_id)
+            if instance is None:
+                results.append(self._bulk_error(index, {'id': ["Webtoon introuvable."]}, status.HTTP_404_NOT_FOUND))
+                continue
+            if webtoon_id in seen:
+                results.append(self._bulk_error(index, {'id': ["Ce webtoon apparaît plusieurs fois."]}))
+                continue
+            serializer = WebtoonSerializer(instance, data=item, partial=True, context=context)
+            if not serializer.is_valid():
+                results.append(self._bulk_error(index, serializer.errors))
+                continue
+            seen.add(webtoon_id)
+            for field_name, value in serializer.validated_data.items():
+                setattr(instance, field_name, value)
+                fields.add(field_name)
+            webtoons.append((index, instance))
+
+        if webtoons:
+            # bulk_update bypasses auto_now: timestamps are refreshed explicitly.
+            now = timezone.now()
+            for _, instance in webtoons:
+                instance.updated_at = instance.last_update = now
+            with transaction.atomic():
+                Webtoon.objects.bulk_update(
+                    [instance for _, instance in webtoons],
+                    sorted(fields | {'updated_at', 'last_update'}),
+                    batch_size=self.bulk_max_items,
+                )
+                webtoon_sync.record(request.user.pk, [instance for _, instance in webtoons])
+                webtoon_stats.record_bulk(request.user.pk, [instance for _, instance in webtoons], created=False)
+                webtoon_cache.invalidate_on_commit(request.user.pk, webtoons=[instance for _, instance in webtoons])
+        results.extend(
+            {
+                'index': index,
+                'status': status.HTTP_200_OK,
+                'data': WebtoonSerializer(instance, context=context).data,
+            }
+            for index, instance in webtoons
+        )
+        return self._bulk_response(results, status.HTTP_200_OK)
+
     @staticmethod
-    def _build_list_cache_key(user_id: int, full_path: str) -> str:
-        digest = hashlib.md5(full_path.encode('utf-8')).hexdigest()
-        return f"webtoon:{user_id}:list:{digest}"
+    def _bulk_error(index: int, errors, item_status: int = status.HTTP_400_BAD_REQUEST) -> dict:
+        return {'index': index, 'status': item_status, 'errors': errors}
 
     @staticmethod
-    def _build_detail_cache_key(user_id: int, webtoon_id: int | str) -> str:
-        return f"webtoon:{user_id}:detail:{webtoon_id}"
+    def _bulk_response(results: list, success_status: int) -> Response:
+        """Per-item results; 207 when only part of the list could be written."""
+        results.sort(key=lambda result: result['index'])
+        failed = sum(1 for result in results if 'errors' in result)
+        succeeded = len(results) - failed
+        if not failed:
+            response_status = success_status
+        elif succeeded:
+            response_status = status.HTTP_207_MULTI_STATUS
+        else:
+            response_status = status.HTTP_400_BAD_REQUEST
+        return Response(
+            {'succeeded': succeeded, 'failed': failed, 'results': results},
+            status=response_status,
+        )
+
+    def _list_response(self, queryset, get_serializer):
+        """
+        Paginate and serialize ``queryset``.
+
+        With ``API_FAST_SERIALIZATION`` the rows are read with ``.values()`` and
+        turned into dicts directly (see ``ValuesRepresentation``); the payload
+        is the same as the one ``get_serializer(page, many=True)`` builds.
+        """
+        fast = None
+        if settings.API_FAST_SERIALIZATION:
+            fast = ValuesRepresentation.from_serializer(get_serializer())
+        if fast is not None:
+            queryset = fast.values(queryset)
+
+        page = self.paginate_queryset(queryset)
+        items = queryset if page is None else page
+        data = fast.to_representation(items) if fast is not None else get_serializer(items, many=True).data
+        return Response(data) if page is None else self.get_paginated_response(data)
+
+    def _cached_read(self, request, build_response, resource: str, webtoon_id=None):
+        """
+        Serve a read endpoint from the per-user response cache.
+
+        Cache entries and validators are scoped to the requesting user, so a hit
+        or a 304 can only be served for data this user was allowed to read. Pages
+        of one webtoon are only served once the webtoon is known to belong to the
+        user: validators alone would also match an id that does not exist, and
+        its cache state is only created for its owner.
+
+        Pages of one webtoon also depend on its own generation. List pages
+        showing the chapter/comment counters record the generations of their
+        rows: such a page is only known to be current once its entry is read,
+        so its validators are checked after the read.
+
+        Misses are rebuilt by the request itself. An entry close to expiry is
+        refreshed by the one request taking the rebuild lock (see ``api.cache``)
+        while the others keep being served the entry: no request waits.
+        """
+        user_id = request.user.pk
+        if webtoon_id is not None:
+            webtoon_id = self._owned_webtoon_id(webtoon_id)
+            if webtoon_id is None:
+                # build_response answers the 404.
+                return build_response()
+        generation, last_modified = webtoon_cache.get_generation_state(user_id)
+        scopes = {} if webtoon_id is None else webtoon_cache.get_webtoon_states(user_id, [webtoon_id])
+        cache_key = self._build_cache_key(request, generation, resource, webtoon_id, scopes)
+        row_scoped = self._is_row_scoped(resource)
+        validators = None
+        if not row_scoped:
+            validators = self._build_validators(request, cache_key, scopes, last_modified)
+            not_modified = self._get_not_modified_response(request, *validators)
+            if not_modified is not None:
+                return not_modified
+
+        # Only JSON bytes are cached; the browsable API is rendered per request.
+        if request.accepted_renderer.format != 'json':
+            return self._rebuild(request, build_response, cache_key, last_modified, validators, store=False)
+        entry, row_states = self._read_entry(user_id, cache_key, row_scoped)
+        if entry is None:
+            return self._rebuild(request, build_response, cache_key, last_modified, validators)
+        if webtoon_cache.should_refresh_early(entry) and webtoon_cache.acquire_rebuild_lock(cache_key):
+            return self._rebuild(request, build_response, cache_key, last_modified, validators, locked=True)
+        if row_scoped:
+            validators = self._build_validators(request, cache_key, row_states, last_modified)
+            not_modified = self._get_not_modified_response(request, *validators)
+            if not_modified is not None:
+                return not_modified
+        return self._serve_entry(request, entry, validators)
+
+    def _serve_entry(self, request, entry: dict, validators: tuple[str, int]):
+        response = webtoon_cache.build_cached_response(entry)
+        self._set_validators(response, *validators)
+        webtoon_cache.apply_encoding(request, response, entry)
+        return response
+
+    def _rebuild(
+        self, request, build_response, cache_key: str, last_modified: int, validators, *, store=True, locked=False
+    ):
+        """
+        Build the response and, with ``store``, cache it under ``cache_key``.
+
+        ``validators`` is None for list pages showing the chapter/comment
+        counters: they follow from the states of the rows, and the page is
+        neither stored nor validated when a row moved while it was built.
+        ``locked`` releases the rebuild lock once done.
+        """
+        user_id = request.user.pk
+        started_at = time.monotonic()
+        child_writes = webtoon_cache.get_child_writes(user_id) if validators is None else None
+        rows = None
+        try:
+            response = build_response()
+            if validators is None:
+                row_states = None
+                if response.status_code == status.HTTP_200_OK:
+                    row_states = webtoon_cache.get_row_states(user_id, self._row_ids(response.data), child_writes)
+                if row_states is None:
+                    # An error, or a chapter/comment written while the page was built.
+                    if locked:
+                        webtoon_cache.release_rebuild_lock(cache_key)
+                    return response
+                rows = {row: state[0] for row, state in row_states.items()}
+                validators = self._build_validators(request, cache_key, row_states, last_modified)
+        except BaseException:
+            if locked:
+                webtoon_cache.release_rebuild_lock(cache_key)
+            raise
+        if store:
+            webtoon_cache.cache_rendered_response(
+                request, response, cache_key, self.cache_timeout, rows, started_at=started_at, locked=locked
+            )
+        return self._set_validators(response, *validators)
+
+    def _owned_webtoon_id(self, pk):
+        """Return ``pk`` as an int if it is a webtoon of the requesting user, else None."""
+        try:
+            pk = int(pk)
+        except (TypeError, ValueError):
+            return None
+        return pk if Webtoon.objects.filter(pk=pk, user=self.request.user).exists() else None
+
+    def _read_entry(self, user_id: int, cache_key: str, row_scoped: bool):
+        """Return ``(entry, row states)``; an entry one of whose rows moved is a miss."""
+        entry = local_cache.get_entry(cache_key)
+        if entry is None or not row_scoped:
+            return entry, None
+        row_states = self._current_row_states(user_id, entry['rows'])
+        return (entry, row_states) if row_states is not None else (None, None)
+
+    def _get_fieldset(self):
+        """Return the sparse fieldset requested for list/retrieve, or None for every field."""
+        request = getattr(self, 'request', None)
+        if request is None or self.action not in ('list', 'retrieve'):
+            return None
+        params = request.query_params
+        return WebtoonSerializer.select_fields(
+            fields=params.get('fields'),
+            omit=params.get('omit'),
+            profile=params.get('profile'),
+            default_profile='compact' if self.action == 'list' else 'full',
+        )
+
+    def _build_cache_key(self, request, generation: int, resource: str, webtoon_id=None, scopes=None) -> str:
+        parts = [] if webtoon_id is None else [webtoon_id, f"w{scopes[webtoon_id][0]}"]
+        if resource != 'detail':
+            parts.append(webtoon_cache.digest(webtoon_cache.canonical_path(request)))
+        else:
+            # Only the fieldset changes a detail payload; other parameters
+            # must not fragment its cache entry.
+            fieldset = self._get_fieldset()
+            if fieldset is not None:
+                parts.append(webtoon_cache.digest(','.join(fieldset)))
+        return webtoon_cache.build_cache_key(request.user.pk, generation, resource, *parts)
+
+    def _is_row_scoped(self, resource: str) -> bool:
+        """Whether list rows show counters that chapter/comment writes change."""
+        if resource != 'list':
+            return False
+        fieldset = self._get_fieldset()
+        return fieldset is None or not set(Webtoon.COUNTER_FIELDS).isdisjoint(fieldset)
+
+    @staticmethod
+    def _current_row_states(user_id: int, rows: dict):
+        """Return the states of a cached page's rows, or None if one of them moved."""
+        states = webtoon_cache.get_webtoon_states(user_id, rows)
+        if any(states[row][0] != row_generation for row, row_generation in rows.items()):
+            return None
+        return states
 
     @staticmethod
-    def _build_related_cache_key(user_id: int, webtoon_id: int, resource: str, full_path: str) -> str:
-        digest = hashlib.md5(full_path.encode('utf-8')).hexdigest()
-        return f"webtoon:{user_id}:{resource}:{webtoon_id}:{digest}"
+    def _row_ids(data) -> list:
+        rows = data['results'] if isinstance(data, dict) else data
+        return [row['id'] for row in rows]
 
     @staticmethod
-    def _cache_index_key(user_id: int) -> str:
-        return f"webtoon:index:{user_id}"
-
-    def _register_cache_key(self, user_id: int, cache_key: str) -> None:
-        """Persist the cache key so it can be invalidated later for the user."""
-        index_key = self._cache_index_key(user_id)
-        stored_keys = cache.get(index_key, [])
-        if cache_key not in stored_keys:
-            stored_keys.append(cache_key)
-            cache.set(index_key, stored_keys, self.cache_timeout)
-
-    def _invalidate_cache(self, user_id: int) -> None:
-        """Purge all cached entries associated with the given user."""
-        index_key = self._cache_index_key(user_id)
-        stored_keys = cache.get(index_key, [])
-        if stored_keys:
-            cache.delete_many(stored_keys)
-        cache.delete(index_key)
+    def _build_validators(request, cache_key: str, scopes: dict, last_modified: int) -> tuple[str, int]:
+        """
+        Strong validator and modification time of a payload.
+
+        The payload only changes with the generations in ``cache_key`` and
+        those of the webtoons in ``scopes``.
+        """
+        generations = ','.join(f'{webtoon_id}.{state[0]}' for webtoon_id, state in sorted(scopes.items()))
+        etag = quote_etag(webtoon_cache.digest(f"{cache_key}:{generations}:{request.accepted_media_type}"))
+        return etag, max([last_modified, *(state[1] for state in scopes.values())])
+
+    @staticmethod
+    def _get_not_modified_response(request, etag: str, last_modified: int):
+        """Return a 304 response when the client copy is still current, else None."""
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is not None:
+            response.headers['ETag'] = etag
+            response.headers['Last-Modified'] = http_date(last_modified)
+            patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+    @staticmethod
+    def _set_validators(response, etag: str, last_modified: int):
+        if response.status_code == status.HTTP_200_OK:
+            response.headers['ETag'] = etag
+            response.headers['Last-Modified'] = http_date(last_modified)
+            patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+
+class SyncView(APIView):
+    """
+    Delta synchronisation for offline-capable clients.
+
+    Returns the current state of the webtoons, chapters and comments changed
+    since the `since` cursor, and the ids of the deleted ones. A webtoon
+    tombstone also stands for its chapters and comments.
+    """
+
+    permission_classes = (IsAuthenticated, HasFeaturePermission)
+    required_feature = "webtoon_management"
+    default_limit = 500
+    max_limit = 2000
+
+    @extend_schema(
+        summary="Synchroniser les changements depuis un curseur",
+        parameters=[
+            OpenApiParameter(
+                name='since',
+                type=int,
+                description="Curseur renvoyé par la synchronisation précédente (0 ou absent : tout récupérer)",
+            ),
+            OpenApiParameter(
+                name='limit',
+                type=int,
+                description="Nombre maximal de changements par réponse (500 par défaut)",
+            ),
+        ],
+        responses=SyncSerializer,
+    )
+    def get(self, request):
+        since = self._get_int_param(request, 'since', 0, minimum=0)
+        limit = min(self._get_int_param(request, 'limit', self.default_limit, minimum=1), self.max_limit)
+        changes, has_more, cursor = webtoon_sync.changes_since(request.user.pk, since, limit)
+
+        changed = {'webtoon': [], 'chapter': [], 'comment': []}
+        deleted = {'webtoon': [], 'chapter': [], 'comment': []}
+        for change in changes:
+            (deleted if change.deleted else changed)[change.kind].append(change.object_id)
+
+        # An id whose object is gone was deleted after the change was read;
+        # its tombstone comes with a later cursor.
+        webtoons = Webtoon.objects.filter(user=request.user, pk__in=changed['webtoon']).order_by('pk')
+        chapters = Chapter.objects.filter(webtoon__user=request.user, pk__in=changed['chapter']).order_by('pk')
+        comments = (
+            Comment.objects.filter(webtoon__user=request.user, pk__in=changed['comment'])
+            .select_related('user')
+            .order_by('pk')
+        )
+        context = {'request': request}
+        return Response(
+            {
+                'cursor': cursor,
+                'has_more': has_more,
+                'webtoons': WebtoonSerializer(webtoons, many=True, context=context).data,
+                'chapters': ChapterSerializer(chapters, many=True).data,
+                'comments': CommentSerializer(comments, many=True).data,
+                'deleted': {f'{kind}s': sorted(ids) for kind, ids in deleted.items()},
+            }
+        )
+
+    @staticmethod
+    def _get_int_param(request, name: str, default: int, minimum: int) -> int:
+        raw = request.query_params.get(name)
+        if raw in (None, ''):
+            return default
+        try:
+            value = int(raw)
+        except ValueError:
+            value = None
+        if value is None or value < minimum:
+            raise ValidationError({name: f"Entier supérieur ou égal à {minimum} attendu."})
+        return value
+
+
+class CacheStatsView(APIView):
+    """Hit/miss counters of the response cache tiers in the process serving the request."""
+
+    permission_classes = (IsSuperUser,)
+
+    @extend_schema(summary="Compteurs du cache de réponses (par niveau, pour le processus courant)", responses=dict)
+    def get(self, request):
+        return Response(local_cache.stats())
@@ -26,8 +26,14 @@ ALLOWED_HOSTS = os.getenv("DJANGO_ALLOWED_HOSTS", "*").split(",")
 REDIS_URL = os.getenv("REDIS_URL")
 CACHE_TTL_SECONDS = int(os.getenv("CACHE_TTL_SECONDS", "300"))
 API_PAGE_SIZE = int(os.getenv("DJANGO_API_PAGE_SIZE", "20"))
+API_FAST_SERIALIZATION = os.getenv("DJANGO_API_FAST_SERIALIZATION", "True") == "True"
+# In-process cache of rendered responses in front of `default` (0 disables it).
+L1_CACHE_MAX_BYTES = int(os.getenv("DJANGO_L1_CACHE_MAX_BYTES", "0"))
+L1_CACHE_TTL_SECONDS = int(os.getenv("DJANGO_L1_CACHE_TTL_SECONDS", "30"))
 ANON_THROTTLE_RATE = os.getenv("DRF_ANON_THROTTLE_RATE", "100/hour")
 USER_THROTTLE_RATE = os.getenv("DRF_USER_THROTTLE_RATE", "1000/day")
+AUTH_THROTTLE_RATE = os.getenv("DRF_AUTH_THROTTLE_RATE", "10/min")
+SCRAPE_THROTTLE_RATE = os.getenv("DRF_SCRAPE_THROTTLE_RATE", "30/hour")
 
 
 # Application definition
@@ -179,21 +185,34 @@ AUTHENTICATION_BACKENDS = [
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "accounts.authentication.StatelessJWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": (
         "rest_framework.permissions.IsAuthenticated",
     ),
+    "DEFAULT_RENDERER_CLASSES": (
+        "api.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
+    "DEFAULT_PARSER_CLASSES": (
+        "api.parsers.ORJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ),
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": API_PAGE_SIZE,
     "DEFAULT_THROTTLE_CLASSES": (
-        "rest_framework.throttling.AnonRateThrottle",
-        "rest_framework.throttling.UserRateThrottle",
+        "api.throttling.AnonThrottle",
+        "api.throttling.UserThrottle",
+        "api.throttling.ScopedThrottle",
     ),
     "DEFAULT_THROTTLE_RATES": {
         "anon": ANON_THROTTLE_RATE,
         "user": USER_THROTTLE_RATE,
+        # Views declaring `throttle_scope`: login/registration and scrape launches.
+        "auth": AUTH_THROTTLE_RATE,
+        "scrape": SCRAPE_THROTTLE_RATE,
     },
 }
 
@@ -208,7 +227,12 @@ SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=30),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=1),
     "AUTH_HEADER_TYPES": ("Bearer",),
+    "TOKEN_OBTAIN_SERIALIZER": "accounts.serializers.AccountTokenObtainPairSerializer",
+    "TOKEN_REFRESH_SERIALIZER": "accounts.serializers.AccountTokenRefreshSerializer",
 }
+# Embed the feature codes in access tokens: permission checks then read them
+# from the token, at the cost of revocations applying at the next refresh.
+FEATURES_IN_ACCESS_TOKEN = os.getenv("DJANGO_FEATURES_IN_ACCESS_TOKEN", "False") == "True"
 
 CORS_ALLOWED_ORIGINS = [
     origin.strip()
@@ -248,6 +272,13 @@ CELERY_TASK_ALWAYS_EAGER = (
 )
 CELERY_TASK_EAGER_PROPAGATES = True
 
+# Image downloads of a scrape job: parallel requests in total and per host, retries of a failed request.
+SCRAPER_DOWNLOAD_CONCURRENCY = int(os.getenv("SCRAPER_DOWNLOAD_CONCURRENCY", "8"))
+SCRAPER_DOWNLOAD_PER_HOST = int(os.getenv("SCRAPER_DOWNLOAD_PER_HOST", "4"))
+SCRAPER_DOWNLOAD_RETRIES = int(os.getenv("SCRAPER_DOWNLOAD_RETRIES", "3"))
+# Larger images are rejected (long-strip pages weigh a few tens of MB).
+SCRAPER_IMAGE_MAX_BYTES = int(os.getenv("SCRAPER_IMAGE_MAX_BYTES", str(50 * 1024 * 1024)))
+
 LOGGING = {
     "version": 1,
     "disable_existing_loggers": False,
@@ -267,6 +298,10 @@ LOGGING = {
         "handlers": ["console"],
         "level": os.getenv("DJANGO_LOG_LEVEL", "INFO"),
     },
+    "loggers": {
+        # One INFO line per request, i.e. per scraped image.
+        "httpx": {"level": "WARNING"},
+    },
 }
 
 SENTRY_DSN = os.getenv("SENTRY_DSN")
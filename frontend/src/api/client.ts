@@ -2,10 +2,12 @@ import axios from 'axios'
 import type { AxiosError } from 'axios'
 import { notifyError } from '@/utils/notificationBus'
 
-const baseURL = (() => {
-  const fromEnv = import.meta.env.VITE_API_BASE_URL ?? 'http://localhost:8000/api'
-  return fromEnv.endsWith('/') ? fromEnv.slice(0, -1) : fromEnv
-})()
+const trimSlash = (url: string) => (url.endsWith('/') ? url.slice(0, -1) : url)
+
+const baseURL = trimSlash(import.meta.env.VITE_API_BASE_URL ?? 'http://localhost:8000/api')
+
+// Server-Sent Events are served by the ASGI `stream` service; in production the reverse proxy routes them.
+export const streamBaseURL = trimSlash(import.meta.env.VITE_API_STREAM_URL ?? baseURL)
 
 const apiClient = axios.create({
   baseURL,
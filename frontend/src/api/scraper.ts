@@ -1,8 +1,18 @@
-import apiClient from './client'
+import apiClient, { streamBaseURL } from './client'
+
+export type ScrapeProgress = {
+  phase: 'queued' | 'crawling' | 'downloading' | 'saving'
+  chapter_number: number | null
+  chapters_done: number
+  chapters_total: number
+  images_downloaded: number
+  bytes_downloaded: number
+}
 
 export type ScrapeJob = {
   id: number
   url: string
+  incremental: boolean
   status: string
   message: string
   webtoon: number | null
@@ -16,8 +26,13 @@ export type ScrapeJob = {
   started_at: string | null
   finished_at: string | null
   duration: string | null
+  progress: ScrapeProgress | null
 }
 
+export type ScrapeStreamEvent =
+  | { event: 'status' | 'done'; data: ScrapeJob }
+  | { event: 'progress'; data: ScrapeProgress }
+
 export const launchScraper = async (url: string) => {
   const { data } = await apiClient.post<ScrapeJob>('/scraper/', { url })
   return data
@@ -32,3 +47,53 @@ export const getScrapeHistory = async () => {
   const { data } = await apiClient.get<ScrapeJob[]>('/scraper/history/')
   return data
 }
+
+/**
+ * Follows a scrape job through its Server-Sent Events stream.
+ * EventSource cannot send the Authorization header, so the stream is read with fetch.
+ * Resolves to true once the terminal `done` event has been received.
+ */
+export const streamScrapeStatus = async (
+  id: number,
+  onEvent: (message: ScrapeStreamEvent) => void,
+  signal?: AbortSignal
+) => {
+  const headers: Record<string, string> = { Accept: 'text/event-stream' }
+  const authorization = apiClient.defaults.headers.common.Authorization
+  if (authorization) {
+    headers.Authorization = String(authorization)
+  }
+  const response = await fetch(`${streamBaseURL}/scraper/status/${id}/stream/`, { headers, signal })
+  if (!response.ok || !response.body) {
+    return false
+  }
+
+  const reader = response.body.pipeThrough(new TextDecoderStream()).getReader()
+  let buffer = ''
+  for (;;) {
+    const { value, done } = await reader.read()
+    if (done) {
+      return false
+    }
+    buffer += value
+    let boundary = buffer.indexOf('\n\n')
+    while (boundary !== -1) {
+      const block = buffer.slice(0, boundary)
+      buffer = buffer.slice(boundary + 2)
+      boundary = buffer.indexOf('\n\n')
+
+      let event = ''
+      let data = ''
+      for (const line of block.split('\n')) {
+        if (line.startsWith('event: ')) event = line.slice(7)
+        else if (line.startsWith('data: ')) data += line.slice(6)
+      }
+      if (!event || !data) continue
+      onEvent({ event, data: JSON.parse(data) } as ScrapeStreamEvent)
+      if (event === 'done') {
+        await reader.cancel()
+        return true
+      }
+    }
+  }
+}
@@ -1,4 +1,4 @@
-import type { Webtoon, WebtoonPayload } from '@/types/webtoon'
+import type { Webtoon, WebtoonPayload, WebtoonSummary } from '@/types/webtoon'
 import apiClient from './client'
 
 export type PaginatedResponse<T> = {
@@ -12,16 +12,46 @@ export type WebtoonQueryParams = {
   page?: number
   search?: string
   ordering?: string
+  profile?: 'compact' | 'full'
+  fields?: string
+  omit?: string
 }
 
 export const getWebtoons = async (params?: WebtoonQueryParams, config?: { signal?: AbortSignal }) => {
-  const { data } = await apiClient.get<PaginatedResponse<Webtoon>>('/webtoons/', {
+  const { data } = await apiClient.get<PaginatedResponse<WebtoonSummary>>('/webtoons/', {
     params,
     signal: config?.signal
   })
   return data
 }
 
+export type WebtoonSuggestion = Pick<Webtoon, 'id' | 'title' | 'image_url'>
+
+export const suggestWebtoons = async (q: string, config?: { signal?: AbortSignal }) => {
+  const { data } = await apiClient.get<WebtoonSuggestion[]>('/webtoons/suggest/', {
+    params: { q },
+    signal: config?.signal
+  })
+  return data
+}
+
+export type SyncResponse = {
+  cursor: number
+  has_more: boolean
+  webtoons: Webtoon[]
+  chapters: Array<Record<string, unknown> & { id: number; webtoon: number }>
+  comments: Array<Record<string, unknown> & { id: number; webtoon: number }>
+  deleted: { webtoons: number[]; chapters: number[]; comments: number[] }
+}
+
+export const syncWebtoons = async (since?: number, config?: { signal?: AbortSignal }) => {
+  const { data } = await apiClient.get<SyncResponse>('/sync/', {
+    params: since ? { since } : undefined,
+    signal: config?.signal
+  })
+  return data
+}
+
 export const getWebtoon = async (id: number | string) => {
   const { data } = await apiClient.get<Webtoon>(`/webtoons/${id}/`)
   return data
@@ -37,14 +67,22 @@ export const updateWebtoon = async (id: number, payload: WebtoonPayload) => {
   return data
 }
 
+export const patchWebtoon = async (id: number, payload: Partial<WebtoonPayload>) => {
+  const { data } = await apiClient.patch<Webtoon>(`/webtoons/${id}/`, payload)
+  return data
+}
+
 export const deleteWebtoon = async (id: number) => {
   await apiClient.delete(`/webtoons/${id}/`)
 }
 
 export const webtoonApi = {
   getWebtoons,
+  suggestWebtoons,
+  syncWebtoons,
   getWebtoon,
   createWebtoon,
   updateWebtoon,
+  patchWebtoon,
   deleteWebtoon
 }
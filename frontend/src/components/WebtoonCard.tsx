@@ -2,15 +2,15 @@ import { motion, type Variants } from 'framer-motion'
 import { ChevronDown, ChevronUp, ExternalLink, PencilLine, Star, Trash2 } from 'lucide-react'
 import { memo, useMemo, useState } from 'react'
 import clsx from 'clsx'
-import type { Webtoon } from '@/types/webtoon'
+import type { WebtoonSummary } from '@/types/webtoon'
 import { formatDate, prettifyLink, toStars } from '@/utils/format'
 
 type WebtoonCardProps = {
-  webtoon: Webtoon
-  onSelect?: (webtoon: Webtoon) => void
-  onEdit?: (webtoon: Webtoon) => void
-  onDelete?: (webtoon: Webtoon) => void
-  onChapterChange?: (webtoon: Webtoon, delta: number) => void
+  webtoon: WebtoonSummary
+  onSelect?: (webtoon: WebtoonSummary) => void
+  onEdit?: (webtoon: WebtoonSummary) => void
+  onDelete?: (webtoon: WebtoonSummary) => void
+  onChapterChange?: (webtoon: WebtoonSummary, delta: number) => void
 }
 
 const FALLBACK_IMAGE =
@@ -202,7 +202,7 @@ const WebtoonCardComponent = ({ webtoon, onSelect, onEdit, onDelete, onChapterCh
         <div className="space-y-1 text-xs text-textMuted/70">
           <div className="truncate">{prettifyLink(webtoon.link)}</div>
           <div>
-            Màj : <span className="text-textMuted">{formatDate(webtoon.updated_at ?? webtoon.last_read_date)}</span>
+            Màj : <span className="text-textMuted">{formatDate(webtoon.last_update ?? webtoon.updated_at ?? webtoon.last_read_date)}</span>
           </div>
         </div>
 
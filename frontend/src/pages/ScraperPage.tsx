@@ -1,7 +1,7 @@
 import { useEffect, useMemo, useState } from 'react'
 import { motion } from 'framer-motion'
 import { AlertTriangle, CheckCircle2, Clock, Loader2, RefreshCcw } from 'lucide-react'
-import { launchScraper, getScrapeHistory, getScrapeStatus, type ScrapeJob } from '@/api/scraper'
+import { launchScraper, getScrapeHistory, getScrapeStatus, streamScrapeStatus, type ScrapeJob } from '@/api/scraper'
 import { useLayout } from '@/components/Layout'
 import { useAuth } from '@/providers/AuthProvider'
 
@@ -53,17 +53,21 @@ const ScraperPage = () => {
     refreshHistory()
   }, [isAuthenticated, canUseScraper])
 
+  const updateJob = (job: ScrapeJob) => {
+    setCurrentJob(job)
+    setJobs((prev) => {
+      const others = prev.filter((item) => item.id !== job.id)
+      return [job, ...others].slice(0, 20)
+    })
+  }
+
   const pollStatus = async (jobId: number) => {
     let attempts = 0
     const maxAttempts = 30
     while (attempts < maxAttempts) {
       try {
         const job = await getScrapeStatus(jobId)
-        setCurrentJob(job)
-        setJobs((prev) => {
-          const others = prev.filter((item) => item.id !== job.id)
-          return [job, ...others].slice(0, 20)
-        })
+        updateJob(job)
         if (job.status === 'success' || job.status === 'failed') {
           return
         }
@@ -76,6 +80,28 @@ const ScraperPage = () => {
     }
   }
 
+  // Progress is pushed by the server; polling is only the fallback when the stream is unavailable.
+  const followJob = async (jobId: number) => {
+    try {
+      const finished = await streamScrapeStatus(jobId, (message) => {
+        if (message.event === 'progress') {
+          const { chapters_done, images_downloaded } = message.data
+          setCurrentJob((prev) =>
+            prev && prev.id === jobId
+              ? { ...prev, chapters_scraped: chapters_done, images_downloaded, progress: message.data }
+              : prev
+          )
+        } else {
+          updateJob(message.data)
+        }
+      })
+      if (finished) return
+    } catch (err) {
+      console.error(err)
+    }
+    pollStatus(jobId)
+  }
+
   const handleSubmit = async (event: React.FormEvent<HTMLFormElement>) => {
     event.preventDefault()
     if (!isAuthenticated) {
@@ -98,7 +124,7 @@ const ScraperPage = () => {
       setCurrentJob(job)
       setJobs((prev) => [job, ...prev].slice(0, 20))
       setUrl('')
-      pollStatus(job.id)
+      followJob(job.id)
     } catch (err: any) {
       if (err?.response?.status === 401) {
         openAuthModal()
@@ -221,7 +247,10 @@ const ScraperPage = () => {
               <p className="mt-1 text-sm text-textLight/60">Webtoon importe : {currentJob.webtoon_title}</p>
             )}
             <div className="mt-4 flex flex-wrap gap-4 text-xs text-textLight/50">
-              <span>{currentJob.chapters_scraped} chapitres</span>
+              <span>
+                {currentJob.chapters_scraped}
+                {currentJob.progress?.chapters_total ? ` / ${currentJob.progress.chapters_total}` : ''} chapitres
+              </span>
               <span>{currentJob.images_downloaded} images</span>
               {currentJob.media_root && <span>Dossier : {currentJob.media_root}</span>}
             </div>
@@ -6,16 +6,16 @@ import AddWebtoonModal from '@/components/AddWebtoonModal'
 import { useLayout } from '@/components/Layout'
 import WebtoonCard from '@/components/WebtoonCard'
 import WebtoonGridSkeleton from '@/components/skeletons/WebtoonGridSkeleton'
-import { createWebtoon, deleteWebtoon, getWebtoons, updateWebtoon } from '@/api/webtoons'
+import { createWebtoon, deleteWebtoon, getWebtoon, getWebtoons, patchWebtoon, updateWebtoon } from '@/api/webtoons'
 import { useAuth } from '@/providers/AuthProvider'
 import { useDebounce } from '@/hooks/useDebounce'
 import { notifyError, notifyInfo, notifySuccess, notifyWarning } from '@/utils/notificationBus'
-import type { Webtoon, WebtoonPayload } from '@/types/webtoon'
+import type { Webtoon, WebtoonPayload, WebtoonSummary } from '@/types/webtoon'
 
 const WEBTOON_CACHE_TTL = 60_000
 type WebtoonCacheEntry = {
   timestamp: number
-  webtoons: Webtoon[]
+  webtoons: WebtoonSummary[]
   totalCount: number
   hasMore: boolean
   currentPage: number
@@ -55,7 +55,7 @@ const invalidateCachedWebtoons = (userId: number | undefined) => {
   webtoonCache.delete(userId)
 }
 
-const mergeWebtoonLists = (current: Webtoon[], incoming: Webtoon[]) => {
+const mergeWebtoonLists = (current: WebtoonSummary[], incoming: WebtoonSummary[]) => {
   if (!current.length) return incoming
   if (!incoming.length) return current
 
@@ -74,7 +74,7 @@ const WebtoonPage = () => {
   const { searchValue, registerAddHandler, openAuthModal } = useLayout()
   const debouncedSearch = useDebounce(searchValue, 400)
   const { isAuthenticated, loading: authLoading, hasFeature, user } = useAuth()
-  const [webtoons, setWebtoons] = useState<Webtoon[]>([])
+  const [webtoons, setWebtoons] = useState<WebtoonSummary[]>([])
   const [loading, setLoading] = useState(false)
   const [error, setError] = useState<string | null>(null)
   const [isAddModalOpen, setIsAddModalOpen] = useState(false)
@@ -84,7 +84,7 @@ const WebtoonPage = () => {
   const [hasMore, setHasMore] = useState(false)
   const [loadingMore, setLoadingMore] = useState(false)
   const canManageWebtoons = hasFeature('webtoon_management')
-  const webtoonsRef = useRef<Webtoon[]>([])
+  const webtoonsRef = useRef<WebtoonSummary[]>([])
   const activeRequestRef = useRef<AbortController | null>(null)
 
   const ensureAuthenticated = useCallback(() => {
@@ -129,7 +129,11 @@ const WebtoonPage = () => {
       activeRequestRef.current = controller
 
       try {
-        const data = await getWebtoons({ page, search: debouncedSearch.trim() || undefined }, { signal: controller.signal })
+        const data = await getWebtoons(
+          // The edit form loads the full record when it opens.
+          { page, search: debouncedSearch.trim() || undefined, profile: 'compact' },
+          { signal: controller.signal }
+        )
         const incoming = data.results
         const merged = append
           ? mergeWebtoonLists(webtoonsRef.current, incoming)
@@ -294,7 +298,7 @@ const WebtoonPage = () => {
     }
   }
 
-  const handleDelete = async (webtoon: Webtoon) => {
+  const handleDelete = async (webtoon: WebtoonSummary) => {
     if (!ensureAuthenticated()) return
     try {
       await deleteWebtoon(webtoon.id)
@@ -325,12 +329,13 @@ const WebtoonPage = () => {
     }
   }
 
-  const handleChapterChange = useCallback(async (webtoon: Webtoon, delta: number) => {
+  const handleChapterChange = useCallback(async (webtoon: WebtoonSummary, delta: number) => {
     if (!ensureAuthenticated()) return
     const newChapter = Math.max(1, webtoon.chapter + delta)
     if (newChapter === webtoon.chapter) return
     try {
-      const updated = await updateWebtoon(webtoon.id, { ...webtoon, chapter: newChapter })
+      // Grid items lack some fields: only the chapter is sent.
+      const updated = await patchWebtoon(webtoon.id, { chapter: newChapter })
       const nextList = webtoonsRef.current.map((item) => (item.id === webtoon.id ? updated : item))
       webtoonsRef.current = nextList
       setWebtoons(nextList)
@@ -353,10 +358,16 @@ const WebtoonPage = () => {
     fetchWebtoons({ page: 1, append: false, background: false, merge: false })
   }, [fetchWebtoons, user?.id])
 
-  const openEditModal = (webtoon: Webtoon) => {
+  const openEditModal = async (webtoon: WebtoonSummary) => {
     if (!ensureAuthenticated()) return
-    setEditingWebtoon(webtoon)
-    setIsAddModalOpen(true)
+    try {
+      // The grid only holds the compact profile; the form needs every field.
+      setEditingWebtoon(await getWebtoon(webtoon.id))
+      setIsAddModalOpen(true)
+    } catch (err) {
+      console.error(err)
+      notifyError('Impossible de charger ce webtoon.')
+    }
   }
 
   if (authLoading) {
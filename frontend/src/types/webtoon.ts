@@ -10,8 +10,18 @@ export type Webtoon = {
   last_read_date: string | null
   comment: string | null
   image_url: string
+  last_update?: string | null
   updated_at?: string | null
   created_at?: string | null
+  chapters_count?: number
+  comments_count?: number
 }
 
+// Item of the library grid (the list's `compact` profile); the detail endpoint returns the rest.
+export type WebtoonSummary = Pick<
+  Webtoon,
+  'id' | 'title' | 'type' | 'language' | 'rating' | 'status' | 'chapter' | 'link' | 'image_url'
+> &
+  Partial<Webtoon>
+
 export type WebtoonPayload = Omit<Webtoon, 'id' | 'created_at' | 'updated_at'>
@@ -3,12 +3,13 @@ from __future__ import annotations
 import asyncio
 import logging
 import re
+from collections import defaultdict
 from dataclasses import dataclass, field
 from datetime import date
-from typing import Iterable, List, Optional
-from urllib.parse import urljoin
+from typing import Container, Iterable, List, Optional
+from urllib.parse import urljoin, urlsplit
 
-import requests
+import httpx
 from bs4 import BeautifulSoup
 
 logger = logging.getLogger(__name__)
@@ -18,6 +19,14 @@ try:
 except ImportError:  # pragma: no cover
     WebCrawler = None
 
+try:  # pragma: no cover - HTTP/2 nécessite le paquet h2 (httpx[http2])
+    import h2
+except ImportError:  # pragma: no cover
+    h2 = None
+
+# Chapter pages fetched at once from a single host.
+MAX_CONNECTIONS_PER_HOST = 8
+
 DEFAULT_HEADERS = {
     "User-Agent": (
         "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
@@ -36,17 +45,47 @@ class ScrapedChapter:
 
 
 @dataclass
-class ScrapeOutput:
+class SeriesPage:
+    """Contenu utile d'une page de série, gardé avec ses validateurs pour les requêtes conditionnelles."""
+
     title: str
-    chapters: List[ScrapedChapter]
+    chapters: List[tuple[str, str]]
     cover_image: Optional[str] = None
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
 
+    def conditional_headers(self) -> dict[str, str]:
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
 
-def scrape_webtoon(url: str, timeout: int = 15) -> ScrapeOutput:
+
+@dataclass
+class ScrapeOutput:
+    title: str
+    chapters: List[ScrapedChapter]
+    cover_image: Optional[str] = None
+    # Page de série à réutiliser au prochain scrape (absente si le site n'envoie pas de validateurs).
+    series_page: Optional[SeriesPage] = None
+    skipped_chapters: int = 0
+    not_modified: bool = False
+
+
+def scrape_webtoon(
+    url: str,
+    timeout: int = 15,
+    skip_chapters: Container[int] = frozenset(),
+    previous_page: Optional[SeriesPage] = None,
+) -> ScrapeOutput:
     """
     Scrape un webtoon depuis l'URL fournie.
 
     Tente d'utiliser crawl4ai si disponible, sinon bascule sur une analyse BeautifulSoup.
+    Les chapitres dont le numéro figure dans ``skip_chapters`` ne sont pas récupérés ; avec
+    ``previous_page``, la page de série est redemandée conditionnellement (réponse 304 si inchangée).
     """
 
     if WebCrawler:  # pragma: no cover - dépend de l'environnement
@@ -55,7 +94,7 @@ def scrape_webtoon(url: str, timeout: int = 15) -> ScrapeOutput:
         except Exception as exc:  # noqa: broad-except
             logger.warning("crawl4ai a échoué (%s), fallback BeautifulSoup activé.", exc)
 
-    return _scrape_with_bs(url, timeout)
+    return _scrape_with_bs(url, timeout, skip_chapters, previous_page)
 
 
 async def _scrape_with_crawl4ai(url: str, timeout: int) -> ScrapeOutput:
@@ -79,43 +118,96 @@ async def _scrape_with_crawl4ai(url: str, timeout: int) -> ScrapeOutput:
 
     if not chapters:
         # Fallback pour récupérer au moins la page principale
-        bs_output = _scrape_with_bs(url, timeout)
+        bs_output = await _scrape_with_httpx(url, timeout)
         return ScrapeOutput(title=title, chapters=bs_output.chapters, cover_image=bs_output.cover_image)
 
     return ScrapeOutput(title=title, chapters=chapters, cover_image=result.get('cover'))
 
 
-def _scrape_with_bs(url: str, timeout: int) -> ScrapeOutput:
-    session = requests.Session()
-    session.headers.update(DEFAULT_HEADERS)
+def _scrape_with_bs(
+    url: str,
+    timeout: int,
+    skip_chapters: Container[int] = frozenset(),
+    previous_page: Optional[SeriesPage] = None,
+) -> ScrapeOutput:
+    return asyncio.run(_scrape_with_httpx(url, timeout, skip_chapters, previous_page))
+
+
+async def _scrape_with_httpx(
+    url: str,
+    timeout: int,
+    skip_chapters: Container[int] = frozenset(),
+    previous_page: Optional[SeriesPage] = None,
+) -> ScrapeOutput:
+    # One client for the whole series: its connections are reused by every chapter page.
+    async with httpx.AsyncClient(
+        headers=DEFAULT_HEADERS,
+        timeout=timeout,
+        follow_redirects=True,
+        http2=h2 is not None,
+        limits=httpx.Limits(max_keepalive_connections=MAX_CONNECTIONS_PER_HOST),
+    ) as client:
+        return await _crawl(client, url, skip_chapters, previous_page)
+
+
+async def _crawl(
+    client: httpx.AsyncClient,
+    url: str,
+    skip_chapters: Container[int] = frozenset(),
+    previous_page: Optional[SeriesPage] = None,
+) -> ScrapeOutput:
+    headers = previous_page.conditional_headers() if previous_page else None
+    response = await client.get(url, headers=headers)
+    not_modified = previous_page is not None and response.status_code == 304
+    if not_modified:
+        page = previous_page
+    else:
+        response.raise_for_status()
+        page = _parse_series_page(response, url)
+
+    numbered = [
+        (chapter_url, chapter_title, _parse_chapter_number(chapter_title, idx))
+        for idx, (chapter_url, chapter_title) in enumerate(page.chapters, start=1)
+    ]
+    wanted = [chapter for chapter in numbered if chapter[2] not in skip_chapters]
+    host_slots = defaultdict(lambda: asyncio.Semaphore(MAX_CONNECTIONS_PER_HOST))
+    # gather() keeps the chapter order whatever the order the pages come back in.
+    chapter_images = await asyncio.gather(
+        *(_extract_images(client, host_slots[urlsplit(chapter[0]).netloc], chapter[0]) for chapter in wanted)
+    )
+    scraped_chapters = [
+        ScrapedChapter(title=chapter_title, chapter_number=chapter_number, url=chapter_url, images=images)
+        for (chapter_url, chapter_title, chapter_number), images in zip(wanted, chapter_images)
+    ]
+
+    return ScrapeOutput(
+        title=page.title,
+        chapters=scraped_chapters,
+        cover_image=page.cover_image,
+        series_page=page if page.etag or page.last_modified else None,
+        skipped_chapters=len(numbered) - len(wanted),
+        not_modified=not_modified,
+    )
 
-    response = session.get(url, timeout=timeout)
-    response.raise_for_status()
+
+def _parse_series_page(response: httpx.Response, url: str) -> SeriesPage:
     soup = BeautifulSoup(response.text, 'html.parser')
 
     title = soup.find('h1')
     title_text = title.get_text(strip=True) if title else 'Webtoon'
 
-    chapters = _extract_chapter_links(soup, url)
-    scraped_chapters: List[ScrapedChapter] = []
-    for idx, (chapter_url, chapter_title) in enumerate(chapters, start=1):
-        chapter_number = _parse_chapter_number(chapter_title, idx)
-        images = _extract_images(session, chapter_url, timeout)
-        scraped_chapters.append(
-            ScrapedChapter(
-                title=chapter_title,
-                chapter_number=chapter_number,
-                url=chapter_url,
-                images=images,
-            )
-        )
-
     cover = None
     cover_el = soup.find('img', {'class': re.compile('cover', re.I)})
     if cover_el and cover_el.get('src'):
         cover = cover_el['src']
 
-    return ScrapeOutput(title=title_text, chapters=scraped_chapters, cover_image=cover)
+    return SeriesPage(
+        title=title_text,
+        chapters=_extract_chapter_links(soup, url),
+        cover_image=cover,
+        etag=response.headers.get('ETag'),
+        last_modified=response.headers.get('Last-Modified'),
+    )
 
 
 def _extract_chapter_links(soup: BeautifulSoup, base_url: str) -> List[tuple[str, str]]:
@@ -142,11 +234,12 @@ def _extract_chapter_links(soup: BeautifulSoup, base_url: str) -> List[tuple[str
     return chapters
 
 
-def _extract_images(session: requests.Session, url: str, timeout: int) -> List[str]:
+async def _extract_images(client: httpx.AsyncClient, slot: asyncio.Semaphore, url: str) -> List[str]:
     try:
-        response = session.get(url, timeout=timeout)
+        async with slot:
+            response = await client.get(url)
         response.raise_for_status()
-    except requests.RequestException as exc:
+    except (httpx.HTTPError, httpx.InvalidURL) as exc:
         logger.warning("Impossible de récupérer %s (%s)", url, exc)
         return []
 
@@ -0,0 +1,229 @@
+"""
+Image download engine of the scrape jobs.
+
+A job downloads its images through one ``ImageDownloader``: a pooled
+``httpx.Client`` (kept-alive connections, HTTP/2 when ``h2`` is installed)
+shared by all its chapters, and a thread pool sized by
+``SCRAPER_DOWNLOAD_CONCURRENCY``. At most ``SCRAPER_DOWNLOAD_PER_HOST``
+requests run at once against the same host.
+
+Failed requests (network errors, 429 and 5xx responses) are retried up to
+``SCRAPER_DOWNLOAD_RETRIES`` times with a jittered exponential backoff,
+honouring ``Retry-After``. Images are requested with the chapter page as
+``Referer``, which most image hosts check.
+
+Bodies are streamed in chunks to a hidden temporary file next to their
+destination, then fsync'd and renamed over it: a file under ``MEDIA_ROOT`` is
+always complete. Responses that are not images (content type, magic bytes),
+truncated, or larger than ``SCRAPER_IMAGE_MAX_BYTES`` are rejected.
+
+``perform_scrape`` installs the job's downloader with ``job_downloader()``;
+``download_images`` outside of a job uses a short-lived one.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import itertools
+import logging
+import os
+import random
+import re
+import threading
+import time
+import uuid
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterable
+
+import httpx
+from django.conf import settings
+
+from scraper.crawler import DEFAULT_HEADERS
+
+try:  # pragma: no cover - HTTP/2 nécessite le paquet h2 (httpx[http2])
+    import h2
+except ImportError:  # pragma: no cover
+    h2 = None
+
+logger = logging.getLogger(__name__)
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.gif', '.webp')
+RETRY_BASE_SECONDS = 0.5
+RETRY_MAX_SECONDS = 10.0
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+# Retry-After in seconds; the HTTP-date form is not honoured.
+RETRY_AFTER_SECONDS = re.compile(r'-?\d+(\.\d+)?')
+
+CHUNK_SIZE = 64 * 1024
+# Content types of hosts that do not label their images.
+GENERIC_CONTENT_TYPES = ('application/octet-stream', 'binary/octet-stream')
+
+_current: contextvars.ContextVar[ImageDownloader | None] = contextvars.ContextVar('image_downloader', default=None)
+
+
+def guess_extension(url: str) -> str:
+    for ext in IMAGE_EXTENSIONS:
+        if url.lower().endswith(ext):
+            return ext
+    return '.jpg'
+
+
+class InvalidImage(Exception):
+    """The response is not an image that may be saved; retrying will not help."""
+
+
+def sniff_image(head: bytes) -> bool:
+    """Whether ``head``, the first bytes of a file, starts like a JPEG, PNG, GIF, WebP or AVIF image."""
+
+    return (
+        head.startswith((b'\xff\xd8\xff', b'\x89PNG\r\n\x1a\n', b'GIF87a', b'GIF89a'))
+        or (head[:4] == b'RIFF' and head[8:12] == b'WEBP')
+        or head[4:12] in (b'ftypavif', b'ftypavis')
+    )
+
+
+def backoff_delay(attempt: int, retry_after: str | None = None) -> float:
+    """
+    Seconds to wait before retry number ``attempt`` (0-based), with full jitter.
+
+    ``Retry-After`` is honoured when it is a number of seconds, clamped to
+    ``[0, RETRY_MAX_SECONDS]``; an HTTP date (or garbage) falls back to the
+    jittered backoff.
+    """
+
+    if retry_after and RETRY_AFTER_SECONDS.fullmatch(retry_after.strip()):
+        return min(max(0.0, float(retry_after)), RETRY_MAX_SECONDS)
+    return random.uniform(0, min(RETRY_MAX_SECONDS, RETRY_BASE_SECONDS * 2**attempt))
+
+
+class ImageDownloader:
+    # Replaced by a mock transport in tests.
+    transport = None
+
+    def __init__(self, concurrency: int, per_host: int, retries: int, max_bytes: int):
+        self.retries = retries
+        self.max_bytes = max_bytes
+        self.client = httpx.Client(
+            headers=DEFAULT_HEADERS,
+            follow_redirects=True,
+            http2=h2 is not None,
+            limits=httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency),
+            transport=self.transport,
+        )
+        self._executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='scrape-download')
+        self._host_slots = defaultdict(lambda: threading.BoundedSemaphore(per_host))
+        self._host_slots_lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls) -> ImageDownloader:
+        return cls(
+            concurrency=settings.SCRAPER_DOWNLOAD_CONCURRENCY,
+            per_host=settings.SCRAPER_DOWNLOAD_PER_HOST,
+            retries=settings.SCRAPER_DOWNLOAD_RETRIES,
+            max_bytes=settings.SCRAPER_IMAGE_MAX_BYTES,
+        )
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+        self.client.close()
+
+    def download(self, urls: Iterable[str], folder: Path, referer: str | None = None, timeout: int = 15) -> list[str]:
+        """Save the images of ``urls`` in ``folder``; return the names of the saved files, in order."""
+
+        futures = [
+            self._executor.submit(self._save, url, folder / f'image-{idx:03d}{guess_extension(url)}', referer, timeout)
+            for idx, url in enumerate(urls, start=1)
+            if url
+        ]
+        return [name for name in (future.result() for future in futures) if name]
+
+    def _save(self, url: str, path: Path, referer: str | None, timeout: int) -> str | None:
+        try:
+            self.fetch(url, path, referer, timeout)
+        except (httpx.HTTPError, httpx.InvalidURL):
+            logger.warning("Impossible de télécharger %s", url)
+            return None
+        except InvalidImage as exc:
+            logger.warning("Image refusée %s (%s)", url, exc)
+            return None
+        return path.name
+
+    def fetch(self, url: str, path: Path, referer: str | None = None, timeout: int = 15) -> int:
+        """Download ``url`` to ``path``; return its size in bytes."""
+
+        headers = {'Referer': referer} if referer else None
+        with self._host_slots_lock:
+            slot = self._host_slots[httpx.URL(url).host]
+        for attempt in itertools.count():
+            last = attempt == self.retries
+            try:
+                with slot, self.client.stream('GET', url, headers=headers, timeout=timeout) as response:
+                    if last or response.status_code not in RETRY_STATUSES:
+                        response.raise_for_status()
+                        return self._write(response, path)
+                    retry_after = response.headers.get('Retry-After')
+            except httpx.TransportError as exc:
+                if last or isinstance(exc, httpx.UnsupportedProtocol):
+                    raise
+                retry_after = None
+            # Sleep outside of the host slot so that other images keep flowing.
+            time.sleep(backoff_delay(attempt, retry_after))
+
+    def _write(self, response: httpx.Response, path: Path) -> int:
+        content_type = response.headers.get('Content-Type', '').split(';')[0].strip().lower()
+        if content_type and not content_type.startswith('image/') and content_type not in GENERIC_CONTENT_TYPES:
+            raise InvalidImage(f"type {content_type}")
+        length = response.headers.get('Content-Length', '')
+        declared = int(length) if length.isdigit() else None
+        if declared is not None and declared > self.max_bytes:
+            raise InvalidImage(f"{declared} octets")
+
+        # Same folder as the destination, so that the rename is atomic.
+        temp_path = path.with_name(f'.{path.name}.{uuid.uuid4().hex}.part')
+        try:
+            size = 0
+            head = b''
+            with temp_path.open('xb') as temp:
+                for chunk in response.iter_bytes(CHUNK_SIZE):
+                    size += len(chunk)
+                    if size > self.max_bytes:
+                        raise InvalidImage(f"plus de {self.max_bytes} octets")
+                    if len(head) < 12:
+                        head = (head + chunk)[:12]
+                    temp.write(chunk)
+                temp.flush()
+                os.fsync(temp.fileno())
+            if not sniff_image(head):
+                raise InvalidImage("contenu non reconnu")
+            # Without compression, the body must match its announced length.
+            if declared is not None and 'Content-Encoding' not in response.headers and size != declared:
+                raise InvalidImage(f"tronquée ({size}/{declared} octets)")
+            os.replace(temp_path, path)
+        except BaseException:
+            temp_path.unlink(missing_ok=True)
+            raise
+        return size
+
+
+@contextmanager
+def job_downloader():
+    """Share one downloader between the chapters of the current job."""
+
+    downloader = ImageDownloader.from_settings()
+    token = _current.set(downloader)
+    try:
+        yield downloader
+    finally:
+        _current.reset(token)
+        downloader.close()
+
+
+def download_images(urls: Iterable[str], folder: Path, referer: str | None = None, timeout: int = 15) -> list[str]:
+    downloader = _current.get()
+    if downloader is not None:
+        return downloader.download(urls, folder, referer, timeout)
+    with job_downloader() as downloader:
+        return downloader.download(urls, folder, referer, timeout)
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-17 01:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scraper', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='scrapejob',
+            name='incremental',
+            field=models.BooleanField(default=True),
+        ),
+    ]
@@ -21,6 +21,8 @@ class ScrapeJob(models.Model):
         related_name='scrape_jobs',
     )
     url = models.URLField()
+    # Skip the chapters already downloaded (see `perform_scrape`).
+    incremental = models.BooleanField(default=True)
     status = models.CharField(max_length=20, choices=Status.choices, default=Status.PENDING)
     message = models.TextField(blank=True)
     webtoon = models.ForeignKey(
@@ -0,0 +1,222 @@
+"""
+Live state and progress events of scrape jobs.
+
+``ScrapeJob`` rows are only written when a job starts and ends. While it is
+queued or running, the job also lives in a cache entry (a Redis hash): the
+serialized job, its owner, and its progress (phase, current chapter, chapters
+done out of total, images and bytes downloaded). ``ScrapeStatusView`` answers
+from it without touching the database; the entry is discarded once the final
+row is saved, and expires if a worker dies without discarding it.
+
+Every status transition and progress update is also published on the job's
+channel; ``ScrapeStatusStreamView`` subscribes to it for as long as a client
+follows the job. Events are not stored: a client that connects late starts
+from the job as saved in the database.
+
+With the Redis cache backend the channel is a Redis pub/sub channel, shared by
+the Celery workers and every web process. Otherwise (locmem, the task running
+in a thread or eagerly) the state is a plain cache entry and subscribers are
+asyncio queues of the current process.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import threading
+
+from django.conf import settings
+from django.core.cache import cache
+
+try:  # pragma: no cover - django-redis n'est utilisé qu'avec REDIS_URL
+    import redis.asyncio as aioredis
+    from django_redis import get_redis_connection
+except ImportError:  # pragma: no cover
+    aioredis = get_redis_connection = None
+
+logger = logging.getLogger(__name__)
+
+CHANNEL_PREFIX = "scraper:job"
+STATUS_EVENT = "status"
+PROGRESS_EVENT = "progress"
+# Last event of a stream, carrying the job as saved once finished.
+DONE_EVENT = "done"
+
+STATE_PREFIX = "scraper:job-state"
+# On top of the task time limit, after which the worker is killed.
+STATE_GRACE_SECONDS = 5 * 60
+PROGRESS_FIELDS = (
+    'phase',
+    'chapter_number',
+    'chapters_done',
+    'chapters_total',
+    'images_downloaded',
+    'bytes_downloaded',
+)
+
+
+class Phase:
+    QUEUED = 'queued'
+    CRAWLING = 'crawling'
+    DOWNLOADING = 'downloading'
+    SAVING = 'saving'
+
+
+_subscribers: dict[int, set[tuple[asyncio.AbstractEventLoop, asyncio.Queue]]] = {}
+_subscribers_lock = threading.Lock()
+_state_lock = threading.Lock()
+
+
+def channel(job_id: int) -> str:
+    return f"{CHANNEL_PREFIX}:{job_id}"
+
+
+def _uses_redis() -> bool:
+    return get_redis_connection is not None and settings.CACHES['default']['BACKEND'].startswith('django_redis')
+
+
+def _state_key(job_id: int) -> str:
+    return f"{STATE_PREFIX}:{job_id}"
+
+
+def _state_timeout() -> int:
+    return getattr(settings, 'CELERY_TASK_TIME_LIMIT', 1800) + STATE_GRACE_SECONDS
+
+
+def new_progress(phase: str) -> dict:
+    return {**dict.fromkeys(PROGRESS_FIELDS, 0), 'phase': phase, 'chapter_number': None}
+
+
+def _write_state(job_id: int, fields: dict) -> None:
+    key = _state_key(job_id)
+    if _uses_redis():
+        encoded = {name: '' if value is None else value for name, value in fields.items()}
+        pipeline = get_redis_connection('default').pipeline(transaction=False)
+        pipeline.hset(cache.make_key(key), mapping=encoded)
+        pipeline.expire(cache.make_key(key), _state_timeout())
+        pipeline.execute()
+        return
+    with _state_lock:
+        state = cache.get(key) or {}
+        state.update(fields)
+        cache.set(key, state, _state_timeout())
+
+
+def store_job(job_id: int, user_id: int, data: dict, progress: dict) -> None:
+    """Save the serialized job (a status transition) and its progress as live state."""
+
+    try:
+        _write_state(job_id, {'user': user_id, 'job': json.dumps(data), **progress})
+    except Exception:  # noqa: broad-except
+        logger.warning("Enregistrement de l'état du scrape %s impossible", job_id, exc_info=True)
+
+
+def store_progress(job_id: int, progress: dict) -> None:
+    """Save the job's progress and publish it to the clients following the job."""
+
+    try:
+        _write_state(job_id, progress)
+    except Exception:  # noqa: broad-except
+        logger.warning("Enregistrement de la progression du scrape %s impossible", job_id, exc_info=True)
+    publish(job_id, PROGRESS_EVENT, progress)
+
+
+def load_job(job_id: int) -> tuple[int, dict] | None:
+    """Return ``(owner id, serialized job with its live progress)``, or None once the job is over."""
+
+    key = _state_key(job_id)
+    if _uses_redis():
+        raw = get_redis_connection('default').hgetall(cache.make_key(key))
+        state = {name.decode(): value.decode() for name, value in raw.items()}
+        for name in PROGRESS_FIELDS:
+            if name != 'phase':
+                state[name] = int(state[name]) if state.get(name) else None
+    else:
+        state = cache.get(key) or {}
+    if 'job' not in state:
+        return None
+
+    progress = {name: state.get(name) for name in PROGRESS_FIELDS}
+    data = json.loads(state['job'])
+    data.update(
+        chapters_scraped=progress['chapters_done'] or 0,
+        images_downloaded=progress['images_downloaded'] or 0,
+        progress=progress,
+    )
+    return int(state['user']), data
+
+
+def discard_job(job_id: int) -> None:
+    """Drop the live state once the final row is saved."""
+
+    cache.delete(_state_key(job_id))
+
+
+def publish(job_id: int, event: str, data: dict) -> None:
+    """Send ``event`` to the clients following ``job_id``; never raises."""
+
+    message = json.dumps({'event': event, 'data': data})
+    if _uses_redis():
+        try:
+            get_redis_connection('default').publish(channel(job_id), message)
+        except Exception:  # noqa: broad-except
+            logger.warning("Publication de l'événement %s impossible pour le scrape %s", event, job_id, exc_info=True)
+        return
+
+    with _subscribers_lock:
+        targets = list(_subscribers.get(job_id, ()))
+    for loop, queue in targets:
+        try:
+            loop.call_soon_threadsafe(queue.put_nowait, message)
+        except RuntimeError:
+            # The stream's event loop is already closed.
+            pass
+
+
+class Subscription:
+    """Async context manager receiving the events published for one job."""
+
+    def __init__(self, job_id: int):
+        self.job_id = job_id
+        self._client = None
+        self._pubsub = None
+        self._queue = None
+
+    async def __aenter__(self) -> Subscription:
+        if _uses_redis():
+            self._client = aioredis.from_url(settings.CACHES['default']['LOCATION'])
+            self._pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+            await self._pubsub.subscribe(channel(self.job_id))
+        else:
+            self._queue = asyncio.Queue()
+            with _subscribers_lock:
+                _subscribers.setdefault(self.job_id, set()).add((asyncio.get_running_loop(), self._queue))
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        if self._pubsub is not None:
+            await self._pubsub.aclose()
+            await self._client.aclose()
+            return
+        with _subscribers_lock:
+            queues = _subscribers.get(self.job_id, set())
+            queues.discard((asyncio.get_running_loop(), self._queue))
+            if not queues:
+                _subscribers.pop(self.job_id, None)
+
+    async def get(self, timeout: float) -> tuple[str, dict] | None:
+        """Wait up to ``timeout`` seconds for the next ``(event, data)``."""
+
+        if self._pubsub is not None:
+            message = await self._pubsub.get_message(timeout=timeout)
+            if message is None:
+                return None
+            payload = message['data']
+        else:
+            try:
+                payload = await asyncio.wait_for(self._queue.get(), timeout)
+            except asyncio.TimeoutError:
+                return None
+        message = json.loads(payload)
+        return message['event'], message['data']
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+import json
+
+from rest_framework.renderers import BaseRenderer
+
+ERROR_EVENT = 'error'
+
+
+def format_event(event: str, data) -> bytes:
+    """Encode one Server-Sent Event."""
+
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n".encode()
+
+
+class EventStreamRenderer(BaseRenderer):
+    """
+    Renders the responses of the SSE views that are not streams.
+
+    Streams are ``StreamingHttpResponse`` objects built by the view; this
+    renderer lets DRF negotiate ``text/event-stream`` and turns its own
+    responses (authentication, permission or 404 errors) into an ``error`` event.
+    """
+
+    media_type = 'text/event-stream'
+    format = 'sse'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return format_event(ERROR_EVENT, data)
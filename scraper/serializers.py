@@ -1,3 +1,4 @@
+from drf_spectacular.utils import extend_schema_field
 from rest_framework import serializers
 
 from scraper.models import ScrapeJob
@@ -5,10 +6,29 @@ from scraper.models import ScrapeJob
 
 class ScrapeRequestSerializer(serializers.Serializer):
     url = serializers.URLField()
+    incremental = serializers.BooleanField(
+        default=True,
+        help_text=(
+            "Ne récupère que les nouveaux chapitres et ceux dont des images manquent "
+            "(`false` : re-scrape complet)."
+        ),
+    )
+
+
+class ScrapeProgressSerializer(serializers.Serializer):
+    """Progress of a running job, kept in the cache by the worker (see ``scraper.progress``)."""
+
+    phase = serializers.ChoiceField(choices=('queued', 'crawling', 'downloading', 'saving'))
+    chapter_number = serializers.IntegerField(allow_null=True)
+    chapters_done = serializers.IntegerField()
+    chapters_total = serializers.IntegerField()
+    images_downloaded = serializers.IntegerField()
+    bytes_downloaded = serializers.IntegerField()
 
 
 class ScrapeJobSerializer(serializers.ModelSerializer):
     duration = serializers.SerializerMethodField()
+    progress = serializers.SerializerMethodField()
     webtoon_title = serializers.CharField(source='webtoon.title', read_only=True)
 
     class Meta:
@@ -16,6 +36,7 @@ class ScrapeJobSerializer(serializers.ModelSerializer):
         fields = (
             'id',
             'url',
+            'incremental',
             'status',
             'message',
             'webtoon',
@@ -29,6 +50,7 @@ class ScrapeJobSerializer(serializers.ModelSerializer):
             'started_at',
             'finished_at',
             'duration',
+            'progress',
         )
         read_only_fields = fields
 
@@ -39,3 +61,8 @@ class ScrapeJobSerializer(serializers.ModelSerializer):
         minutes, sec = divmod(seconds, 60)
         hours, minutes = divmod(minutes, 60)
         return f"{hours:02d}:{minutes:02d}:{sec:02d}"
+
+    @extend_schema_field(ScrapeProgressSerializer(allow_null=True))
+    def get_progress(self, obj: ScrapeJob) -> dict | None:
+        # Only known while the job is queued or running, from its live state.
+        return None
@@ -1,20 +1,25 @@
 
 from __future__ import annotations
 
+import hashlib
 import logging
 import threading
 from pathlib import Path
 from typing import Iterable
 
-import requests
 from django.conf import settings
+from django.core.cache import cache
 from django.db import transaction
 from django.utils import timezone
 from django.utils.text import slugify
 
+from api import sync as webtoon_sync
+from api.cache import invalidate_webtoon_on_commit
 from api.models import Chapter, Webtoon
+from scraper import downloads, progress
 from scraper.crawler import ScrapeOutput, scrape_webtoon
 from scraper.models import ScrapeJob
+from scraper.serializers import ScrapeJobSerializer
 
 try:  # pragma: no cover - Celery peut être absent
     from celery import shared_task
@@ -24,10 +29,9 @@ except ImportError:  # pragma: no cover
 logger = logging.getLogger(__name__)
 
 MEDIA_SUBDIR = 'webtoons'
-USER_AGENT = (
-    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
-    "(KHTML, like Gecko) Chrome/129.0.0.0 Safari/537.36"
-)
+# Series pages with their validators (ETag / Last-Modified), for conditional re-fetches.
+SERIES_PAGE_PREFIX = 'scraper:series-page'
+SERIES_PAGE_TIMEOUT = 30 * 24 * 60 * 60
 
 
 def enqueue_scrape(job_id: int) -> None:
@@ -48,10 +52,15 @@ def perform_scrape(job_id: int) -> None:
     job.started_at = timezone.now()
     job.message = ''
     job.save(update_fields=['status', 'started_at', 'message', 'updated_at'])
+    state = progress.new_progress(progress.Phase.CRAWLING)
+    data = ScrapeJobSerializer(job).data
+    progress.store_job(job.pk, job.user_id, data, state)
+    progress.publish(job.pk, progress.STATUS_EVENT, data)
 
     try:
-        output = scrape_webtoon(job.url)
-        _persist_scrape(job, output)
+        output = _scrape(job)
+        with downloads.job_downloader():
+            _persist_scrape(job, output, state)
     except Exception as exc:  # noqa: broad-except
         logger.exception("Scraping échoué pour %s", job.url)
         job.status = ScrapeJob.Status.FAILED
@@ -61,6 +70,9 @@ def perform_scrape(job_id: int) -> None:
     finally:
         job.finished_at = timezone.now()
         job.save(update_fields=['status', 'message', 'finished_at', 'updated_at'])
+        # From now on the status view reads the final row.
+        progress.discard_job(job.pk)
+        progress.publish(job.pk, progress.DONE_EVENT, ScrapeJobSerializer(job).data)
 
 
 if shared_task:  # pragma: no cover
@@ -70,7 +82,59 @@ if shared_task:  # pragma: no cover
         perform_scrape(job_id)
 
 
-def _persist_scrape(job: ScrapeJob, data: ScrapeOutput) -> None:
+def _series_page_key(url: str) -> str:
+    return f"{SERIES_PAGE_PREFIX}:{hashlib.sha256(url.encode()).hexdigest()}"
+
+
+def _scrape(job: ScrapeJob) -> ScrapeOutput:
+    """Scrape la série du job ; en mode incrémental, seuls les chapitres absents ou incomplets sont récupérés."""
+
+    if not job.incremental:
+        output = scrape_webtoon(job.url)
+    else:
+        webtoon = Webtoon.objects.filter(user=job.user, link=job.url).first()
+        complete = _complete_chapters(webtoon) if webtoon else frozenset()
+        output = scrape_webtoon(
+            job.url,
+            skip_chapters=complete,
+            previous_page=cache.get(_series_page_key(job.url)),
+        )
+        # crawl4ai renvoie toujours la série entière.
+        kept = [chapter for chapter in output.chapters if chapter.chapter_number not in complete]
+        output.skipped_chapters += len(output.chapters) - len(kept)
+        output.chapters = kept
+    if output.series_page is not None:
+        cache.set(_series_page_key(job.url), output.series_page, SERIES_PAGE_TIMEOUT)
+    return output
+
+
+def _complete_chapters(webtoon: Webtoon) -> frozenset[int]:
+    """Numéros des chapitres dont toutes les images attendues sont présentes sur le disque."""
+
+    media_root = Path(settings.MEDIA_ROOT)
+    complete = set()
+    rows = Chapter.objects.filter(webtoon=webtoon).values_list(
+        'chapter_number', 'local_image_paths', 'expected_image_count'
+    )
+    for number, paths, expected in rows:
+        # Failed downloads are left out of the paths: compare with what the source listed.
+        # Chapters saved before the count was recorded (None) are fetched again once.
+        if not paths or expected is None or len(paths) < expected:
+            continue
+        # Images are written atomically after being checked: a non-empty file is a complete one.
+        if all(_is_saved(media_root / path) for path in paths):
+            complete.add(number)
+    return frozenset(complete)
+
+
+def _is_saved(path: Path) -> bool:
+    try:
+        return path.stat().st_size > 0
+    except OSError:
+        return False
+
+
+def _persist_scrape(job: ScrapeJob, data: ScrapeOutput, state: dict) -> None:
     with transaction.atomic():
         webtoon, created = Webtoon.objects.get_or_create(
             user=job.user,
@@ -86,8 +150,8 @@ def _persist_scrape(job: ScrapeJob, data: ScrapeOutput) -> None:
             },
         )
 
+        updated = False
         if not created:
-            updated = False
             if not webtoon.link:
                 webtoon.link = job.url
                 updated = True
@@ -104,26 +168,41 @@ def _persist_scrape(job: ScrapeJob, data: ScrapeOutput) -> None:
 
         total_images = 0
         max_chapter = webtoon.chapter
+        scraped_rows: dict[int, dict] = {}
+
+        state.update(phase=progress.Phase.DOWNLOADING, chapters_total=len(data.chapters))
+        for done, chapter in enumerate(data.chapters, start=1):
+            state['chapter_number'] = chapter.chapter_number
+            progress.store_progress(job.pk, state)
 
-        for chapter in data.chapters:
             chapter_folder = media_root / f'chapter-{chapter.chapter_number:04d}'
             chapter_folder.mkdir(parents=True, exist_ok=True)
-            image_paths = _download_images(chapter.images, chapter_folder)
+            image_urls = [url for url in chapter.images if url]
+            image_paths = _download_images(image_urls, chapter_folder, referer=chapter.url)
             total_images += len(image_paths)
 
-            Chapter.objects.update_or_create(
-                webtoon=webtoon,
-                chapter_number=chapter.chapter_number,
-                defaults={
-                    'title': chapter.title,
-                    'release_date': chapter.release_date,
-                    'local_folder': str(chapter_folder.relative_to(settings.MEDIA_ROOT)),
-                    'local_image_paths': [
-                        str((chapter_folder / image).relative_to(settings.MEDIA_ROOT)) for image in image_paths
-                    ],
-                },
-            )
+            # Un même numéro peut apparaître deux fois : la dernière occurrence l'emporte.
+            scraped_rows[chapter.chapter_number] = {
+                'title': chapter.title,
+                'release_date': chapter.release_date,
+                'local_folder': str(chapter_folder.relative_to(settings.MEDIA_ROOT)),
+                'local_image_paths': [
+                    str((chapter_folder / image).relative_to(settings.MEDIA_ROOT)) for image in image_paths
+                ],
+                'expected_image_count': len(image_urls),
+            }
             max_chapter = max(max_chapter, chapter.chapter_number)
+            state.update(
+                chapters_done=done,
+                images_downloaded=total_images,
+                bytes_downloaded=state['bytes_downloaded']
+                + sum((chapter_folder / image).stat().st_size for image in image_paths),
+            )
+            progress.store_progress(job.pk, state)
+
+        state.update(phase=progress.Phase.SAVING, chapter_number=None)
+        progress.store_progress(job.pk, state)
+        _save_chapters(webtoon, scraped_rows)
 
         if max_chapter != webtoon.chapter:
             webtoon.chapter = max_chapter
@@ -133,6 +212,8 @@ def _persist_scrape(job: ScrapeJob, data: ScrapeOutput) -> None:
         job.images_downloaded = total_images
         job.media_root = str(media_root.relative_to(settings.MEDIA_ROOT))
         job.message = f"{len(data.chapters)} chapitres importés."
+        if data.skipped_chapters:
+            job.message += f" {data.skipped_chapters} déjà à jour."
         job.save(
             update_fields=[
                 'webtoon',
@@ -145,28 +226,43 @@ def _persist_scrape(job: ScrapeJob, data: ScrapeOutput) -> None:
         )
 
 
-def _download_images(urls: Iterable[str], folder: Path, timeout: int = 15) -> list[str]:
-    filenames: list[str] = []
-    for idx, url in enumerate(urls, start=1):
-        if not url:
-            continue
-        try:
-            response = requests.get(url, timeout=timeout, headers={'User-Agent': USER_AGENT})
-            response.raise_for_status()
-        except requests.RequestException:
-            logger.warning("Impossible de télécharger %s", url)
-            continue
+CHAPTER_FIELDS = ('title', 'release_date', 'local_folder', 'local_image_paths', 'expected_image_count')
 
-        extension = _guess_extension(url)
-        filename = f'image-{idx:03d}{extension}'
-        path = folder / filename
-        path.write_bytes(response.content)
-        filenames.append(filename)
-    return filenames
 
+def _save_chapters(webtoon: Webtoon, rows: dict[int, dict]) -> None:
+    """Crée ou met à jour les chapitres en masse et maintient le compteur du webtoon."""
 
-def _guess_extension(url: str) -> str:
-    for ext in ('.jpg', '.jpeg', '.png', '.gif', '.webp'):
-        if url.lower().endswith(ext):
-            return ext
-    return '.jpg'
+    existing = {
+        chapter.chapter_number: chapter
+        for chapter in Chapter.objects.filter(webtoon=webtoon, chapter_number__in=list(rows))
+    }
+    now = timezone.now()
+    to_create: list[Chapter] = []
+    to_update: list[Chapter] = []
+    for number, values in rows.items():
+        chapter = existing.get(number)
+        if chapter is None:
+            to_create.append(Chapter(webtoon=webtoon, chapter_number=number, **values))
+            continue
+        for field_name, value in values.items():
+            setattr(chapter, field_name, value)
+        chapter.updated_at = now
+        to_update.append(chapter)
+
+    # bulk_create n'émet pas post_save : le compteur, le journal de synchronisation
+    # et le cache sont mis à jour explicitement.
+    Chapter.objects.bulk_create(to_create, batch_size=500)
+    Chapter.objects.bulk_update(to_update, [*CHAPTER_FIELDS, 'updated_at'], batch_size=500)
+    Webtoon.adjust_counters(webtoon.pk, chapters=len(to_create))
+    webtoon_sync.record(webtoon.user_id, to_create + to_update)
+    if to_create:
+        webtoon_sync.record(webtoon.user_id, [webtoon])
+    if to_create or to_update:
+        # Seuls les chapitres changent : le reste du cache de l'utilisateur reste valide.
+        invalidate_webtoon_on_commit(webtoon.user_id, webtoon.pk)
+
+
+def _download_images(urls: Iterable[str], folder: Path, timeout: int = 15, referer: str | None = None) -> list[str]:
+    """Télécharge les images dans ``folder`` via le moteur du job (voir ``scraper.downloads``)."""
+
+    return downloads.download_images(urls, folder, referer=referer, timeout=timeout)
@@ -1,22 +1,61 @@
+import asyncio
+import json
 import shutil
 import tempfile
+import threading
 from pathlib import Path
 from unittest.mock import patch
 
-from django.test import override_settings
+import httpx
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.db import connection
+from django.test import SimpleTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase
 
 from accounts.models import Feature, User
 from api.models import Chapter, Webtoon
+from scraper import crawler, downloads, progress
 from scraper.crawler import ScrapeOutput, ScrapedChapter
 from scraper.models import ScrapeJob
 from scraper.tasks import perform_scrape
 
 
+def mock_scrape_output():
+    return ScrapeOutput(
+        title='Demo Webtoon',
+        cover_image=None,
+        chapters=[
+            ScrapedChapter(
+                title='Chapitre 1',
+                chapter_number=1,
+                url='https://example.com/ch1',
+                images=['https://example.com/image1.jpg'],
+            ),
+            ScrapedChapter(
+                title='Chapitre 2',
+                chapter_number=2,
+                url='https://example.com/ch2',
+                images=['https://example.com/image2.jpg'],
+            ),
+        ],
+    )
+
+
+IMAGE_BYTES = b'\xff\xd8\xff\xe0binary-image-data'
+
+
+def patch_image_downloads():
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, content=IMAGE_BYTES))
+    return patch.object(downloads.ImageDownloader, 'transport', transport)
+
+
 class ScraperAPITests(APITestCase):
     def setUp(self):
+        cache.clear()
         self.user = User.objects.create_user(username='tester', password='password', email='tester@example.com')
         self.scraper_feature = Feature.objects.get(code='scraper_access')
         self.user.features.add(self.scraper_feature)
@@ -24,43 +63,17 @@ class ScraperAPITests(APITestCase):
         self.tempdir = tempfile.mkdtemp(prefix='webtoon-media-')
         self.addCleanup(lambda: shutil.rmtree(self.tempdir, ignore_errors=True))
 
-    def _mock_scrape_output(self):
-        return ScrapeOutput(
-            title='Demo Webtoon',
-            cover_image=None,
-            chapters=[
-                ScrapedChapter(
-                    title='Chapitre 1',
-                    chapter_number=1,
-                    url='https://example.com/ch1',
-                    images=['https://example.com/image1.jpg'],
-                ),
-                ScrapedChapter(
-                    title='Chapitre 2',
-                    chapter_number=2,
-                    url='https://example.com/ch2',
-                    images=['https://example.com/image2.jpg'],
-                ),
-            ],
-        )
-
-    def _patch_requests_get(self):
-        class DummyResponse:
-            status_code = 200
-            content = b'binary-image-data'
-
-            def raise_for_status(self):
-                return None
-
-        return patch('scraper.tasks.requests.get', return_value=DummyResponse())
-
     def _trigger_scrape(self):
-        output = self._mock_scrape_output()
-        with patch('scraper.tasks.scrape_webtoon', return_value=output), self._patch_requests_get(), override_settings(
-            MEDIA_ROOT=self.tempdir
-        ), patch('scraper.views.enqueue_scrape', side_effect=lambda job_id: perform_scrape(job_id)):
-            response = self.client.post(reverse('scraper:scrape-launch'), {'url': 'https://example.com/manga/'})
-        return response
+        with patch('scraper.tasks.scrape_webtoon', return_value=mock_scrape_output()):
+            return self._launch()
+
+    def _launch(self, **payload):
+        with patch_image_downloads(), override_settings(MEDIA_ROOT=self.tempdir), patch(
+            'scraper.views.enqueue_scrape', side_effect=lambda job_id: perform_scrape(job_id)
+        ):
+            return self.client.post(
+                reverse('scraper:scrape-launch'), {'url': 'https://example.com/manga/', **payload}
+            )
 
     def test_scraper_endpoint_exists(self):
         response = self._trigger_scrape()
@@ -91,9 +104,68 @@ class ScraperAPITests(APITestCase):
 
         webtoon = Webtoon.objects.get(user=self.user, title='Demo Webtoon')
         self.assertEqual(webtoon.chapters.count(), 2)
+        self.assertEqual(webtoon.chapters_count, 2)
         self.assertEqual(job.chapters_scraped, 2)
         self.assertEqual(job.images_downloaded, 2)
 
+    def test_rescrape_updates_existing_chapters_without_double_counting(self):
+        self._trigger_scrape()
+        self._trigger_scrape()
+        webtoon = Webtoon.objects.get(user=self.user, title='Demo Webtoon')
+        self.assertEqual(webtoon.chapters.count(), 2)
+        self.assertEqual(webtoon.chapters_count, 2)
+
+    def test_rescrape_only_fetches_missing_chapters(self):
+        self._trigger_scrape()
+        chapter = Chapter.objects.get(chapter_number=1, webtoon__title='Demo Webtoon')
+        (Path(self.tempdir) / chapter.local_image_paths[0]).unlink()
+
+        with patch('scraper.tasks.scrape_webtoon', wraps=lambda url, **options: mock_scrape_output()) as scrape:
+            job_id = self._launch().data['id']
+        self.assertEqual(scrape.call_args.kwargs['skip_chapters'], {2})
+        job = ScrapeJob.objects.get(pk=job_id)
+        self.assertEqual((job.chapters_scraped, job.images_downloaded), (1, 1))
+        self.assertEqual(job.message, '1 chapitres importés. 1 déjà à jour.')
+        self.assertTrue((Path(self.tempdir) / chapter.local_image_paths[0]).exists())
+
+    def test_chapter_with_failed_downloads_is_fetched_again(self):
+        def output(url=None, **options):
+            data = mock_scrape_output()
+            data.chapters[0].images.append('https://example.com/image1-bis.jpg')
+            return data
+
+        failing = httpx.MockTransport(
+            lambda request: httpx.Response(404)
+            if request.url.path == '/image1-bis.jpg'
+            else httpx.Response(200, content=IMAGE_BYTES)
+        )
+        with patch('scraper.tasks.scrape_webtoon', wraps=output), patch.object(
+            downloads.ImageDownloader, 'transport', failing
+        ), override_settings(MEDIA_ROOT=self.tempdir):
+            perform_scrape(ScrapeJob.objects.create(user=self.user, url='https://example.com/manga/').pk)
+        chapter = Chapter.objects.get(chapter_number=1, webtoon__title='Demo Webtoon')
+        self.assertEqual((len(chapter.local_image_paths), chapter.expected_image_count), (1, 2))
+
+        with patch('scraper.tasks.scrape_webtoon', wraps=output) as scrape:
+            self._launch()
+        self.assertEqual(scrape.call_args.kwargs['skip_chapters'], {2})
+        chapter.refresh_from_db()
+        self.assertEqual(len(chapter.local_image_paths), 2)
+
+    def test_chapters_without_an_expected_count_are_fetched_again(self):
+        self._trigger_scrape()
+        Chapter.objects.filter(chapter_number=1).update(expected_image_count=None)
+        with patch('scraper.tasks.scrape_webtoon', wraps=lambda url, **options: mock_scrape_output()) as scrape:
+            self._launch()
+        self.assertEqual(scrape.call_args.kwargs['skip_chapters'], {2})
+
+    def test_full_rescrape_can_be_requested(self):
+        self._trigger_scrape()
+        with patch('scraper.tasks.scrape_webtoon', return_value=mock_scrape_output()) as scrape:
+            job_id = self._launch(incremental=False).data['id']
+        scrape.assert_called_once_with('https://example.com/manga/')
+        self.assertEqual(ScrapeJob.objects.get(pk=job_id).chapters_scraped, 2)
+
     def test_scraper_stores_images_locally(self):
         self._trigger_scrape()
         chapter = Chapter.objects.get(chapter_number=1, webtoon__title='Demo Webtoon')
@@ -114,3 +186,379 @@ class ScraperAPITests(APITestCase):
         history_response = self.client.get(reverse('scraper:scrape-history'))
         self.assertEqual(history_response.status_code, status.HTTP_200_OK)
         self.assertGreaterEqual(len(history_response.data), 1)
+
+    def test_scraper_history_supports_cursor_pagination(self):
+        self._trigger_scrape()
+        history_response = self.client.get(reverse('scraper:scrape-history'), {'pagination': 'cursor'})
+        self.assertEqual(history_response.status_code, status.HTTP_200_OK)
+        self.assertNotIn('count', history_response.data)
+        self.assertEqual(len(history_response.data['results']), 1)
+        self.assertIsNone(history_response.data['next'])
+
+
+def parse_events(chunks):
+    events = []
+    for block in b''.join(chunks).decode().split('\n\n'):
+        lines = dict(line.split(': ', 1) for line in block.splitlines() if not line.startswith(':'))
+        if lines:
+            events.append((lines['event'], json.loads(lines['data'])))
+    return events
+
+
+class ScrapeStatusStreamTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='streamer', password='password', email='streamer@example.com')
+        self.user.features.add(Feature.objects.get(code='scraper_access'))
+        self.client.force_authenticate(self.user)
+        self.job = ScrapeJob.objects.create(user=self.user, url='https://example.com/manga/')
+        self.url = reverse('scraper:scrape-status-stream', args=[self.job.pk])
+
+    def read(self, response, publish=()):
+        """Consume the stream, publishing ``publish`` once the snapshot is sent."""
+
+        async def consume():
+            chunks = []
+            async for chunk in response.streaming_content:
+                if not chunks:
+                    for event, data in publish:
+                        progress.publish(self.job.pk, event, data)
+                chunks.append(chunk)
+            return chunks
+
+        return parse_events(async_to_sync(consume)())
+
+    def test_stream_pushes_progress_until_the_terminal_event(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        events = self.read(
+            response,
+            publish=[
+                (progress.STATUS_EVENT, {'status': 'running'}),
+                (progress.PROGRESS_EVENT, {'chapters_done': 1, 'chapters_total': 2}),
+                (progress.DONE_EVENT, {'status': 'success'}),
+                (progress.PROGRESS_EVENT, {'chapters_done': 2, 'chapters_total': 2}),
+            ],
+        )
+        self.assertEqual(
+            [event for event, _ in events],
+            ['status', 'status', 'progress', 'done'],
+        )
+        self.assertEqual(events[0][1]['status'], ScrapeJob.Status.PENDING)
+        self.assertEqual(events[-1][1], {'status': 'success'})
+        self.assertEqual(progress._subscribers, {})
+
+    def test_finished_job_sends_only_the_terminal_event(self):
+        self.job.status = ScrapeJob.Status.FAILED
+        self.job.save()
+        events = self.read(self.client.get(self.url))
+        self.assertEqual([event for event, _ in events], ['done'])
+        self.assertEqual(events[0][1]['id'], self.job.pk)
+
+    def test_stream_of_another_user_job_is_not_found(self):
+        other = User.objects.create_user(username='other', password='password', email='other@example.com')
+        other.features.add(Feature.objects.get(code='scraper_access'))
+        self.client.force_authenticate(other)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(parse_events([response.content])[0][0], 'error')
+
+    def test_worker_publishes_transitions_and_chapter_progress(self):
+        events = []
+        tempdir = tempfile.mkdtemp(prefix='webtoon-media-')
+        self.addCleanup(lambda: shutil.rmtree(tempdir, ignore_errors=True))
+        with patch('scraper.tasks.scrape_webtoon', return_value=mock_scrape_output()), patch_image_downloads(), patch(
+            'scraper.progress.publish', side_effect=lambda job_id, event, data: events.append((event, dict(data)))
+        ), override_settings(MEDIA_ROOT=tempdir):
+            perform_scrape(self.job.pk)
+        self.assertEqual(
+            [event for event, _ in events],
+            ['status', 'progress', 'progress', 'progress', 'progress', 'progress', 'done'],
+        )
+        self.assertEqual(events[0][1]['status'], ScrapeJob.Status.RUNNING)
+        self.assertEqual(events[4][1], {
+            'phase': progress.Phase.DOWNLOADING,
+            'chapter_number': 2,
+            'chapters_done': 2,
+            'chapters_total': 2,
+            'images_downloaded': 2,
+            'bytes_downloaded': 2 * len(IMAGE_BYTES),
+        })
+        self.assertEqual(events[5][1]['phase'], progress.Phase.SAVING)
+        self.assertEqual(events[6][1]['status'], ScrapeJob.Status.SUCCESS)
+        self.assertIsNone(progress.load_job(self.job.pk))
+
+
+class ScrapeLiveStatusTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='poller', password='password', email='poller@example.com')
+        self.user.features.add(Feature.objects.get(code='scraper_access'))
+        self.client.force_authenticate(self.user)
+        self.job = ScrapeJob.objects.create(user=self.user, url='https://example.com/manga/')
+        self.url = reverse('scraper:scrape-status', args=[self.job.pk])
+
+    def test_running_job_is_served_from_its_live_state(self):
+        with patch('scraper.views.enqueue_scrape'):
+            job_id = self.client.post(reverse('scraper:scrape-launch'), {'url': 'https://example.com/x/'}).data['id']
+        url = reverse('scraper:scrape-status', args=[job_id])
+        self.assertEqual(self.client.get(url).data['progress']['phase'], progress.Phase.QUEUED)
+
+        state = progress.new_progress(progress.Phase.DOWNLOADING)
+        state.update(chapter_number=3, chapters_done=2, chapters_total=5, images_downloaded=40, bytes_downloaded=9000)
+        progress.store_progress(job_id, state)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse([query for query in queries if 'scraper_scrapejob' in query['sql']])
+        self.assertEqual(response.data['status'], ScrapeJob.Status.PENDING)
+        self.assertEqual(response.data['chapters_scraped'], 2)
+        self.assertEqual(response.data['progress'], state)
+
+    def test_finished_job_is_read_from_the_database(self):
+        progress.store_job(self.job.pk, self.user.pk, {'id': self.job.pk}, progress.new_progress(progress.Phase.SAVING))
+        ScrapeJob.objects.filter(pk=self.job.pk).update(status=ScrapeJob.Status.SUCCESS, chapters_scraped=4)
+        progress.discard_job(self.job.pk)
+        response = self.client.get(self.url)
+        self.assertEqual(response.data['status'], ScrapeJob.Status.SUCCESS)
+        self.assertEqual(response.data['chapters_scraped'], 4)
+        self.assertIsNone(response.data['progress'])
+
+    def test_live_state_of_another_user_is_not_served(self):
+        progress.store_job(self.job.pk, self.user.pk, {'id': self.job.pk}, progress.new_progress(progress.Phase.QUEUED))
+        other = User.objects.create_user(username='intruder', password='password', email='intruder@example.com')
+        other.features.add(Feature.objects.get(code='scraper_access'))
+        self.client.force_authenticate(other)
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_404_NOT_FOUND)
+
+
+SERIES_PAGE = """
+<h1>Demo Webtoon</h1>
+<img class="cover" src="https://example.com/cover.jpg">
+<ul>
+  <li class="wp-manga-chapter"><a href="/ch3">Chapitre 3</a></li>
+  <li class="wp-manga-chapter"><a href="/ch2">Chapitre 2</a></li>
+  <li class="wp-manga-chapter"><a href="https://cdn.example.org/ch1">Chapitre 1</a></li>
+</ul>
+"""
+
+
+class CrawlerTests(SimpleTestCase):
+    def crawl(self, handler):
+        async def run():
+            async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+                return await crawler._crawl(client, 'https://example.com/manga/')
+
+        return asyncio.run(run())
+
+    def test_chapter_pages_are_fetched_concurrently_and_kept_in_order(self):
+        in_flight = {'now': 0, 'max': 0}
+
+        async def handler(request):
+            if request.url.path == '/manga/':
+                return httpx.Response(200, text=SERIES_PAGE)
+            in_flight['now'] += 1
+            in_flight['max'] = max(in_flight['max'], in_flight['now'])
+            # Later chapters answer first.
+            await asyncio.sleep(0.05 / int(request.url.path[-1]))
+            in_flight['now'] -= 1
+            if request.url.path == '/ch2':
+                return httpx.Response(500)
+            return httpx.Response(200, text=f'<img data-src="//img.example.com{request.url.path}.jpg">')
+
+        output = self.crawl(handler)
+        self.assertEqual(output.title, 'Demo Webtoon')
+        self.assertEqual(output.cover_image, 'https://example.com/cover.jpg')
+        self.assertEqual(
+            [(chapter.chapter_number, chapter.url, chapter.images) for chapter in output.chapters],
+            [
+                (1, 'https://cdn.example.org/ch1', ['https://img.example.com/ch1.jpg']),
+                (2, 'https://example.com/ch2', []),
+                (3, 'https://example.com/ch3', ['https://img.example.com/ch3.jpg']),
+            ],
+        )
+        self.assertEqual(in_flight['max'], 3)
+
+    def test_malformed_chapter_url_does_not_abort_the_crawl(self):
+        def handler(request):
+            return httpx.Response(200, text='<img src="https://img.example.com/page.jpg">')
+
+        async def run():
+            async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+                slot = asyncio.Semaphore(1)
+                return await asyncio.gather(
+                    crawler._extract_images(client, slot, 'http://[::1/ch1'),
+                    crawler._extract_images(client, slot, 'https://example.com/ch2'),
+                )
+
+        self.assertEqual(asyncio.run(run()), [[], ['https://img.example.com/page.jpg']])
+
+    def test_unchanged_series_page_and_complete_chapters_are_not_fetched_again(self):
+        seen = []
+
+        def handler(request):
+            seen.append(request.url.path)
+            if request.url.path == '/manga/':
+                if request.headers.get('If-None-Match') == '"v1"':
+                    return httpx.Response(304)
+                return httpx.Response(200, text=SERIES_PAGE, headers={'ETag': '"v1"'})
+            return httpx.Response(200, text='<img src="https://img.example.com/page.jpg">')
+
+        first = self.crawl(handler)
+        self.assertFalse(first.not_modified)
+        self.assertEqual(first.series_page.etag, '"v1"')
+
+        seen.clear()
+
+        async def run():
+            async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+                return await crawler._crawl(
+                    client, 'https://example.com/manga/', skip_chapters={1, 2}, previous_page=first.series_page
+                )
+
+        output = asyncio.run(run())
+        self.assertTrue(output.not_modified)
+        self.assertEqual(seen, ['/manga/', '/ch3'])
+        self.assertEqual(output.title, 'Demo Webtoon')
+        self.assertEqual([chapter.chapter_number for chapter in output.chapters], [3])
+        self.assertEqual(output.skipped_chapters, 2)
+
+    def test_concurrency_is_bounded_per_host(self):
+        in_flight = {'now': 0, 'max': 0}
+
+        async def handler(request):
+            if request.url.path == '/manga/':
+                return httpx.Response(200, text=SERIES_PAGE)
+            if request.url.host == 'example.com':
+                in_flight['now'] += 1
+                in_flight['max'] = max(in_flight['max'], in_flight['now'])
+                await asyncio.sleep(0.01)
+                in_flight['now'] -= 1
+            return httpx.Response(200, text='')
+
+        with patch.object(crawler, 'MAX_CONNECTIONS_PER_HOST', 1):
+            output = self.crawl(handler)
+        self.assertEqual(len(output.chapters), 3)
+        self.assertEqual(in_flight['max'], 1)
+
+
+class ImageDownloaderTests(SimpleTestCase):
+    def setUp(self):
+        self.folder = Path(tempfile.mkdtemp(prefix='webtoon-images-'))
+        self.addCleanup(lambda: shutil.rmtree(self.folder, ignore_errors=True))
+        sleep = patch.object(downloads.time, 'sleep')
+        self.sleep = sleep.start()
+        self.addCleanup(sleep.stop)
+
+    def download(self, handler, urls, **options):
+        with patch.object(downloads.ImageDownloader, 'transport', httpx.MockTransport(handler)):
+            downloader = downloads.ImageDownloader(
+                concurrency=options.get('concurrency', 4),
+                per_host=options.get('per_host', 4),
+                retries=options.get('retries', 2),
+                max_bytes=options.get('max_bytes', 1024),
+            )
+        try:
+            return downloader.download(urls, self.folder, referer='https://example.com/ch1')
+        finally:
+            downloader.close()
+
+    def test_images_are_saved_in_order_and_failures_skipped(self):
+        requests_seen = []
+
+        def handler(request):
+            requests_seen.append(request)
+            if request.url.path == '/missing.png':
+                return httpx.Response(404)
+            return httpx.Response(200, content=IMAGE_BYTES + request.url.path.encode())
+
+        names = self.download(handler, [
+            'https://img.example.com/a.png',
+            '',
+            'https://img.example.com/missing.png',
+            'https://img.example.com/d',
+        ])
+        self.assertEqual(names, ['image-001.png', 'image-004.jpg'])
+        self.assertEqual((self.folder / 'image-004.jpg').read_bytes(), IMAGE_BYTES + b'/d')
+        self.assertEqual({request.headers['Referer'] for request in requests_seen}, {'https://example.com/ch1'})
+        # A 404 is not retried.
+        self.assertEqual(len(requests_seen), 3)
+
+    def test_transient_errors_are_retried_with_backoff(self):
+        attempts = []
+
+        def handler(request):
+            attempts.append(request.url.path)
+            if len(attempts) == 1:
+                raise httpx.ConnectError('reset', request=request)
+            if len(attempts) == 2:
+                return httpx.Response(429, headers={'Retry-After': '2'})
+            return httpx.Response(200, content=IMAGE_BYTES)
+
+        self.assertEqual(self.download(handler, ['https://img.example.com/a.jpg']), ['image-001.jpg'])
+        self.assertEqual(len(attempts), 3)
+        delays = [call.args[0] for call in self.sleep.call_args_list]
+        self.assertLessEqual(delays[0], downloads.RETRY_BASE_SECONDS)
+        self.assertEqual(delays[1], 2.0)
+
+        attempts.clear()
+        self.assertEqual(self.download(lambda request: httpx.Response(503), ['https://img.example.com/b.jpg']), [])
+
+    def test_retry_after_is_clamped_and_dates_are_ignored(self):
+        self.assertEqual(downloads.backoff_delay(0, '-1'), 0.0)
+        self.assertEqual(downloads.backoff_delay(0, ' 1.5 '), 1.5)
+        self.assertEqual(downloads.backoff_delay(0, '3600'), downloads.RETRY_MAX_SECONDS)
+        for value in ('Wed, 21 Oct 2026 07:28:00 GMT', 'nan', 'inf', '--1'):
+            with self.subTest(value=value):
+                self.assertLessEqual(downloads.backoff_delay(0, value), downloads.RETRY_BASE_SECONDS)
+
+        responses = iter([httpx.Response(429, headers={'Retry-After': '-1'}), httpx.Response(200, content=IMAGE_BYTES)])
+        names = self.download(lambda request: next(responses), ['https://img.example.com/a.jpg'])
+        self.assertEqual(names, ['image-001.jpg'])
+        self.assertEqual(self.sleep.call_args.args[0], 0.0)
+
+    def test_concurrency_is_bounded_per_host(self):
+        in_flight = {'now': 0, 'max': 0}
+        lock = threading.Lock()
+
+        def handler(request):
+            with lock:
+                in_flight['now'] += 1
+                in_flight['max'] = max(in_flight['max'], in_flight['now'])
+            threading.Event().wait(0.01)
+            with lock:
+                in_flight['now'] -= 1
+            return httpx.Response(200, content=IMAGE_BYTES)
+
+        urls = [f'https://img.example.com/{index}.jpg' for index in range(12)]
+        self.assertEqual(len(self.download(handler, urls, concurrency=6, per_host=2)), 12)
+        self.assertEqual(in_flight['max'], 2)
+
+    def test_invalid_bodies_never_reach_the_destination(self):
+        responses = {
+            '/error.jpg': httpx.Response(200, text='<html>Cloudflare</html>', headers={'Content-Type': 'text/html'}),
+            '/unlabelled.jpg': httpx.Response(200, content=b'<html>not an image</html>'),
+            '/announced.jpg': httpx.Response(200, content=IMAGE_BYTES, headers={'Content-Length': '4096'}),
+            '/huge.jpg': httpx.Response(200, content=IMAGE_BYTES + b'x' * 2048),
+            '/truncated.jpg': httpx.Response(200, content=IMAGE_BYTES, headers={'Content-Length': '100'}),
+            '/webp.jpg': httpx.Response(200, content=b'RIFF\x00\x00\x00\x00WEBPVP8 ', headers={
+                'Content-Type': 'image/webp',
+            }),
+        }
+        # An image already on disk is only ever replaced by a complete one.
+        (self.folder / 'image-001.jpg').write_bytes(b'previous')
+        names = self.download(
+            lambda request: responses[request.url.path],
+            [f'https://img.example.com{path}' for path in responses],
+        )
+        self.assertEqual(names, ['image-006.jpg'])
+        self.assertEqual((self.folder / 'image-001.jpg').read_bytes(), b'previous')
+        self.assertEqual(sorted(path.name for path in self.folder.iterdir()), ['image-001.jpg', 'image-006.jpg'])
+
+    def test_sniff_image(self):
+        self.assertTrue(downloads.sniff_image(b'\x89PNG\r\n\x1a\n\x00\x00\x00\x0d'))
+        self.assertTrue(downloads.sniff_image(b'GIF89a\x01\x00'))
+        self.assertTrue(downloads.sniff_image(b'\x00\x00\x00\x1cftypavif'))
+        self.assertFalse(downloads.sniff_image(b'<!DOCTYPE html>'))
+        self.assertFalse(downloads.sniff_image(b''))
@@ -1,11 +1,18 @@
+import time
+
+from django.http import StreamingHttpResponse
 from rest_framework import permissions, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import extend_schema, extend_schema_view
 
 from accounts.permissions import HasFeaturePermission
+from api.pagination import KeysetPagination
+from scraper import progress
 from scraper.models import ScrapeJob
+from scraper.renderers import EventStreamRenderer, format_event
 from scraper.serializers import ScrapeJobSerializer, ScrapeRequestSerializer
 from scraper.tasks import enqueue_scrape
 
@@ -20,6 +27,7 @@ from scraper.tasks import enqueue_scrape
 class ScrapeLaunchView(APIView):
     permission_classes = (permissions.IsAuthenticated, HasFeaturePermission)
     required_feature = "scraper_access"
+    throttle_scope = "scrape"
 
     def post(self, request):
         serializer = ScrapeRequestSerializer(data=request.data)
@@ -28,37 +36,107 @@ class ScrapeLaunchView(APIView):
         job = ScrapeJob.objects.create(
             user=request.user,
             url=serializer.validated_data['url'],
+            incremental=serializer.validated_data['incremental'],
             status=ScrapeJob.Status.PENDING,
         )
+        output = ScrapeJobSerializer(job).data
+        # Written before queuing: the status view can answer without the database right away.
+        progress.store_job(job.pk, job.user_id, output, progress.new_progress(progress.Phase.QUEUED))
         enqueue_scrape(job.pk)
 
-        output = ScrapeJobSerializer(job)
-        return Response(output.data, status=status.HTTP_202_ACCEPTED)
+        return Response(output, status=status.HTTP_202_ACCEPTED)
 
 
 @extend_schema(
     responses=ScrapeJobSerializer,
-    description="Retourne le statut courant d'un scraping.",
+    description=(
+        "Retourne le statut courant d'un scraping. Tant que la tâche est en attente ou en cours, "
+        "l'état est lu depuis le cache alimenté par le worker, avec sa progression (`progress`)."
+    ),
 )
 class ScrapeStatusView(APIView):
     permission_classes = (permissions.IsAuthenticated, HasFeaturePermission)
     required_feature = "scraper_access"
 
     def get(self, request, pk: int):
+        live = progress.load_job(pk)
+        if live is not None and live[0] == request.user.pk:
+            return Response(live[1])
         job = ScrapeJob.objects.filter(user=request.user, pk=pk).first()
         if not job:
             return Response({'detail': 'Scrape introuvable.'}, status=status.HTTP_404_NOT_FOUND)
         return Response(ScrapeJobSerializer(job).data)
 
 
+# A comment line keeps idle streams open through proxies.
+STREAM_HEARTBEAT_SECONDS = 15
+# Past the task time limit the job will not move any more; clients may reconnect.
+STREAM_MAX_SECONDS = 30 * 60
+FINISHED_STATUSES = (ScrapeJob.Status.SUCCESS, ScrapeJob.Status.FAILED)
+
+
+async def _job_events(job_id: int):
+    started = time.monotonic()
+    # Subscribe before reading the job so that no transition falls in between.
+    async with progress.Subscription(job_id) as subscription:
+        job = await ScrapeJob.objects.select_related('webtoon').filter(pk=job_id).afirst()
+        if job is None:
+            return
+        if job.status in FINISHED_STATUSES:
+            yield format_event(progress.DONE_EVENT, ScrapeJobSerializer(job).data)
+            return
+        yield format_event(progress.STATUS_EVENT, ScrapeJobSerializer(job).data)
+        while time.monotonic() - started < STREAM_MAX_SECONDS:
+            message = await subscription.get(timeout=STREAM_HEARTBEAT_SECONDS)
+            if message is None:
+                yield b': keep-alive\n\n'
+                continue
+            event, data = message
+            yield format_event(event, data)
+            if event == progress.DONE_EVENT:
+                return
+
+
+@extend_schema(
+    responses={(200, 'text/event-stream'): OpenApiTypes.STR},
+    description=(
+        "Flux Server-Sent Events du statut d'un scraping : un événement `status` avec l'état courant, "
+        "puis `status` à chaque transition, `progress` après chaque chapitre et `done` (le job final) "
+        "avant la fermeture du flux."
+    ),
+)
+class ScrapeStatusStreamView(APIView):
+    permission_classes = (permissions.IsAuthenticated, HasFeaturePermission)
+    required_feature = "scraper_access"
+    renderer_classes = (EventStreamRenderer,)
+
+    def get(self, request, pk: int):
+        if not ScrapeJob.objects.filter(user=request.user, pk=pk).exists():
+            return Response({'detail': 'Scrape introuvable.'}, status=status.HTTP_404_NOT_FOUND)
+        # Async iterator: under ASGI (the `stream` service) the worker is not held while the job runs.
+        # Under WSGI (runserver, `web`) Django buffers it until the job ends.
+        response = StreamingHttpResponse(_job_events(pk), content_type='text/event-stream')
+        response['Cache-Control'] = 'no-cache'
+        response['X-Accel-Buffering'] = 'no'
+        return response
+
+
 @extend_schema(
     responses=ScrapeJobSerializer(many=True),
-    description="Historique des scrapes exécutés par l'utilisateur courant.",
+    description=(
+        "Historique des scrapes exécutés par l'utilisateur courant. "
+        "Avec `?pagination=cursor`, l'historique complet est paginé par curseur."
+    ),
 )
 class ScrapeHistoryView(APIView):
     permission_classes = (permissions.IsAuthenticated, HasFeaturePermission)
     required_feature = "scraper_access"
 
     def get(self, request):
-        jobs = ScrapeJob.objects.filter(user=request.user).order_by('-created_at')[:20]
+        jobs = ScrapeJob.objects.filter(user=request.user).select_related('webtoon')
+        if KeysetPagination.is_requested(request):
+            paginator = KeysetPagination(ordering='-created_at')
+            page = paginator.paginate_queryset(jobs, request, view=self)
+            return paginator.get_paginated_response(ScrapeJobSerializer(page, many=True).data)
+        jobs = jobs.order_by('-created_at')[:20]
         return Response(ScrapeJobSerializer(jobs, many=True).data)
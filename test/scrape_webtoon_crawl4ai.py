@@ -30,6 +30,10 @@ from tqdm.asyncio import tqdm_asyncio
 from crawl4ai import AsyncWebCrawler, BrowserConfig, CrawlerRunConfig
 from crawl4ai.async_configs import CacheMode, VirtualScrollConfig
 
+# Mêmes contrôles d'image que le moteur de téléchargement de l'application (scraper/downloads.py).
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from scraper.downloads import GENERIC_CONTENT_TYPES, InvalidImage, sniff_image  # noqa: E402
+
 # Facultatif: undetected adapter (selon version Crawl4AI)
 try:
     from crawl4ai import UndetectedAdapter
@@ -52,6 +56,9 @@ CHAPTER_PATTERNS = [
 
 IMG_EXT_RE = re.compile(r"\.(jpg|jpeg|png|webp)$", re.I)
 
+# Même plafond (et même variable d'environnement) que SCRAPER_IMAGE_MAX_BYTES côté Django.
+MAX_IMAGE_BYTES = int(os.getenv("SCRAPER_IMAGE_MAX_BYTES", str(50 * 1024 * 1024)))
+
 SERIES_XPATHS = [
     "//li[contains(@class,'wp-manga-chapter')]/a/@href",
     "//div[contains(@class,'listing-chapters') or contains(@class,'chapter-list')]//a/@href",
@@ -392,6 +399,39 @@ async def extract_images_via_scrapeops(chapter_url: str, api_key: str, country:
 #   DOWNLOAD IMAGES
 # =========================
 
+async def _stream_to_file(response: httpx.Response, out: Path, max_bytes: int = MAX_IMAGE_BYTES):
+    """Écrit le corps par morceaux dans un fichier temporaire, puis le renomme : jamais d'image tronquée.
+
+    Refuse (InvalidImage) les réponses qui ne sont pas des images (type, signature) ou dépassent ``max_bytes``.
+    """
+    content_type = response.headers.get("Content-Type", "").split(";")[0].strip().lower()
+    if content_type and not content_type.startswith("image/") and content_type not in GENERIC_CONTENT_TYPES:
+        raise InvalidImage(f"type {content_type}")
+    length = response.headers.get("Content-Length", "")
+    if length.isdigit() and int(length) > max_bytes:
+        raise InvalidImage(f"{length} octets")
+
+    tmp = out.with_name(f".{out.name}.part")
+    try:
+        size = 0
+        head = b""
+        with tmp.open("wb") as f:
+            async for chunk in response.aiter_bytes(64 * 1024):
+                size += len(chunk)
+                if size > max_bytes:
+                    raise InvalidImage(f"plus de {max_bytes} octets")
+                if len(head) < 12:
+                    head = (head + chunk)[:12]
+                f.write(chunk)
+            f.flush()
+            os.fsync(f.fileno())
+        if not sniff_image(head):
+            raise InvalidImage("contenu non reconnu")
+        os.replace(tmp, out)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
 async def download_one(client: httpx.AsyncClient, url: str, dest: Path, referer: str, idx: int):
     idx_name = f"{idx:03d}"
     ext = os.path.splitext(urlparse(url).path)[1]
@@ -400,10 +440,13 @@ async def download_one(client: httpx.AsyncClient, url: str, dest: Path, referer:
     out = dest / f"{idx_name}{ext}"
     for attempt in range(3):
         try:
-            r = await client.get(url, headers={"Referer": referer}, timeout=60)
-            r.raise_for_status()
-            out.write_bytes(r.content)
+            async with client.stream("GET", url, headers={"Referer": referer}, timeout=60) as r:
+                r.raise_for_status()
+                await _stream_to_file(r, out)
             return
+        except InvalidImage:
+            # Page d'erreur ou fichier trop gros : réessayer ne changerait rien.
+            raise
         except Exception:
             if attempt == 2:
                 raise